@@ -51,14 +51,16 @@ class Checkpointing(object):
         self.meta_data = MetaData()
 
     def _initialise(self, comm):
-        """ Create a new checkpoint file """
+        """ Create a new checkpoint file (and wait for the other processes
+        in the communicator, if there is one) """
         with self._h5._open_backing_h5(self._file, 'a', mpi=False) as f:
             self._create_dataset(f, 'transfer_idx', 0)
             self._create_dataset(f, 'process_idx', 0)
             self._create_dataset(
                     f, 'completed_plugins', self._completed_plugins)
-        msg = "%s initialise." % self.__class__.__name__
-        self._exp._barrier(communicator=comm, msg=msg)
+        if comm is not None:
+            msg = "%s initialise." % self.__class__.__name__
+            self._exp._barrier(communicator=comm, msg=msg)
 
     def _create_dataset(self, f, name, val):
         if name in f.keys():
@@ -0,0 +1,135 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: dependency_tracker
+   :platform: Unix
+   :synopsis: Track the frames that each process reads and writes in each \
+       plugin, to determine which consecutive plugins can be pipelined.
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+from mpi4py import MPI
+
+import savu.core.utils as cu
+from savu.plugins.plugin import Plugin
+
+# drivers that run the plugin on their own communicator
+EXCLUDED_DRIVERS = ['GpuPlugin', 'MultiThreadedPlugin', 'IterativePlugin']
+
+
+def _get_blocks(slice_list):
+    """ Convert a list of slice lists to a set of (hashable) blocks. """
+    return set(tuple((s.start, s.stop, s.step) for s in sl)
+               for sl in slice_list)
+
+
+def _overrides(plugin, method):
+    """ Has the plugin class overridden a method of the Plugin class? """
+    return getattr(type(plugin), method).im_func is not \
+        getattr(Plugin, method).im_func
+
+
+class DependencyTracker(object):
+    """ Records the blocks of each dataset that the current process reads
+    and writes in each plugin, during the plugin list check.  A plugin is
+    pipelined with the next plugin if every process only reads blocks that
+    it has written itself since the processes were last synchronised.  The
+    next plugin can then start as soon as the process has finished the
+    current plugin, without waiting for the other processes.
+
+    Only CPU plugins that run on all processes, have no parameter tuning or
+    frame meta data and do not override post_process are pipelined with the
+    next plugin.  The next plugin should not read the frames of other
+    processes in pre_process.
+
+    :param Experiment exp: The experiment object.
+    """
+
+    def __init__(self, exp):
+        self.exp = exp
+        self.plugins = {}
+
+    def add_plugin(self, idx, plugin):
+        """ Record the blocks read and written by a plugin (after the plugin
+        setup).
+
+        :params int idx: The position of the plugin in the processing list.
+        :params Plugin plugin: The plugin instance.
+        """
+        in_data, out_data = plugin.get_datasets()
+        entry = {'name': plugin.name, 'start': self.__is_eligible(plugin)}
+        entry['end'] = entry['start'] and not plugin._frame_metadata and \
+            not _overrides(plugin, 'post_process') and \
+            not _overrides(plugin, 'base_post_process')
+        entry['reads'] = self.__get_blocks(in_data, 'in')
+        entry['writes'] = self.__get_blocks(out_data, 'out')
+        if entry['reads'] is None or entry['writes'] is None:
+            entry['start'] = entry['end'] = False
+            entry['reads'], entry['writes'] = {}, {}
+        self.plugins[idx] = entry
+
+    def __is_eligible(self, plugin):
+        names = [c.__name__ for c in type(plugin).__mro__]
+        if 'CpuPlugin' not in names or \
+                set(names).intersection(EXCLUDED_DRIVERS):
+            return False
+        if plugin.extra_dims:
+            return False
+        nProcs = len(self.exp.meta_data.get('processes'))
+        return len(plugin._get_ranks(nProcs)) == nProcs
+
+    def __get_blocks(self, data_list, dtype):
+        blocks = {}
+        for data in data_list:
+            sl = data._get_transport_data()._get_slice_lists_per_process(dtype)
+            if 'transfer' not in sl.keys():
+                return None
+            blocks[data.get_name()] = _get_blocks(sl['transfer'])
+        return blocks
+
+    def get_pipelined(self, nPlugins):
+        """ Determine which plugins are pipelined with the next plugin.  This
+        is a collective operation.
+
+        :params int nPlugins: The number of plugins in the processing list.
+        :returns: True for each plugin that is pipelined with the next.
+        :rtype: list(bool)
+        """
+        pipelined = [False]*nPlugins
+        written = {}
+        for i in range(nPlugins - 1):
+            current = self.plugins.get(i)
+            following = self.plugins.get(i + 1)
+            if not current or not following:
+                written = {}
+                continue
+            written.update(current['writes'])
+            local = current['end'] and following['start'] and \
+                all(blocks <= written[name] for name, blocks in
+                    following['reads'].iteritems() if name in written)
+            pipelined[i] = self.__all_processes(local)
+            if pipelined[i] and self.exp.meta_data.get('process') == 0:
+                cu.user_message("Pipelining the %s and %s plugins" %
+                                (current['name'], following['name']))
+            if not pipelined[i]:
+                written = {}
+        return pipelined
+
+    def __all_processes(self, flag):
+        if not self.exp.meta_data.get('mpi'):
+            return bool(flag)
+        return MPI.COMM_WORLD.allreduce(bool(flag), op=MPI.LAND)
@@ -0,0 +1,217 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: estimator
+   :platform: Unix
+   :synopsis: Estimate the cost (data size, memory and runtime) of each \
+       plugin in a process list, before the processing is run.
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import os
+import json
+import logging
+import tempfile
+import numpy as np
+
+import savu.core.utils as cu
+
+# the number of previous runs averaged in the throughput history
+HISTORY_LENGTH = 10
+
+
+def _get_settings(exp):
+    settings = exp.meta_data.get('system_params').get('estimate_settings')
+    return settings if settings else {}
+
+
+def get_history_file(exp):
+    """ Get the path to the file containing the plugin throughput history,
+    or None if the 'throughput_history' estimate setting is not set (the
+    history is not recorded). """
+    path = _get_settings(exp).get('throughput_history')
+    return os.path.expanduser(path) if path else None
+
+
+def read_history(fname):
+    if not fname or not os.path.exists(fname):
+        return {}
+    try:
+        with open(fname, 'r') as f:
+            return json.load(f)
+    except (IOError, ValueError) as e:
+        logging.warn("Unable to read the throughput history %s: %s", fname, e)
+        return {}
+
+
+def record_throughput(exp, name, costs, seconds):
+    """ Add the throughput (bytes read per process per second) of a plugin run
+    to the throughput history.
+
+    :params Experiment exp: The experiment object.
+    :params str name: The plugin name.
+    :params dict costs: The plugin costs (see get_plugin_costs).
+    :params float seconds: The time taken to run the plugin.
+    """
+    fname = get_history_file(exp)
+    if not fname or seconds <= 0 or not costs['bytes_read']:
+        return
+    history = read_history(fname)
+    entry = history.get(name, {'throughput': 0.0, 'count': 0})
+    throughput = costs['bytes_read']/float(costs['processes'])/seconds
+    count = min(entry['count'], HISTORY_LENGTH - 1)
+    entry['throughput'] = \
+        (entry['throughput']*count + throughput)/float(count + 1)
+    entry['count'] = count + 1
+    history[name] = entry
+
+    try:
+        path = os.path.dirname(fname)
+        if not os.path.exists(path):
+            os.makedirs(path)
+        # write to a temporary file first, as other jobs may be reading
+        fd, tmp = tempfile.mkstemp(dir=path)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(history, f, indent=2)
+        os.rename(tmp, fname)
+    except (IOError, OSError) as e:
+        logging.debug("Unable to write the throughput history %s: %s",
+                      fname, e)
+
+
+def get_plugin_costs(plugin):
+    """ Calculate the data sizes and memory requirements of a plugin, from
+    the plugin datasets (after the plugin setup).
+
+    :returns: bytes read and written (in total), max frames transfer and
+        process, the number of transfers blocks in total and per process and
+        the expected peak memory per process.
+    :rtype: dict
+    """
+    in_pData, out_pData = plugin.get_plugin_datasets()
+    costs = {'bytes_read': 0, 'bytes_written': 0, 'memory': 0}
+
+    for pData, key in [(p, 'bytes_read') for p in in_pData] + \
+            [(p, 'bytes_written') for p in out_pData]:
+        mData = pData.meta_data
+        nBytes = pData.data_obj.get_itemsize()
+        costs[key] += mData.get('total_frames')*mData.get('bytes_per_frame')
+        # transfer buffer plus the frames passed to process_frames
+        shape = mData.get('transfer_shape')
+        transfer = np.prod(shape)*nBytes if shape else 0
+        costs['memory'] += transfer + \
+            pData._get_max_frames_process()*mData.get('bytes_per_frame')
+
+    pData = in_pData[0] if in_pData else out_pData[0]
+    costs['mft'] = pData._get_max_frames_transfer() or 1
+    costs['mfp'] = pData._get_max_frames_process()
+    costs['processes'] = pData.meta_data.get('mpi_procs')
+    costs['blocks'] = int(np.ceil(
+        pData.meta_data.get('total_frames')/float(costs['mft'])))
+    costs['blocks_per_process'] = \
+        int(np.ceil(costs['blocks']/float(costs['processes'])))
+    return costs
+
+
+class Estimator(object):
+    """ Collects the cost of each plugin during the plugin list check and
+    reports them, along with a predicted runtime (from the throughput
+    history of previous runs) and any warnings.
+
+    :param Experiment exp: The experiment object.
+    :param int nProcesses: The number of processes to estimate for (or None
+        to use the processes of the current run).
+    """
+
+    def __init__(self, exp, nProcesses=None):
+        self.exp = exp
+        self.costs = []
+        self.warnings = []
+        names = exp.meta_data.get('process_names').split(',')
+        if nProcesses:
+            processes = \
+                (names*int(np.ceil(nProcesses/float(len(names)))))[:nProcesses]
+            exp.meta_data.set('processes', processes)
+        self.nodes = int(np.ceil(
+            len(exp.meta_data.get('processes'))/float(len(names))))
+        self.memory = self.__get_memory_per_process(len(names))
+        self.history = read_history(get_history_file(exp))
+
+    def __get_memory_per_process(self, procs_per_node):
+        memory = _get_settings(self.exp).get('memory_per_node', 0)
+        if memory:
+            memory = float(memory)*1e9
+        else:
+            memory = os.sysconf('SC_PAGE_SIZE')*os.sysconf('SC_PHYS_PAGES')
+        return memory/procs_per_node
+
+    def add_plugin(self, plugin):
+        costs = get_plugin_costs(plugin)
+        costs['name'] = plugin.name
+        throughput = self.history.get(plugin.name, {}).get('throughput')
+        costs['runtime'] = costs['bytes_read']/float(costs['processes'])/\
+            throughput if throughput else None
+        self.__check(costs)
+        self.costs.append(costs)
+
+    def __check(self, costs):
+        if costs['memory'] > self.memory:
+            self.warnings.append(
+                "%s: expected memory per process (%s) exceeds the memory "
+                "available (%s)." % (costs['name'], _fmt(costs['memory']),
+                                     _fmt(self.memory)))
+        if costs['blocks'] < costs['processes']:
+            self.warnings.append(
+                "%s: only %i of the %i processes will receive data." %
+                (costs['name'], costs['blocks'], costs['processes']))
+
+    def report(self):
+        """ Output the estimates to the user log. """
+        header = "%-28s %10s %10s %6s %6s %8s %10s %10s" % (
+            'Plugin', 'Read', 'Written', 'mft', 'mfp', 'blocks',
+            'memory', 'runtime')
+        cu.user_message("*"*len(header))
+        cu.user_message("Estimates for %i processes on %i node(s), with %s "
+                        "memory per process:" % (
+                            len(self.exp.meta_data.get('processes')),
+                            self.nodes, _fmt(self.memory)))
+        cu.user_message(header)
+        total = 0
+        for c in self.costs:
+            runtime = '%.1fs' % c['runtime'] if c['runtime'] is not None \
+                else 'unknown'
+            total = total + c['runtime'] if c['runtime'] is not None \
+                and total is not None else None
+            cu.user_message("%-28s %10s %10s %6i %6i %8s %10s %10s" % (
+                c['name'][:28], _fmt(c['bytes_read']),
+                _fmt(c['bytes_written']), c['mft'], c['mfp'],
+                '%i/%i' % (c['blocks_per_process'], c['blocks']),
+                _fmt(c['memory']), runtime))
+        if total is not None:
+            cu.user_message("Predicted total runtime: %.1fs" % total)
+        for warning in self.warnings:
+            cu.user_message("WARNING: " + warning)
+        cu.user_message("*"*len(header))
+
+
+def _fmt(nBytes):
+    """ Format a number of bytes for output. """
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(nBytes) < 1024.0:
+            return "%.1f%s" % (nBytes, unit)
+        nBytes /= 1024.0
+    return "%.1fTB" % nBytes
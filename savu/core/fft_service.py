@@ -0,0 +1,196 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: fft_service
+   :platform: Unix
+   :synopsis: Shared FFT functions for plugins, with FFTW plans cached by \
+       shape and type, a thread count per process and FFTW wisdom that \
+       persists between runs.
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+import numpy as np
+from collections import OrderedDict
+import pyfftw
+import pyfftw.builders
+
+import savu.core.utils as cu
+
+# the maximum number of cached FFTW objects (each holds aligned input and
+# output arrays)
+MAX_PLANS = 32
+
+# cached FFTW objects, keyed by thread, function, shape, dtype and arguments
+# (the input and output arrays of a plan are reused, so plans are not shared
+# between threads), in least recently used order
+_plans = OrderedDict()
+_plans_lock = threading.Lock()
+_settings = {'threads': 1, 'planner_effort': 'FFTW_ESTIMATE',
+             'wisdom_file': None}
+# per thread settings (for threads in a pool)
+_local = threading.local()
+
+
+def configure(exp):
+    """ Set the number of threads for each process (the cores on a node are
+    shared between the processes on that node) and the planner effort, and
+    load any saved FFTW wisdom.  The defaults can be overridden by the
+    'fft_settings' entry in the system parameters.
+
+    :params Experiment exp: The experiment object.
+    """
+    settings = exp.meta_data.get('system_params').get('fft_settings')
+    settings = settings if settings else {}
+    threads = settings.get('threads', 0)
+    set_threads(threads if threads else cu.get_threads_per_process(exp))
+    _settings['planner_effort'] = \
+        settings.get('planner_effort', 'FFTW_ESTIMATE')
+    wisdom = settings.get('wisdom_file', None)
+    _settings['wisdom_file'] = os.path.expanduser(wisdom) if wisdom else None
+    if _settings['wisdom_file']:
+        load_wisdom(_settings['wisdom_file'])
+
+
+def set_threads(threads):
+    """ Set the number of threads used by each transform in this process. """
+    if threads != _settings['threads']:
+        _settings['threads'] = int(threads)
+        clear_plans()
+
+
+def get_threads():
+    """ The number of threads used by each transform in the current thread.
+    """
+    return getattr(_local, 'threads', _settings['threads'])
+
+
+def init_worker_thread():
+    """ Run each transform in the current thread with a single thread.  Used
+    to initialise the threads of a pool that processes frames concurrently,
+    as the pool already uses the cores available to the process. """
+    _local.threads = 1
+
+
+def clear_plans():
+    """ Free the cached FFTW objects (e.g. at the end of a plugin). """
+    with _plans_lock:
+        _plans.clear()
+
+
+def load_wisdom(fname):
+    """ Import FFTW wisdom from a file, if it exists. """
+    if not os.path.exists(fname):
+        return
+    try:
+        with open(fname, 'r') as f:
+            wisdom = json.load(f)
+        pyfftw.import_wisdom(tuple(w.encode('ascii') for w in wisdom))
+    except (IOError, ValueError) as e:
+        logging.warn("Unable to read the FFTW wisdom %s: %s", fname, e)
+
+
+def save_wisdom(fname=None):
+    """ Export the FFTW wisdom accumulated by this process to a file (the
+    configured wisdom file by default). """
+    fname = fname if fname else _settings['wisdom_file']
+    if not fname:
+        return
+    wisdom = [w.decode('ascii') for w in pyfftw.export_wisdom()]
+    try:
+        path = os.path.dirname(fname)
+        if not os.path.exists(path):
+            os.makedirs(path)
+        # write to a temporary file first, as other jobs may be reading
+        fd, tmp = tempfile.mkstemp(dir=path)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(wisdom, f)
+        os.rename(tmp, fname)
+    except (IOError, OSError) as e:
+        logging.debug("Unable to write the FFTW wisdom %s: %s", fname, e)
+
+
+def _get_plan(func, a, kwargs):
+    key = (threading.current_thread().ident, func, a.shape, a.dtype.str,
+           tuple(sorted(kwargs.items())))
+    with _plans_lock:
+        plan = _plans.pop(key, None)
+        if plan is not None:
+            _plans[key] = plan
+            return plan
+
+    builder = getattr(pyfftw.builders, func)
+    plan = builder(pyfftw.empty_aligned(a.shape, dtype=a.dtype),
+                   threads=get_threads(),
+                   planner_effort=_settings['planner_effort'], **kwargs)
+    with _plans_lock:
+        _plans[key] = plan
+        while len(_plans) > MAX_PLANS:
+            _plans.popitem(last=False)
+    return plan
+
+
+def _execute(func, a, **kwargs):
+    """ Run a cached plan on an array.  The output array of a plan is reused,
+    so a copy is returned. """
+    a = np.asarray(a)
+    if a.dtype not in [np.float32, np.float64, np.complex64, np.complex128]:
+        a = a.astype(np.float64)
+    for key in [k for k in ['axes', 's'] if kwargs.get(k) is not None]:
+        kwargs[key] = tuple(kwargs[key])
+    return _get_plan(func, a, kwargs)(a).copy()
+
+
+def fft(a, n=None, axis=-1):
+    return _execute('fft', a, n=n, axis=axis)
+
+
+def ifft(a, n=None, axis=-1):
+    return _execute('ifft', a, n=n, axis=axis)
+
+
+def fft2(a, s=None, axes=(-2, -1)):
+    return _execute('fft2', a, s=s, axes=axes)
+
+
+def ifft2(a, s=None, axes=(-2, -1)):
+    return _execute('ifft2', a, s=s, axes=axes)
+
+
+def rfft(a, n=None, axis=-1):
+    """ Real to complex transform (the non-negative frequencies only). """
+    return _execute('rfft', a, n=n, axis=axis)
+
+
+def irfft(a, n=None, axis=-1):
+    return _execute('irfft', a, n=n, axis=axis)
+
+
+def rfft2(a, s=None, axes=(-2, -1)):
+    return _execute('rfft2', a, s=s, axes=axes)
+
+
+def irfft2(a, s=None, axes=(-2, -1)):
+    return _execute('irfft2', a, s=s, axes=axes)
+
+
+fftshift = np.fft.fftshift
+ifftshift = np.fft.ifftshift
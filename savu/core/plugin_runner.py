@@ -19,11 +19,16 @@
 .. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
 """
 
+import time
 import logging
 import numpy as np
 
 import savu.core.utils as cu
 import savu.plugins.utils as pu
+import savu.core.estimator as est
+import savu.core.fft_service as fft_service
+from savu.core.dependency_tracker import DependencyTracker
+from savu.core.preview_pushdown import pushdown_previews
 from savu.data.experiment_collection import Experiment
 
 
@@ -43,19 +48,45 @@ class PluginRunner(object):
         # add all relevent locations to the path
         pu.get_plugins_paths()
         self.exp = Experiment(options)
+        self.estimator = None
+        self.tracker = None
+        self.pipelined = []
+        self.__deferred = {'summary': [], 'terminate': []}
+
+    def _estimate_plugin_list(self, nProcesses=None):
+        """ Run the plugin list check only and report the expected data
+        sizes, memory use and runtime of each plugin.
+
+        :params int nProcesses: The number of processes to estimate for \
+            (defaults to the number of processes in this run).
+        """
+        self.estimator = est.Estimator(self.exp, nProcesses=nProcesses)
+        self._run_plugin_list_check(self.exp.meta_data.plugin_list)
+        self.estimator.report()
+        return self.estimator
 
     def _run_plugin_list(self):
         """ Create an experiment and run the plugin list.
         """
         plugin_list = self.exp.meta_data.plugin_list
+        mData = self.exp.meta_data.get_dictionary()
+        if mData.get('pipeline') and not mData.get('checkpoint') and \
+                self._transport_pipelining():
+            self.tracker = DependencyTracker(self.exp)
+        if mData.get('pushdown'):
+            logging.info('Pushing crops and data removal into the loaders')
+            pushdown_previews(self.exp, plugin_list)
         logging.info('Running the plugin list check')
         self._run_plugin_list_check(plugin_list)
 
         logging.info('Setting up the experiment')
         self.exp._experiment_setup(self)
+        fft_service.configure(self.exp)
 
         exp_coll = self.exp._get_experiment_collection()
         n_plugins = plugin_list._get_n_processing_plugins()
+        self.pipelined = self.tracker.get_pipelined(n_plugins) if \
+            self.tracker else [False]*n_plugins
 
         #  ********* transport function ***********
         logging.info('Running transport_pre_plugin_list_run()')
@@ -64,20 +95,24 @@ class PluginRunner(object):
         cp = self.exp.checkpoint
         for i in range(cp.get_checkpoint_plugin(), n_plugins):
             self.exp._set_experiment_for_current_plugin(i)
-            self.__run_plugin(exp_coll['plugin_dict'][i])
-            # end the plugin run if savu has been killed
-            self.exp._barrier(msg='PluginRunner: plugin complete.')
-
-            #  ********* transport functions ***********
-            if self._transport_kill_signal():
-                self._transport_cleanup(i+1)
-                break
-            self.exp._barrier(msg='PluginRunner: No kill signal... continue.')
+            self.__run_plugin(exp_coll['plugin_dict'][i], i)
+            if not self.pipelined[i]:
+                # end the plugin run if savu has been killed
+                self.exp._barrier(msg='PluginRunner: plugin complete.')
+
+                #  ********* transport functions ***********
+                if self._transport_kill_signal():
+                    self._transport_cleanup(i+1)
+                    break
+                self.exp._barrier(
+                    msg='PluginRunner: No kill signal... continue.')
             cp.output_plugin_checkpoint()
 
         #  ********* transport function ***********
         logging.info('Running transport_post_plugin_list_run')
         self._transport_post_plugin_list_run()
+        if self.exp.meta_data.get('process') == 0:
+            fft_service.save_wisdom()
 
         # terminate any remaining datasets
         for data in self.exp.index['in_data'].values():
@@ -99,27 +134,51 @@ class PluginRunner(object):
         cu.user_message("* Processing " + msg + " *")
         cu.user_message("*"*stars)
 
-    def __run_plugin(self, plugin_dict):
+    def __run_plugin(self, plugin_dict, count):
         plugin = self._transport_load_plugin(self.exp, plugin_dict)
+        # pipelined plugins are not synchronised with the neighbouring plugin
+        following = self.pipelined[count]
+        plugin._set_pipelined(count > 0 and self.pipelined[count-1], following)
 
         #  ********* transport function ***********
         self._transport_pre_plugin()
         cu.user_message("*Running the %s plugin*" % plugin.name)
 
+        start = time.time()
+
         #  ******** transport 'process' function is called inside here ********
         plugin._run_plugin(self.exp, self)  # plugin driver
 
-        self.exp._barrier(msg="Plugin returned from driver in Plugin Runner")
-        cu._output_summary(self.exp.meta_data.get("mpi"), plugin)
+        if not following:
+            self.exp._barrier(
+                msg="Plugin returned from driver in Plugin Runner")
+        if self.exp.meta_data.get('process') == 0:
+            # after the run, as the driver may reduce the number of processes
+            costs = est.get_plugin_costs(plugin)
+            est.record_throughput(
+                self.exp, plugin.name, costs, time.time() - start)
+        # operations involving all processes wait for the next synchronisation
+        deferred = self.__deferred
+        deferred['summary'].append(plugin)
+        if not following:
+            for p in deferred['summary']:
+                cu._output_summary(self.exp.meta_data.get("mpi"), p)
         plugin._clean_up()
+        fft_service.clear_plans()
         finalise = self.exp._finalise_experiment_for_current_plugin()
+        deferred['terminate'] += finalise['remove'] + finalise['replace']
 
-        #  ********* transport function ***********
-        self._transport_post_plugin()
-
-        for data in finalise['remove'] + finalise['replace']:
+        if following:
             #  ********* transport function ***********
-            self._transport_terminate_dataset(data)
+            self._transport_post_plugin_pipelined()
+        else:
+            #  ********* transport function ***********
+            self._transport_post_plugin()
+
+            for data in deferred['terminate']:
+                #  ********* transport function ***********
+                self._transport_terminate_dataset(data)
+            self.__deferred = {'summary': [], 'terminate': []}
 
         self.exp._reorganise_datasets(finalise)
 
@@ -168,6 +227,11 @@ class PluginRunner(object):
         for i in range(n_loaders, n_loaders+n_plugins):
             self.exp._barrier()
             plugin = pu.plugin_loader(self.exp, plist[i], check=check[count])
+            if self.estimator and check[count]:
+                self.estimator.add_plugin(plugin)
+            if self.tracker:
+                # the last run through the plugin list has the final indices
+                self.tracker.add_plugin(count, plugin)
             plugin._revert_preview(plugin.get_in_datasets())
             plist[i]['cite'] = plugin.get_citation_information()
             plugin._clean_up()
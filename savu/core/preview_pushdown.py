@@ -0,0 +1,118 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: preview_pushdown
+   :platform: Unix
+   :synopsis: An optimisation pass over the plugin list, which replaces \
+       plugins that only crop or remove data with previewing in the loader.
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import savu.core.utils as cu
+import savu.plugins.utils as pu
+
+
+def pushdown_previews(exp, plugin_list):
+    """ Remove each plugin that only crops or removes entries of a loaded
+    dataset (see Plugin.get_loader_preview) and add the equivalent previewing
+    to the loader instead, so the unwanted data is never read.  A plugin is
+    only removed if it is the first plugin to use the dataset, it replaces
+    the dataset (the in and out dataset names are the same), the loader
+    creates only that dataset and the loader is not already previewing the
+    dimensions that the plugin reduces.
+
+    :params Experiment exp: The experiment object.
+    :params PluginList plugin_list: The plugin list (updated in place).
+    :returns: The names of the plugins that were removed.
+    :rtype: list(str)
+    """
+    factor = exp.meta_data.get_dictionary().get('quick_look')
+    if factor and factor != 1:
+        # the plugin indices would be relative to the quick-look data
+        return []
+
+    removed = []
+    while _pushdown_next(exp, plugin_list, removed):
+        pass
+    plugin_list._reset_datasets_list()
+
+    if exp.meta_data.get('process') == 0:
+        for name in removed:
+            cu.user_message("Replaced the %s plugin with previewing in the "
+                            "loader" % name)
+    return removed
+
+
+def _pushdown_next(exp, plugin_list, removed):
+    """ Find and remove the first plugin that can be replaced by previewing
+    in the loader. """
+    plugin_list._check_loaders()
+    n_loaders = plugin_list._get_n_loaders()
+    plist = plugin_list.plugin_list
+
+    try:
+        loaders = {}
+        for i in range(n_loaders):
+            before = set(exp.index['in_data'].keys())
+            pu.plugin_loader(exp, plist[i])
+            new = set(exp.index['in_data'].keys()).difference(before)
+            if len(new) == 1:
+                loaders[new.pop()] = i
+
+        used = set()
+        for i in range(n_loaders, len(plist)):
+            if not set(loaders.keys()).difference(used):
+                return False
+            plugin = pu.plugin_loader(exp, plist[i], check=True)
+            in_names = [d.get_name() for d in plugin.get_in_datasets()]
+            out_names = [d.get_name() for d in plugin.get_out_datasets()]
+            if len(in_names) == 1 and in_names == out_names and \
+                    in_names[0] in loaders and in_names[0] not in used:
+                loader = plist[loaders[in_names[0]]]
+                preview = _merge(loader['data'].get('preview', []),
+                                 plugin.get_loader_preview())
+                if preview:
+                    loader['data']['preview'] = preview
+                    removed.append(plist[i]['name'])
+                    del plist[i]
+                    return True
+            used.update(in_names + out_names)
+            plugin._revert_preview(plugin.get_in_datasets())
+            plugin._clean_up()
+            exp._merge_out_data_to_in()
+        return False
+    finally:
+        exp._clear_data_objects()
+
+
+def _merge(existing, preview):
+    """ Add the plugin previewing to the loader previewing, if the loader is
+    not previewing the same dimensions. """
+    if not preview:
+        return None
+    if not existing:
+        return preview
+    if isinstance(existing, str) or len(existing) != len(preview):
+        return None
+    merged = list(existing)
+    for dim, entry in enumerate(preview):
+        if entry == ':':
+            continue
+        if merged[dim] != ':':
+            return None
+        merged[dim] = entry
+    return merged
@@ -0,0 +1,185 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: residency
+   :platform: Unix
+   :synopsis: Keep intermediate datasets in (node shared) memory, within a \
+       memory budget, instead of reading them back from hdf5 backing files.
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import logging
+import h5py
+import numpy as np
+from collections import OrderedDict
+from mpi4py import MPI
+
+import savu.core.utils as cu
+from savu.data.data_structures.data_types.base_type import BaseType
+
+
+def get_residency_manager(exp):
+    """ Create a ResidencyManager if a memory budget is set in the
+    'residency_settings' entry of the system parameters.  Datasets are only
+    kept in memory if all the processes are on the same node, and not when
+    checkpointing or pipelining the plugins.
+
+    :params Experiment exp: The experiment object.
+    :returns: The residency manager (or None).
+    :rtype: ResidencyManager
+    """
+    mData = exp.meta_data.get_dictionary()
+    settings = mData['system_params'].get('residency_settings')
+    budget = float(settings.get('memory_budget', 0)) if settings else 0
+    if not budget or mData.get('checkpoint') or mData.get('pipeline'):
+        return None
+
+    comm = MPI.COMM_WORLD.Split_type(MPI.COMM_TYPE_SHARED)
+    if comm.Get_size() != MPI.COMM_WORLD.Get_size():
+        comm.Free()
+        if mData.get('process') == 0:
+            cu.user_message("Intermediate datasets are not kept in memory "
+                            "when running on more than one node")
+        return None
+    return ResidencyManager(exp, budget*1e9, comm)
+
+
+class ResidencyManager(object):
+    """ Keeps the intermediate datasets that are read by a later plugin in
+    memory, shared between the processes on the node, while they fit in the
+    memory budget.  When a new dataset does not fit, the least recently used
+    datasets (that are not used by the current plugin) are written to their
+    hdf5 backing files and read from there instead.  A dataset is released
+    after the last plugin that reads it, and then written to its backing file
+    (unless it is removed), so the intermediate files are complete.
+
+    :param Experiment exp: The experiment object.
+    :param float budget: The memory budget for the node in bytes.
+    :param comm: The communicator for the processes on the node.
+    """
+
+    def __init__(self, exp, budget, comm):
+        self.exp = exp
+        self.budget = budget
+        self.comm = comm
+        self.resident = OrderedDict()  # in least recently used order
+        plist = exp.meta_data.plugin_list
+        self.out_flow = plist._get_dataset_flow('out_datasets')
+        self.in_flow = plist._get_dataset_flow('in_datasets')
+
+    def _get_memory_used(self):
+        return sum(entry['nbytes'] for entry in self.resident.values())
+
+    def _get_last_use(self, name, count):
+        """ The last plugin that reads the dataset created by plugin count,
+        before the dataset is replaced. """
+        last = count
+        for i in range(count + 1, len(self.in_flow)):
+            if name in self.in_flow[i]:
+                last = i
+            if name in self.out_flow[i]:
+                break
+        return last
+
+    def _pre_plugin(self, count, out_data):
+        """ Mark the datasets read by the current plugin as recently used and
+        keep the output datasets in memory, if they will be read again.
+
+        :params int count: The plugin index.
+        :params list(Data) out_data: The output datasets of the plugin.
+        """
+        in_names = self.in_flow[count]
+        for key in [k for k in self.resident.keys() if k[0] in in_names]:
+            self.resident[key] = self.resident.pop(key)
+
+        for data in out_data:
+            name = data.get_name()
+            last = self._get_last_use(name, count)
+            if last > count and isinstance(data.data, h5py.Dataset):
+                self.__make_resident(data, count, last, in_names)
+
+    def __make_resident(self, data, count, last, in_names):
+        shape = tuple(data.get_shape())
+        dtype = np.dtype(data.data.dtype)
+        nbytes = int(np.prod(shape))*dtype.itemsize
+        if nbytes > self.budget:
+            return
+
+        evict = []
+        used = self._get_memory_used()
+        for key, entry in self.resident.iteritems():
+            if used + nbytes <= self.budget:
+                break
+            if key[0] not in in_names:
+                evict.append(key)
+                used -= entry['nbytes']
+        if used + nbytes > self.budget:
+            return
+        for key in evict:
+            self.__release(key, spill=True)
+
+        rank = self.comm.Get_rank()
+        win = MPI.Win.Allocate_shared(
+            nbytes if rank == 0 else 0, dtype.itemsize, comm=self.comm)
+        buf, _ = win.Shared_query(0)
+        array = np.ndarray(buffer=buf, dtype=dtype, shape=shape)
+        self.resident[(data.get_name(), count)] = {
+            'array': array, 'win': win, 'h5': data.data, 'data': data,
+            'nbytes': nbytes, 'last': last}
+        data.data = array
+        logging.debug("Keeping dataset %s (%i bytes) in memory",
+                      data.get_name(), nbytes)
+
+    def _is_resident(self, data):
+        return any(entry['array'] is data.data
+                   for entry in self.resident.values())
+
+    def _post_plugin(self, count):
+        """ Release the datasets that are not read by any later plugin. """
+        for key in [k for k, entry in self.resident.iteritems()
+                    if entry['last'] <= count]:
+            self.__release(key, spill=not self.resident[key]['data'].remove)
+
+    def _release_all(self):
+        for key in self.resident.keys():
+            self.__release(key, spill=not self.resident[key]['data'].remove)
+        self.comm.Free()
+
+    def __release(self, key, spill=True):
+        """ Write a dataset to its backing file and free the memory. """
+        entry = self.resident.pop(key)
+        array, h5 = entry['array'], entry['h5']
+        if spill:
+            # the processes on the node write their share of the dataset
+            index = np.array_split(np.arange(array.shape[0]),
+                                   self.comm.Get_size())[self.comm.Get_rank()]
+            if index.size:
+                h5[index[0]:index[-1] + 1] = array[index[0]:index[-1] + 1]
+        self.comm.Barrier()
+
+        for data in self.__get_data_objects(entry):
+            if data.data is array:
+                data.data = h5
+            elif isinstance(data.data, BaseType) and data.data.data is array:
+                data.data.data = h5
+        entry['win'].Free()
+
+    def __get_data_objects(self, entry):
+        """ The data object that created the dataset and any copies. """
+        index = self.exp.index
+        return [entry['data']] + index['in_data'].values() + \
+            index['out_data'].values()
@@ -27,9 +27,12 @@ import time
 import copy
 import h5py
 import numpy as np
+from multiprocessing.pool import ThreadPool
 
 import savu.core.utils as cu
+import savu.core.fft_service as fft_service
 import savu.plugins.utils as pu
+from savu.data.chunked_directory import ChunkedDirectory
 from savu.data.data_structures.data_types.base_type import BaseType
 
 NX_CLASS = 'NX_class'
@@ -43,6 +46,7 @@ class BaseTransport(object):
 
     def __init__(self):
         self.pDict = None
+        self.pool = None
         self.no_processing = False
 
     def _transport_initialise(self, options):
@@ -84,6 +88,22 @@ class BaseTransport(object):
         """
         pass
 
+    def _transport_pipelining(self):
+        """
+        Does the transport mechanism support pipelining of plugins (where
+        the processes are not synchronised between consecutive plugins)?
+        """
+        return False
+
+    def _transport_post_plugin_pipelined(self):
+        """
+        This method is called directly AFTER each plugin that is pipelined
+        with the next plugin is executed, in place of _transport_post_plugin.
+        Any operations that require all processes must be deferred until the
+        next call to _transport_post_plugin.
+        """
+        pass
+
     def _transport_post_plugin_list_run(self):
         """
         This method is called AFTER the full plugin list has been processed.
@@ -111,6 +131,10 @@ class BaseTransport(object):
             pDict['nTrans'] = 1
         pDict['squeeze'] = self._set_functions(pDict['in_data'], 'squeeze')
         pDict['expand'] = self._set_functions(pDict['out_data'], 'expand')
+        pDict['buffers'] = self.__use_output_buffers(plugin, pDict['out_data'])
+        if pDict['buffers']:
+            pDict['squeeze_out'] = \
+                self._set_functions(pDict['out_data'], 'squeeze')
 
         frames = [f for f in pDict['in_sl']['frames']]
         self._set_global_frame_index(plugin, frames, pDict['nProc'])
@@ -123,50 +147,127 @@ class BaseTransport(object):
         """
         pDict, result, nTrans = self._initialise(plugin)
         cp, sProc, sTrans = self.__get_checkpoint_params(plugin)
+        self.pool = self.__get_thread_pool(plugin, pDict['nProc'])
 
         count = 0  # temporary solution
         prange = range(sProc, pDict['nProc'])
         kill = False
-        for count in range(sTrans, nTrans):
-            end = True if count == nTrans-1 else False
-            self._log_completion_status(count, nTrans, plugin.name)
-
-            # get the transfer data
-            transfer_data = self._transfer_all_data(count)
-            # loop over the process data
-            result, kill = self._process_loop(
+        try:
+            for count in range(sTrans, nTrans):
+                end = True if count == nTrans-1 else False
+                self._log_completion_status(count, nTrans, plugin.name)
+
+                # get the transfer data
+                transfer_data = self._transfer_all_data(count)
+                # loop over the process data
+                result, kill = self._process_loop(
                     plugin, prange, transfer_data, count, pDict, result, cp)
 
-            self._return_all_data(count, result, end)
+                self._return_all_data(count, result, end)
 
-            if kill:
-                return 1
+                if kill:
+                    return 1
+        finally:
+            if self.pool:
+                self.pool.close()
+                self.pool = None
 
         if not kill:
             cu.user_message("%s - 100%% complete" % (plugin.name))
 
+    def __get_thread_pool(self, plugin, nProc):
+        """ Create a pool of threads to process the frames of each transfer
+        block concurrently, if the plugin is thread safe. """
+        if not plugin.thread_safe() or nProc < 2:
+            return None
+        threads = plugin.nThreads()
+        if threads == 'auto':
+            threads = cu.get_threads_per_process(self.exp)
+        threads = min(int(threads), nProc)
+        if threads < 2:
+            return None
+        # the pool uses the cores available to the process, so each thread
+        # runs its transforms single threaded
+        return ThreadPool(threads, initializer=fft_service.init_worker_thread)
+
     def _process_loop(self, plugin, prange, tdata, count, pDict, result, cp):
+        if self.pool:
+            return self.__threaded_process_loop(
+                plugin, prange, tdata, count, pDict, result, cp)
         kill_signal = False
         for i in prange:
             if cp and cp.is_time_to_checkpoint(self, count, i):
                 # kill signal sent so stop the processing
                 return result, True
             data = self._get_input_data(plugin, tdata, i, count)
-            res = self._get_output_data(
-                    plugin.plugin_process_frames(data), i)
+            out = self.__get_output_buffers(result, i)
+            self.__set_result(
+                result, plugin.plugin_process_frames(data, out), i, out)
+        return result, kill_signal
 
-            for j in pDict['nOut']:
-                if res is not None:
-                    out_sl = pDict['out_sl']['process'][i][j]
-                    result[j][out_sl] = res[j]
-                else:
-                    result[j] = None
+    def __threaded_process_loop(self, plugin, prange, tdata, count, pDict,
+                                result, cp):
+        """ Process the frames in the thread pool.  The input data is
+        gathered, and the results completed, in frame order in this thread.
+        """
+        kill_signal = False
+        jobs = []
+        for i in prange:
+            if cp and cp.is_time_to_checkpoint(self, count, i):
+                # kill signal sent so stop the processing
+                kill_signal = True
+                break
+            data = self._get_input_data(plugin, tdata, i, count)
+            out = self.__get_output_buffers(result, i)
+            jobs.append((i, out, self.pool.apply_async(
+                plugin._run_process_frames, (data, out))))
+
+        for i, out, job in jobs:
+            self.__set_result(
+                result, plugin._complete_process_frames(job.get()), i, out)
         return result, kill_signal
 
+    def __use_output_buffers(self, plugin, out_data):
+        """ Plugin results can only be written in place if they are not
+        unpadded. """
+        if not plugin.uses_output_buffers() or not out_data:
+            return False
+        return not any(d._get_plugin_data().padding for d in out_data)
+
+    def __get_output_buffers(self, result, nproc):
+        """ Get the views of the transfer block that the plugin may write the
+        results for the current frames into. """
+        if not self.pDict['buffers'] or \
+                any(r is None for r in result):
+            return None
+        out = []
+        for j in self.pDict['nOut']:
+            out_sl = self.pDict['out_sl']['process'][nproc][j]
+            out.append(self.pDict['squeeze_out'][j](result[j][out_sl]))
+        return out
+
+    def __set_result(self, result, res, nproc, out=None):
+        """ Copy the plugin results into the transfer block, unless they were
+        written in place. """
+        in_place = [False]*len(self.pDict['nOut'])
+        if res is not None and out is not None:
+            frames = res if isinstance(res, list) else [res]
+            in_place = [f is o for f, o in zip(frames, out)] + \
+                in_place[len(out):]
+        res = self._get_output_data(res, nproc)
+        for j in self.pDict['nOut']:
+            if res is None:
+                result[j] = None
+            elif not in_place[j]:
+                out_sl = self.pDict['out_sl']['process'][nproc][j]
+                result[j][out_sl] = res[j]
+
     def __get_checkpoint_params(self, plugin):
         cp = self.exp.checkpoint
         if cp:
-            cp._initialise(plugin.get_communicator())
+            # pipelined plugins do not wait for the other processes
+            cp._initialise(None if plugin._pipelined[0] else
+                           plugin.get_communicator())
             return cp, cp.get_proc_idx(), cp.get_trans_idx()
         return None, 0, 0
 
@@ -388,15 +489,16 @@ class BaseTransport(object):
         if 'current_and_next' in self.exp.meta_data.get_dictionary():
             current_and_next = self.exp.meta_data.get('current_and_next')
         
-        count = 0
         for key in out_data_dict.keys():
-            out_data = out_data_dict[key]
-            filename = self.exp.meta_data.get(["filename", key])
-            out_data.backing_file = self.hdf5._open_backing_h5(filename, 'a')
             c_and_n = 0 if not current_and_next else current_and_next[key]
-            out_data.group_name, out_data.group = self.hdf5._create_entries(
-                out_data, key, c_and_n)
-            count += 1
+            self._setup_backing_data(out_data_dict[key], key, c_and_n)
+
+    def _setup_backing_data(self, out_data, key, current_and_next):
+        """ Create the hdf5 file and dataset for an output dataset. """
+        filename = self.exp.meta_data.get(["filename", key])
+        out_data.backing_file = self.hdf5._open_backing_h5(filename, 'a')
+        out_data.group_name, out_data.group = self.hdf5._create_entries(
+            out_data, key, current_and_next)
 
     def _set_file_details(self, files):
         self.exp.meta_data.set('link_type', files['link_type'])
@@ -475,7 +577,7 @@ class BaseTransport(object):
 
     def __output_data_type(self, entry, data, name):
         data = data.data if 'data' in data.__dict__.keys() else data
-        if isinstance(data, h5py.Dataset):
+        if isinstance(data, (h5py.Dataset, np.ndarray, ChunkedDirectory)):
             return
 
         entry = entry.require_group('data_type')
@@ -0,0 +1,81 @@
+# Copyright 2015 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+.. module:: chunked_transport
+   :platform: Unix
+   :synopsis: Transport specific plugin list runner, which stores the \
+       intermediate datasets as directories of chunk files.
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import os
+import shutil
+import logging
+
+from savu.core.transports.hdf5_transport import Hdf5Transport
+from savu.data.chunking import Chunking
+from savu.data.chunked_directory import ChunkedDirectory
+
+
+class ChunkedTransport(Hdf5Transport):
+    """ Stores each intermediate dataset as a directory with one file per
+    chunk (see ChunkedDirectory), instead of an hdf5 file.  The processes read
+    and write the chunk files independently, so no parallel hdf5 (MPI-IO) or
+    collective file operations are required.  The chunk shapes are calculated
+    in the same way as for the hdf5 datasets.  Final results are still
+    written to hdf5 files and linked to the nexus file, whereas the
+    intermediate directories are not linked to the nexus file.
+
+    The chunk file format ('raw' or 'npy') is set by the 'chunk_format' entry
+    of the 'chunked_transport' system parameters.
+    """
+
+    def _setup_backing_data(self, out_data, key, current_and_next):
+        """ Create a chunked directory for an intermediate dataset, or an
+        hdf5 file for a final result. """
+        if self.exp.meta_data.get(['link_type', key]) == 'final_result':
+            super(ChunkedTransport, self)._setup_backing_data(
+                out_data, key, current_and_next)
+            return
+
+        filename = self.exp.meta_data.get(["filename", key])
+        out_data.data_info.set(
+            'group_name', self.exp.meta_data.get(["group_name", key]))
+        shape = out_data.get_shape()
+        pdict = self.exp.meta_data.get('system_params')
+
+        chunks = None
+        if current_and_next:
+            chunks = Chunking(self.exp, current_and_next)._calculate_chunking(
+                shape, out_data.dtype, chunk_max=pdict['max_chunk_size']*1e6)
+        # h5py chooses the chunks (True) for datasets with less than 3 dims
+        chunks = chunks if isinstance(chunks, tuple) else None
+
+        settings = pdict.get('chunked_transport') or {}
+        out_data.data = ChunkedDirectory(
+            os.path.splitext(filename)[0] + '.chunks', shape, out_data.dtype,
+            chunks=chunks, chunk_format=settings.get('chunk_format', 'raw'),
+            write_meta=self.exp.meta_data.get('process') == 0)
+        out_data.backing_file = None
+        logging.debug("Created the chunked directory %s with chunks %s",
+                      out_data.data.path, out_data.data.chunks)
+
+    def _transport_terminate_dataset(self, data):
+        super(ChunkedTransport, self)._transport_terminate_dataset(data)
+        if data.remove and isinstance(data.data, ChunkedDirectory):
+            self.exp._barrier(msg="ChunkedTransport_terminate_dataset")
+            if self.exp.meta_data.get('process') == 0:
+                shutil.rmtree(data.data.path, ignore_errors=True)
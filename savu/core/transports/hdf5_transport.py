@@ -25,6 +25,7 @@ import os
 import logging
 
 from savu.core.transport_setup import MPI_setup
+from savu.core.residency import get_residency_manager
 from savu.plugins.savers.utils.hdf5_utils import Hdf5Utils
 from savu.core.transports.base_transport import BaseTransport
 
@@ -41,6 +42,8 @@ class Hdf5Transport(BaseTransport):
         self.exp_coll = None
         self.data_flow = []
         self.files = []
+        self.pipelined_data = []
+        self.residency = None
 
     def _transport_update_plugin_list(self):
         plugin_list = self.exp.meta_data.plugin_list
@@ -67,26 +70,67 @@ class Hdf5Transport(BaseTransport):
                 self._get_filenames(self.exp_coll['plugin_dict'][i]))
             self._set_file_details(self.files[i])
             self._setup_h5_files()  # creates the hdf5 files
+        self.residency = get_residency_manager(self.exp)
 
     def _transport_pre_plugin(self):
         count = self.exp.meta_data.get('nPlugin')
         self._set_file_details(self.files[count])
+        if self.residency:
+            self.residency._pre_plugin(
+                count, self.exp.index['out_data'].values())
 
     def _transport_post_plugin(self):
+        self.__reopen_pipelined_files()
         for data in self.exp.index['out_data'].values():
-            if not data.remove:
+            if not data.remove and data.backing_file is not None:
                 msg = self.__class__.__name__ + "_transport_post_plugin."
                 self.exp._barrier(msg=msg)
-                if self.exp.meta_data.get('process') == \
-                        len(self.exp.meta_data.get('processes'))-1:
-                    self._populate_nexus_file(data)
-                    self.hdf5._link_datafile_to_nexus_file(data)
+                self.__link_to_nexus_file(data)
                 self.exp._barrier(msg=msg)
-                # reopen file as read-only
-                self.hdf5._reopen_file(data, 'r')
+                # reopen file as read-only (datasets in memory may still be
+                # written to the file)
+                if not (self.residency and
+                        self.residency._is_resident(data)):
+                    self.hdf5._reopen_file(data, 'r')
+        if self.residency:
+            self.residency._post_plugin(
+                self.exp.meta_data.get('nPlugin'))
+
+    def _transport_post_plugin_list_run(self):
+        if self.residency:
+            self.residency._release_all()
+            self.residency = None
+
+    def _transport_pipelining(self):
+        return True
+
+    def _transport_post_plugin_pipelined(self):
+        # the files remain open for writing until the processes are next
+        # synchronised, as closing an hdf5 file is a collective operation
+        for data in self.exp.index['out_data'].values():
+            if not data.remove and data.backing_file is not None:
+                self.__link_to_nexus_file(data)
+                self.pipelined_data.append(data.get_name())
+
+    def __link_to_nexus_file(self, data):
+        if self.exp.meta_data.get('process') == \
+                len(self.exp.meta_data.get('processes'))-1:
+            self._populate_nexus_file(data)
+            self.hdf5._link_datafile_to_nexus_file(data)
+
+    def __reopen_pipelined_files(self):
+        """ Reopen the files written by pipelined plugins as read-only,
+        unless they are about to be replaced. """
+        in_data = self.exp.index['in_data']
+        out_names = self.exp.index['out_data'].keys()
+        for name in sorted(set(self.pipelined_data)):
+            if name in in_data.keys() and name not in out_names:
+                self.hdf5._reopen_file(in_data[name], 'r')
+        self.pipelined_data = []
 
     def _transport_terminate_dataset(self, data):
-        self.hdf5._close_file(data)
+        if data.backing_file is not None:
+            self.hdf5._close_file(data)
 
     def _transport_checkpoint(self):
         """ The framework has determined it is time to checkpoint.  What
@@ -120,9 +164,10 @@ class Hdf5Transport(BaseTransport):
 
     def _transport_cleanup(self, i):
         """ Any remaining cleanup after kill signal sent """
+        self._transport_post_plugin_list_run()
         n_plugins = len(self.exp_coll['datasets'])
         for i in range(i, n_plugins):
             self.exp._set_experiment_for_current_plugin(i)
             for data in self.exp.index['out_data'].values():
-                self.hdf5._close_file(data)
+                self._transport_terminate_dataset(data)
 
@@ -23,6 +23,8 @@
 import logging
 import logging.handlers as handlers
 import itertools
+import multiprocessing
+import numpy as np
 from mpi4py import MPI
 
 
@@ -104,6 +106,37 @@ def add_base_classes(this, bases):
         add_base(this, base)
 
 
+def root_bcast(func, comm=None):
+    """ Evaluate func on the root process of a communicator only and
+    broadcast the numpy array it returns to all other processes.
+
+    :params func: a function with no arguments that returns a numpy array
+    :params comm: the MPI communicator (the function is evaluated locally if
+        this is None or contains a single process)
+    :returns: the result of func on every process
+    """
+    if comm is None or comm == MPI.COMM_NULL or comm.size == 1:
+        return func()
+    data = np.ascontiguousarray(func()) if comm.rank == 0 else None
+    info = (data.shape, data.dtype.str) if comm.rank == 0 else None
+    shape, dtype = comm.bcast(info, root=0)
+    if comm.rank != 0:
+        data = np.empty(shape, dtype=np.dtype(dtype))
+    if data.size:
+        comm.Bcast(data, root=0)
+    return data
+
+
+def get_threads_per_process(exp):
+    """ The number of cores on a node shared between the processes on that
+    node.
+
+    :params Experiment exp: The experiment object.
+    """
+    names = exp.meta_data.get('process_names').split(',')
+    return max(1, multiprocessing.cpu_count()/len(names))
+
+
 def get_available_gpus():
     try:
         import pynvml as pv
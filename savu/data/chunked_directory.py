@@ -0,0 +1,240 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: chunked_directory
+   :platform: Unix
+   :synopsis: A dataset stored as a directory with one file per chunk, that \
+       processes can read and write independently.
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import os
+import json
+import errno
+import itertools
+import numpy as np
+
+META_FILE = '.meta.json'
+FORMATS = ['raw', 'npy']
+
+
+def _makedirs(path):
+    try:
+        os.makedirs(path)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+
+class ChunkedDirectory(object):
+    """ A dataset stored as a directory of chunk files (similar to a zarr
+    array).  Each chunk is a file named by its chunk indices (e.g. '3.0.1'),
+    containing the full (edge chunks are padded) chunk in C order, either as
+    raw binary or with a numpy (npy) header.  Chunk files are created when
+    they are first written and are written in place through a memory map, so
+    processes writing different parts of a chunk do not overwrite each other
+    and no locking or collective operations are required.  Unwritten chunks
+    are read as zeros.
+
+    :param str path: The directory.
+    :param tuple shape: The dataset shape.
+    :param dtype: The data type.
+    :param tuple chunks: The chunk shape (defaults to single entries in the
+        first dimension).
+    :param str chunk_format: 'raw' or 'npy'.
+    :param bool write_meta: Write the metadata file (only one process needs
+        to).
+    """
+
+    def __init__(self, path, shape, dtype, chunks=None, chunk_format='raw',
+                 write_meta=True):
+        if chunk_format not in FORMATS:
+            raise ValueError("Unknown chunk format %s, choose from %s"
+                             % (chunk_format, FORMATS))
+        self.path = path
+        self.shape = tuple(int(s) for s in shape)
+        self.dtype = np.dtype(dtype)
+        self.chunks = tuple(int(c) for c in chunks) if chunks else \
+            (1,) + self.shape[1:]
+        self.chunk_format = chunk_format
+        self.ndim = len(self.shape)
+        self.__header = self.__get_header()
+        _makedirs(path)
+        if write_meta:
+            self.__write_meta()
+
+    @classmethod
+    def open(cls, path):
+        """ Open an existing chunked directory. """
+        with open(os.path.join(path, META_FILE), 'r') as f:
+            meta = json.load(f)
+        return cls(path, meta['shape'], meta['dtype'], meta['chunks'],
+                   meta['format'], write_meta=False)
+
+    def __write_meta(self):
+        meta = {'shape': self.shape, 'dtype': self.dtype.str,
+                'chunks': self.chunks, 'format': self.chunk_format}
+        tmp = os.path.join(self.path, META_FILE + '.%i' % os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.rename(tmp, os.path.join(self.path, META_FILE))
+
+    def __get_header(self):
+        if self.chunk_format == 'raw':
+            return b''
+        header = {'descr': np.lib.format.dtype_to_descr(self.dtype),
+                  'fortran_order': False, 'shape': self.chunks}
+        f = _BytesWriter()
+        np.lib.format.write_array_header_1_0(f, header)
+        return f.value
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _get_chunk_file(self, idx):
+        return os.path.join(self.path, '.'.join(str(i) for i in idx))
+
+    def __map_chunk(self, idx, write):
+        """ Memory map a chunk file (creating it if writing), or return None
+        if it does not exist. """
+        fname = self._get_chunk_file(idx)
+        nbytes = len(self.__header) + \
+            int(np.prod(self.chunks))*self.dtype.itemsize
+        if write:
+            fd = os.open(fname, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                # the size and header are the same from every process, so it
+                # does not matter which process creating the file gets there
+                # first
+                if os.fstat(fd).st_size != nbytes:
+                    os.ftruncate(fd, nbytes)
+                    os.write(fd, self.__header)
+            finally:
+                os.close(fd)
+        elif not os.path.exists(fname):
+            return None
+        return np.memmap(fname, dtype=self.dtype, mode='r+' if write else 'r',
+                         offset=len(self.__header), shape=self.chunks)
+
+    def __get_ranges(self, key):
+        """ Convert an index to the contiguous range covered in each
+        dimension, and the index to apply to the range to give the
+        selection. """
+        key = key if isinstance(key, tuple) else (key,)
+        if any(k is Ellipsis for k in key):
+            i = key.index(Ellipsis)
+            key = key[:i] + (slice(None),)*(self.ndim - len(key) + 1) + \
+                key[i+1:]
+        key = key + (slice(None),)*(self.ndim - len(key))
+
+        ranges, select = [], []
+        for dim, k in enumerate(key):
+            if isinstance(k, slice):
+                start, stop, step = k.indices(self.shape[dim])
+                index = np.arange(start, stop, step)
+            else:
+                index = np.asarray(k, dtype=int)
+                index = index + self.shape[dim]*(index < 0)
+            if not index.size:
+                ranges.append((0, 0))
+                select.append(slice(None))
+                continue
+            lo, hi = int(index.min()), int(index.max()) + 1
+            ranges.append((lo, hi))
+            if index.ndim == 0:
+                select.append(int(index) - lo)
+            elif np.array_equal(index, np.arange(lo, hi)):
+                select.append(slice(None))
+            else:
+                select.append(index - lo)
+        return ranges, select
+
+    def __get_chunk_regions(self, ranges):
+        """ Split a range in each dimension into the regions of each chunk it
+        covers.
+
+        :returns: The shape of the region, and a list of the chunk index, the
+            slice list within the chunk and the slice list within the region
+            for each chunk.
+        """
+        shape = tuple(stop - start for start, stop in ranges)
+        per_dim = []
+        for (start, stop), c in zip(ranges, self.chunks):
+            regions = []
+            for idx in range(start/c, (stop - 1)/c + 1 if stop > start
+                             else start/c):
+                lo, hi = max(start, idx*c), min(stop, (idx + 1)*c)
+                regions.append((idx, slice(lo - idx*c, hi - idx*c),
+                                slice(lo - start, hi - start)))
+            per_dim.append(regions)
+
+        regions = [(tuple(r[0] for r in region),
+                    tuple(r[1] for r in region), tuple(r[2] for r in region))
+                   for region in itertools.product(*per_dim)]
+        return shape, regions
+
+    def __getitem__(self, key):
+        ranges, select = self.__get_ranges(key)
+        shape, regions = self.__get_chunk_regions(ranges)
+        out = np.zeros(shape, dtype=self.dtype)
+        for idx, chunk_sl, out_sl in regions:
+            chunk = self.__map_chunk(idx, False)
+            if chunk is not None:
+                out[out_sl] = chunk[chunk_sl]
+                del chunk
+        return _select(out, select)
+
+    def __setitem__(self, key, value):
+        ranges, select = self.__get_ranges(key)
+        if any(isinstance(s, np.ndarray) for s in select):
+            raise IndexError("ChunkedDirectory only supports writing to "
+                             "contiguous regions")
+        shape, regions = self.__get_chunk_regions(ranges)
+        value = np.asarray(value, dtype=self.dtype)
+        value = np.broadcast_to(value.reshape(shape) if value.size ==
+                                np.prod(shape) else value, shape)
+        for idx, chunk_sl, in_sl in regions:
+            chunk = self.__map_chunk(idx, True)
+            chunk[chunk_sl] = value[in_sl]
+            chunk.flush()
+            del chunk
+
+
+def _select(array, select):
+    """ Apply an index to each dimension in turn (index arrays in more than
+    one dimension are not broadcast together, unlike numpy indexing). """
+    for dim in reversed(range(len(select))):
+        sl = select[dim]
+        if isinstance(sl, np.ndarray):
+            array = np.take(array, sl, axis=dim)
+        elif not isinstance(sl, slice):
+            array = array[(slice(None),)*dim + (sl,)]
+    return array
+
+
+class _BytesWriter(object):
+    """ A minimal file-like object to collect the npy header. """
+
+    def __init__(self):
+        self.value = b''
+
+    def write(self, data):
+        self.value += data
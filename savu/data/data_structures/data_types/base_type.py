@@ -24,6 +24,7 @@
 import inspect
 
 import savu.plugins.utils as pu
+import savu.data.data_structures.data_types.read_planner as rp
 
 
 class BaseType(object):
@@ -41,6 +42,17 @@ class BaseType(object):
         """ Get full stitched shape of a stack of files"""
         raise NotImplementedError("get_shape must be implemented.")
 
+    def _read_index(self, data, index, dim, dtype=None):
+        """ Read a list of indices in one dimension of a dataset (and
+        slices in the others) as a few merged contiguous reads.
+
+        :params data: The dataset to read from.
+        :params tuple index: A slice for each dimension, except a list of
+            integers in dimension dim.
+        :params int dim: The indexed dimension.
+        """
+        return rp.read_index(data, index, dim, dtype=dtype)
+
     def add_base_class_with_instance(self, base, inst):
         """ Add a base class instance to a class (merging of two data types).
 
@@ -25,6 +25,7 @@
 import numpy as np
 import copy
 
+import savu.core.utils as cu
 from savu.data.data_structures.data_types.base_type import BaseType
 
 
@@ -39,12 +40,13 @@ class DataWithDarksAndFlats(BaseType):
         self.data = data_obj.data
         self.dark_flat_slice_list = []
         self.dtype = data_obj.data.dtype
+        self.mean_cache = {}
 
     def _base_extra_params(self):
         """ global class parameter names that are updated outside of __init__
         """
         extras = ['fscale', 'dscale', 'dark_updated', 'flat_updated',
-                  'dark_flat_slice_list']
+                  'dark_flat_slice_list', 'mean_cache']
         return extras
 
     def _override_data_type(self, data):
@@ -65,8 +67,8 @@ class DataWithDarksAndFlats(BaseType):
     def _getitem_imagekey(self, idx):
         index = list(idx)
         index[self.proj_dim] = \
-            self.get_index(0, full=True)[idx[self.proj_dim]].tolist()
-        return self.data[tuple(index)]
+            self.get_index(0, full=True)[idx[self.proj_dim]]
+        return self._read_index(self.data, index, self.proj_dim)
 
     def _getitem_noimagekey(self, idx):
         return self.data[idx]
@@ -96,25 +98,88 @@ class DataWithDarksAndFlats(BaseType):
 
     def set_flat_scale(self, fscale):
         self.fscale = float(fscale)
+        self._clear_mean_cache('flat')
 
     def set_dark_scale(self, dscale):
         self.dscale = float(dscale)
+        self._clear_mean_cache('dark')
 
     def get_shape(self):
         return self.shape
 
-    def dark_mean(self):
-        """ Get the averaged dark projection data. """
-        return self._calc_mean(self.dark())
+    def dark_mean(self, comm=None):
+        """ Get the averaged dark projection data.
 
-    def flat_mean(self):
-        """ Get the averaged flat projection data. """
-        return self._calc_mean(self.flat())
+        :params comm: If an MPI communicator is given, the mean is calculated
+            by the root process only and broadcast to all other processes.
+        """
+        return self._get_cached_mean('dark', self._calc_mean, comm)
+
+    def flat_mean(self, comm=None):
+        """ Get the averaged flat projection data.
+
+        :params comm: If an MPI communicator is given, the mean is calculated
+            by the root process only and broadcast to all other processes.
+        """
+        return self._get_cached_mean('flat', self._calc_mean, comm)
+
+    def dark_batch_means(self, comm=None):
+        """ Get the averaged dark projection data for each batch of
+        consecutive darks in the image key.
+
+        :params comm: If an MPI communicator is given, the means are
+            calculated by the root process only and broadcast to all other
+            processes.
+        :returns: an array of means with the batch as the first dimension
+        """
+        return self._get_cached_mean(
+            'dark_batch', lambda d: self._calc_batch_means(d, 2), comm)
+
+    def flat_batch_means(self, comm=None):
+        """ Get the averaged flat projection data for each batch of
+        consecutive flats in the image key.
+
+        :params comm: If an MPI communicator is given, the means are
+            calculated by the root process only and broadcast to all other
+            processes.
+        :returns: an array of means with the batch as the first dimension
+        """
+        return self._get_cached_mean(
+            'flat_batch', lambda d: self._calc_batch_means(d, 1), comm)
+
+    def _get_cached_mean(self, name, calc_func, comm):
+        """ Calculate a mean of the dark or flat data the first time it is
+        requested and return the cached copy thereafter.  The cache is an
+        'extras' entry, so it is shared by subsequent plugins and written to
+        the NeXus file with the data type (and restored from checkpoints).
+        """
+        if self.mean_cache.get(name) is None:
+            data_func = self.dark if name.startswith('dark') else self.flat
+            # the cache dictionary is shared with clones, so never update it
+            # in place
+            cache = dict(self.mean_cache)
+            cache[name] = cu.root_bcast(lambda: calc_func(data_func()), comm)
+            self.mean_cache = cache
+        return self.mean_cache[name]
+
+    def _clear_mean_cache(self, name):
+        self.mean_cache = dict((k, v) for k, v in self.mean_cache.items()
+                               if k not in [name, name + '_batch'])
 
     def _calc_mean(self, data):
         return data if len(data.shape) is 2 else\
             data.mean(self.proj_dim).astype(np.float32)
 
+    def _calc_batch_means(self, data, key):
+        image_key = self.get_image_key()
+        if image_key is None or len(data.shape) is 2:
+            return self._calc_mean(data)[np.newaxis].astype(np.float32)
+        k_idx = np.where(image_key == key)[0]
+        splits = np.where(np.diff(k_idx) > 1)[0]+1
+        batches = np.split(np.arange(len(k_idx)), splits)
+        return np.array([self._calc_mean(data.take(b, axis=self.proj_dim))
+                         for b in batches])
+
     def get_index(self, key, full=False):
         """ Get the projection index of a specific image key value.
 
@@ -151,21 +216,12 @@ class DataWithDarksAndFlats(BaseType):
         rot_dim = self.data_obj.get_data_dimension_by_axis_label(
                 'rotation_angle')
 
-        # separate the transfer of data for slice lists with entries far \
-        # apart, as this significantly improves hdf5 performance.
-        split_diff = 10
         k_idx = self.get_index(key)
         if not k_idx.size:
             return np.array([])
 
-        k_idx = np.split(k_idx, np.where(np.diff(k_idx) > split_diff)[0]+1)
-
-        index[self.proj_dim] = k_idx[0]
-        data = self.data[tuple(index)]
-
-        for idx in k_idx[1:]:
-            index[self.proj_dim] = idx
-            data = np.append(data, self.data[tuple(index)], axis=rot_dim)
+        index[self.proj_dim] = k_idx
+        data = self._read_index(self.data, index, self.proj_dim)
 
         if not self.dark_flat_slice_list[key]:
             return data
@@ -187,12 +243,14 @@ class DataWithDarksAndFlats(BaseType):
         self.dark_updated = data
         self.dscale = 1
         self.dark_flat_slice_list[2] = None
+        self._clear_mean_cache('dark')
         self.data_obj.meta_data.set('dark', self._calc_mean(data))
 
     def update_flat(self, data):
         self.flat_updated = data
         self.fscale = 1
         self.dark_flat_slice_list[1] = None
+        self._clear_mean_cache('flat')
         self.data_obj.meta_data.set('flat', self._calc_mean(data))
 
     def _set_dark_and_flat(self):
@@ -200,6 +258,7 @@ class DataWithDarksAndFlats(BaseType):
         if slice_list:
             self.dark_flat_slice_list = \
                 [tuple(self.get_dark_flat_slice_list())]*3
+        self.mean_cache = {}
 
 
 class ImageKey(DataWithDarksAndFlats):
@@ -23,15 +23,31 @@
 """
 
 import os
+import mmap
+import threading
 import fabio
+import tifffile as tf
 import numpy as np
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 
+import savu.core.utils as cu
 from savu.data.data_structures.data_types.base_type import BaseType
 
+# the maximum number of memory-mapped (uncompressed tiff) files held open
+MAX_OPEN_FILES = 256
+# the maximum size (in bytes) of the cache of decoded (compressed) images
+MAX_CACHED_BYTES = 2**28
+# image reading is I/O bound, so use at least this many threads
+MIN_THREADS = 4
+
 
 class ImageData(BaseType):
     """ This class loads any of the FabIO python module
-    supported image formats. """
+    supported image formats.  The images in each block are read in a pool of
+    threads, uncompressed tiffs are memory-mapped and copied straight into the
+    block and the files of the next block are read ahead in the background.
+    """
 
     def __init__(self, folder, Data, dim, shape=None, data_prefix=None):
         self.folder = folder
@@ -57,6 +73,13 @@ class ImageData(BaseType):
         self.image_dims = set(np.arange(len(self.full_shape)))\
             .difference(set(self.frame_dim))
 
+        self._pool = None
+        self._lock = threading.Lock()
+        self._mapped = OrderedDict()
+        self._decoded = OrderedDict()
+        self._decoded_bytes = 0
+        self._pending = {}
+
     def clone_data_args(self, args, kwargs, extras):
         args = ['folder', 'self', 'frame_dim']
         kwargs['shape'] = 'shape'
@@ -68,7 +91,7 @@ class ImageData(BaseType):
                  slice(0, self.shape[i]) for i in range(len(index))]
         size = [len(np.arange(i.start, i.stop, i.step)) for i in index]
         data = np.empty(size, dtype=self.dtype)
-        tiff_slices = [index[i] for i in self.image_dims]
+        tiff_slices = tuple(index[i] for i in self.image_dims)
 
         # shift tiff dims to start from 0
         index = list(index)
@@ -79,14 +102,113 @@ class ImageData(BaseType):
 
         index, frameidx = self.__get_indices(index, size)
 
-        for i in range(len(frameidx)):
-            image = fabio.open(self.file_names[frameidx[i]]).data[tiff_slices]
+        def _read(i):
+            image = self.__get_image(frameidx[i])[tiff_slices]
             for d in self.frame_dim:
                 image = np.expand_dims(image, axis=d)
-            data[index[i]] = image
+            data[tuple(index[i])] = image
+
+        if len(frameidx) > 1:
+            self.__get_pool().map(_read, range(len(frameidx)))
+        elif len(frameidx):
+            _read(0)
 
+        self.__read_ahead(frameidx)
         return data
 
+    def __get_pool(self):
+        if self._pool is None:
+            threads = cu.get_threads_per_process(self._data_obj.exp)
+            self._pool = ThreadPool(max(MIN_THREADS, threads))
+        return self._pool
+
+    def __get_image(self, idx):
+        """ Get the memory-mapped (uncompressed tiff) or decoded image of a
+        file, reading it if it is not already cached. """
+        with self._lock:
+            image = self.__get_cached(idx)
+            pending = self._pending.get(idx, None)
+        if image is not None:
+            return image
+        if pending is not None:
+            # the file is being read ahead, so wait for it
+            pending.wait()
+            with self._lock:
+                image = self.__get_cached(idx)
+            if image is not None:
+                return image
+        return self.__load(idx)
+
+    def __get_cached(self, idx):
+        for cache in [self._mapped, self._decoded]:
+            if idx in cache:
+                image = cache.pop(idx)
+                cache[idx] = image
+                return image
+        return None
+
+    def __load(self, idx):
+        """ Memory-map or decode a file and add it to the cache. """
+        fname = self.file_names[idx]
+        image = self.__map_file(fname)
+        with self._lock:
+            if image is not None:
+                self._mapped[idx] = image
+                while len(self._mapped) > MAX_OPEN_FILES:
+                    self._mapped.popitem(last=False)
+                return image
+
+        image = fabio.open(fname).data
+        with self._lock:
+            if idx not in self._decoded:
+                self._decoded[idx] = image
+                self._decoded_bytes += image.nbytes
+            while len(self._decoded) > 1 and \
+                    self._decoded_bytes > MAX_CACHED_BYTES:
+                self._decoded_bytes -= \
+                    self._decoded.popitem(last=False)[1].nbytes
+        return image
+
+    def __map_file(self, fname):
+        """ Memory-map the image in an uncompressed, single image tiff file,
+        or return None if the file cannot be mapped. """
+        if not fname.lower().endswith(('.tif', '.tiff')):
+            return None
+        try:
+            if hasattr(tf, 'memmap'):
+                image = tf.memmap(fname, mode='r')
+            else:
+                # older tifffile versions (e.g. 0.4.0) have no memmap function
+                with tf.TiffFile(fname) as tif:
+                    image = tif.asarray(memmap=True)
+        except (ValueError, IOError, IndexError, TypeError, AttributeError):
+            return None
+        return image if image.shape == self.image_shape else None
+
+    def __read_ahead(self, frameidx):
+        """ Start reading the files that follow the current block (the files
+        of the next block, if the blocks are contiguous) in the background.
+        """
+        if not len(frameidx):
+            return
+        pool = self.__get_pool()
+        start = frameidx.max() + 1
+        stop = min(start + len(np.unique(frameidx)), len(self.file_names))
+        with self._lock:
+            # forget any read-ahead files that were never requested
+            for idx in [k for k, v in self._pending.items() if v.ready()]:
+                del self._pending[idx]
+            new = [idx for idx in range(start, stop) if idx not in
+                   self._pending and self.__get_cached(idx) is None]
+            for idx in new:
+                self._pending[idx] = pool.apply_async(self.__prefetch, (idx,))
+
+    def __prefetch(self, idx):
+        image = self.__load(idx)
+        if isinstance(image, np.memmap):
+            # touch each page, so the file is read into the page cache
+            image.reshape(-1).view(np.uint8)[::mmap.PAGESIZE].sum()
+
     def __get_file_names(self, folder, prefix):
         import re
         import glob
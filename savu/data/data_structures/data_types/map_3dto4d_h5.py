@@ -57,17 +57,10 @@ class Map3dto4dh5(BaseType):
         idx_dim0 = np.ravel(idx_dim3.reshape(-1, 1)*n_angles + idx_dim0)
 
         size = [len(np.arange(i.start, i.stop, i.step)) for i in idx]
-        data = np.empty(size)
-
-        change = np.where(idx_dim0[:-1]/n_angles != idx_dim0[1:]/n_angles)[0]
-        start = idx_dim0[np.append(0, change+1)]
-        stop = idx_dim0[np.append(change, len(idx_dim0)-1)] + 1
-        length = stop - start
-
-        for i in range(len(start)):
-            new_slice = [slice(start[i], stop[i], idx[0].step), idx[1], idx[2]]
-            data[0:length[i], :, :, i] = self.data[tuple(new_slice)]
-        return data
+        data = self._read_index(self.data, (idx_dim0, idx[1], idx[2]), 0)
+        # the 3d index runs over the angles of each scan in turn
+        data = data.reshape([size[3], size[0]] + size[1:3])
+        return np.ascontiguousarray(data.transpose(1, 2, 3, 0))
 
     def get_shape(self):
         return self.shape
@@ -28,18 +28,22 @@ from savu.data.data_structures.data_types.base_type import BaseType
 
 
 class MRC(BaseType):
+    """ This class memory-maps the data in an MRC file, so slices of the data
+    are read on demand (and the pages are shared by all processes on a node).
+    Data stored with a different byte order is swapped one slice at a time.
+    """
 
-    def __init__(self, Data, filename, stats=None):
+    def __init__(self, Data, filename):
         self._data_obj = Data
         self.filename = filename
         super(MRC, self).__init__()
 
         self.yz_swapped = False
         header_size = 1024
-        self.file = open(filename, 'rb')
-        # get the header information and file pointer position of first data
-        # entry
-        header, first = self.__get_header(self.file, header_size)
+        with open(filename, 'rb') as f:
+            header = self.__get_header(f, header_size)
+        # the data starts after the (ignored) extended header
+        first = header_size + int(header['next'][0])
         self.header_dict = self.__get_header_dict(header)
         self.format = self.__set_data_format(header)
         self.shape = self.__set_shape(header)
@@ -48,22 +52,40 @@ class MRC(BaseType):
 
         self.data = np.memmap(filename, dtype=self.format['dtype'], order='F',
                               mode='r', offset=first, shape=self.shape)
+        self.dtype = self.data.dtype.newbyteorder('=')
+        self.stats = self.__get_header_stats(header)
 
     def clone_data_args(self, args, kwargs, extras):
         args = ['self', 'filename']
         return args, kwargs, extras
 
     def __getitem__(self, idx):
-        return self.data[idx]
+        data = self.data[idx]
+        if not data.dtype.isnative:
+            # only swap the bytes of the requested slice
+            data = data.astype(self.dtype)
+        return data
 
     def __get_header(self, fd, size):
         rec_header_dtype = np.dtype(header_format.rec_header_dtd)
         assert rec_header_dtype.itemsize == size
-        header = np.fromfile(fd, dtype=header_format.rec_header_dtd, count=1)
-        # Seek header
-        if header['next'] > 0:
-            fd.seek(header['next'])  # ignore extended header
-        return header, fd.tell()
+        raw = fd.read(size)
+        header = np.frombuffer(raw, dtype=rec_header_dtype, count=1)
+        if self.__get_byte_order(header) == '>':
+            header = np.frombuffer(
+                raw, dtype=rec_header_dtype.newbyteorder('>'), count=1)
+        return header
+
+    def __get_byte_order(self, header):
+        """ The byte order from the machine stamp (17, 17 for big-endian and
+        68, 65 or 68, 68 for little-endian), or from the mode if the stamp has
+        not been set. """
+        stamp = header['stamp'][0]
+        if stamp[0] == 17 and stamp[1] == 17:
+            return '>'
+        if stamp[0] == 68 and stamp[1] in [65, 68]:
+            return '<'
+        return '<' if 0 <= header['mode'][0] <= 16 else '>'
 
     def __get_header_dict(self, header):
         header_dict = {}
@@ -73,17 +95,26 @@ class MRC(BaseType):
         return header_dict
 
     def __set_data_format(self, header):
-        mode = header['mode']
+        mode = int(header['mode'][0])
         # BitOrder: little or big endian
-        bo = "<" if header['stamp'][0, 0] == 68 and \
-             header['stamp'][0, 1] == 65 else "<"
-        sign = "i1" if header['imodFlags'] == 1 else "u1"  # signed or unsigned
+        bo = self.__get_byte_order(header)
+        # signed or unsigned
+        sign = "i1" if header['imodFlags'][0] & 1 else "u1"
         dtype = [sign, "i2", "f",  "c4", "c8", None, "u2", None, None, None,
                  None, None, None, None, None, None, "u1"][mode]
         dsize = [1, 2, 4, 4, 8, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3][mode]
         return {'mode': mode, 'bo': bo, 'sign': sign, 'dtype': bo+dtype,
                 'dsize': dsize}
 
+    def __get_header_stats(self, header):
+        """ The min, max, mean and standard deviation recorded in the header,
+        or None if they have not been set. """
+        amin, amax, amean, rms = [float(header[k][0]) for k in
+                                  ['amin', 'amax', 'amean', 'rms']]
+        if amax <= amin or not amin <= amean <= amax or rms < 0:
+            return None
+        return {'min': amin, 'max': amax, 'mean': amean, 'std': rms}
+
     def __set_shape(self, header):
         nx, ny, nz = header['nx'], header['ny'], header['nz']
         if not isinstance(nx, int):
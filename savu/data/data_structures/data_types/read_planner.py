@@ -0,0 +1,102 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: read_planner
+   :platform: Unix
+   :synopsis: Functions to read a list of (non-contiguous) indices along one \
+       dimension of a dataset as a few merged contiguous hyperslab reads.
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import numpy as np
+
+# the overhead of each separate read, as the number of bytes that could be
+# read in the same time (hdf5 has a large per-call cost)
+READ_CALL_COST = 2**20
+
+
+def _get_size(sl, length):
+    return len(range(*sl.indices(length)))
+
+
+def plan_reads(index, entry_bytes, chunk=None):
+    """ Merge a list of indices into contiguous runs.  Neighbouring indices
+    are read together if the unwanted entries between them cost less to read
+    than a separate read call, or if they are in the same hdf5 chunk (as the
+    whole chunk is read anyway).
+
+    :params ndarray index: The indices to read (in any order).
+    :params int entry_bytes: The number of bytes in one entry along the
+        indexed dimension.
+    :params int chunk: The chunk size along the indexed dimension (or None).
+    :returns: The (start, stop) of each run.
+    :rtype: list(tuple)
+    """
+    uniq = np.unique(index)
+    if not uniq.size:
+        return []
+    gap = np.diff(uniq) - 1
+    merge = gap*entry_bytes < READ_CALL_COST
+    if chunk:
+        merge |= uniq[:-1]/chunk == uniq[1:]/chunk
+    splits = np.where(~merge)[0] + 1
+    return [(run[0], run[-1] + 1) for run in np.split(uniq, splits)]
+
+
+def read_index(data, index, dim, dtype=None):
+    """ Read a dataset with a list of indices in one dimension (and slices in
+    all other dimensions), equivalent to numpy fancy indexing, into a
+    preallocated array using as few read calls as possible.
+
+    :params data: A dataset supporting slicing (e.g. a h5py dataset).
+    :params tuple index: A slice for each dimension, except a list of
+        integers in dimension dim.
+    :params int dim: The indexed dimension.
+    :params dtype: The output data type (defaults to the dataset type).
+    :returns: The data.
+    :rtype: ndarray
+    """
+    shape = data.shape
+    idx = np.asarray(index[dim], dtype=int).ravel()
+    idx = np.where(idx < 0, idx + shape[dim], idx)
+    size = [_get_size(sl, shape[d]) if d != dim else len(idx)
+            for d, sl in enumerate(index)]
+    out = np.empty(size, dtype=dtype if dtype else data.dtype)
+    if not idx.size:
+        return out
+
+    entry_bytes = np.prod(size)/len(idx)*out.dtype.itemsize
+    chunks = getattr(data, 'chunks', None)
+    runs = plan_reads(idx, entry_bytes, chunks[dim] if chunks else None)
+
+    # the output position of each index (indices may repeat or be unsorted)
+    order = np.argsort(idx, kind='mergesort')
+    in_sl = list(index)
+    out_sl = [slice(None)]*len(size)
+    for start, stop in runs:
+        in_sl[dim] = slice(start, stop)
+        block = data[tuple(in_sl)]
+        first, last = np.searchsorted(idx[order], [start, stop])
+        wanted = idx[order[first:last]] - start
+        out_sl[dim] = order[first:last]
+        if last - first == stop - start and \
+                np.array_equal(out_sl[dim], np.arange(first, last)):
+            out_sl[dim] = slice(first, last)
+            out[tuple(out_sl)] = block
+        else:
+            out[tuple(out_sl)] = block.take(wanted, axis=dim)
+    return out
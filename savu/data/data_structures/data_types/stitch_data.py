@@ -22,7 +22,9 @@
 """
 
 import numpy as np
+from multiprocessing.pool import ThreadPool
 
+import savu.core.utils as cu
 from savu.data.data_structures.data_types.base_type import BaseType
 
 
@@ -31,21 +33,20 @@ class StitchData(BaseType):
 
     def __init__(self, data_obj_list, stack_or_cat, dim, remove=[]):
         self.obj_list = data_obj_list
-        self.dtype = data_obj_list[0].data.dtype
+        self.dtype = np.result_type(*[obj.data.dtype for obj in data_obj_list])
         self.stack_or_cat = stack_or_cat
         self.dim = dim
         self.remove = remove
         super(StitchData, self).__init__()
 
         self.shape = None
+        self._pool = None
         self._set_shape()
         if self.stack_or_cat == 'stack':
             self.inc = 1
-            self._getitem = self._getitem_stack
             self._get_lists = self._get_lists_stack
         else:
             self.inc = self.obj_list[0].get_shape()[self.dim]
-            self._getitem = self._getitem_cat
             self._get_lists = self._get_lists_cat
 
     def clone_data_args(self, args, kwargs, extras):
@@ -57,24 +58,29 @@ class StitchData(BaseType):
     def __getitem__(self, idx):
         size = [len(np.arange(s.start, s.stop, s.step)) for s in idx]
         obj_list, in_slice_list, out_slice_list = self._get_lists(idx)
-        data = np.empty(size)
+        data = np.empty(size, dtype=self.dtype)
 
-        for i in range(len(obj_list)):
-            data[tuple(out_slice_list[i])] = \
-                self._getitem(obj_list[i], in_slice_list[i])
+        def _read(i):
+            self._read(obj_list[i], in_slice_list[i],
+                       data[tuple(out_slice_list[i])])
+
+        if len(obj_list) > 1:
+            self.__get_pool().map(_read, range(len(obj_list)))
+        elif obj_list:
+            _read(0)
         return data
 
-    def _getitem_stack(self, obj, sl):
-        data = obj.data[tuple(sl)]
-        for i in np.sort(self.remove)[::-1]:
-            data = np.squeeze(data, axis=i)
-        return np.expand_dims(data, self.dim)
+    def __get_pool(self):
+        if self._pool is None:
+            exp = self.obj_list[0].exp
+            self._pool = ThreadPool(cu.get_threads_per_process(exp))
+        return self._pool
 
-    def _getitem_cat(self, obj, sl):
-        data = obj.data[tuple(sl)]
-        for i in np.sort(self.remove)[::-1]:
-            data = np.squeeze(data, axis=i)
-        return data
+    def _read(self, obj, sl, out):
+        """ Read a slice of a data object into (a view of) the output array.
+        The removed and stacked dimensions have length one, so the data is
+        reshaped rather than squeezed and expanded. """
+        out[...] = obj.data[tuple(sl)].reshape(out.shape)
 
     def _get_lists_stack(self, idx):
         entry = idx[self.dim]
@@ -147,10 +153,10 @@ class StitchData(BaseType):
             shape.insert(self.dim, nObjs)
         self.shape = tuple(shape)
 
-    def dark_mean(self):
+    def dark_mean(self, comm=None):
         """ Get the averaged dark projection data. """
-        return self.obj_list[0].data.dark_mean()
+        return self.obj_list[0].data.dark_mean(comm=comm)
 
-    def flat_mean(self):
+    def flat_mean(self, comm=None):
         """ Get the averaged flat projection data. """
-        return self.obj_list[0].data.flat_mean()
+        return self.obj_list[0].data.flat_mean(comm=comm)
@@ -54,10 +54,7 @@ class Preview(object):
         self.revert_shape = kwargs.get('revert', self.revert_shape)
         load = kwargs.get('load', False)
         shape = self.get_data_obj().get_shape()
-        # for backward compatibility
-        preview_list = parse_str(preview_list) if \
-            isinstance(preview_list, str) else preview_list
-        preview_list = self.__convert_nprocs(preview_list)
+        preview_list = self._parse_preview(preview_list)
 
         if preview_list:
             preview_list = self._add_preview_defaults(preview_list)
@@ -73,6 +70,18 @@ class Preview(object):
                                       shapeChange=shape_change, load=load)
         self.__check_preview_indices()
 
+    def _parse_preview(self, preview_list):
+        """ Convert a preview string to a list and replace 'nprocs' entries.
+
+        :param preview_list: The preview list (or string).
+        :returns: The preview list.
+        :rtype: list
+        """
+        # for backward compatibility
+        preview_list = parse_str(preview_list) if \
+            isinstance(preview_list, str) else preview_list
+        return self.__convert_nprocs(preview_list)
+
     def __convert_nprocs(self, preview_list):
         for i in range(len(preview_list)):
             if preview_list[i] == 'nprocs':
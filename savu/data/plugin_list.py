@@ -331,12 +331,14 @@ class PluginList(object):
             process['desc'] = plugin.parameters_desc
             self._add(pos, process)
 
-    def _get_dataset_flow(self):
+    def _get_dataset_flow(self, key='out_datasets'):
+        """ Get the names of the output (or input) datasets of each processing
+        plugin. """
         datasets_idx = []
         n_loaders = self._get_n_loaders()
         n_plugins = self._get_n_processing_plugins()
         for i in range(self.n_loaders, n_loaders+n_plugins):
-            datasets_idx.append(self.plugin_list[i]['data']['out_datasets'])
+            datasets_idx.append(self.plugin_list[i]['data'][key])
         return datasets_idx
 
     def _contains_gpu_processes(self):
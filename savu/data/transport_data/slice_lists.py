@@ -388,6 +388,7 @@ class GlobalData(object):
         self.data = transport.data
         self.pData = self.data._get_plugin_data()
         self.shape = self.data.get_shape()
+        self._halo = None
 
     def _get_dict(self):
         return self._get_dict_in() if self.dtype == 'in' else \
@@ -437,6 +438,12 @@ class GlobalData(object):
         return transfer_gsl, current_sl
 
     def _get_padded_data(self, slice_list, end=False):
+        """ Read a transfer block from file and pad it.  The trailing frames
+        (halo) of each block are kept in memory so that the overlapping
+        frames of the next block, along the padded slice dimension, are not
+        read again, and any padding beyond the edge of the dataset is added in
+        place in a preallocated buffer.
+        """
         slice_list = list(slice_list)
         pData = self.pData
         pad_dims = list(set(self.data.get_core_dimensions() +
@@ -460,10 +467,152 @@ class GlobalData(object):
                 slice_list[dim] = \
                     slice(slice_list[dim].start, sl.stop - diff, sl.step)
 
-        data = self.data.data[tuple(slice_list)]
-
-        if np.sum(pad_list):
-            mode = pData.padding.mode if pData.padding else 'edge'
-            temp = np.pad(data, tuple(pad_list), mode=mode)
-            return temp
-        return data
+        halo_dim = self.__get_halo_dim()
+        reuse = self.__get_halo_overlap(slice_list, halo_dim)
+        mode = pData.padding.mode if pData.padding else 'edge'
+        pad = np.sum(pad_list) > 0
+        if not reuse and (not pad or
+                          not _pad_supported(slice_list, pad_list, mode,
+                                             shape)):
+            data = self.data.data[tuple(slice_list)]
+            self.__keep_halo(data, slice_list, halo_dim)
+            return np.pad(data, tuple(pad_list), mode=mode) if pad else data
+
+        # read into the interior of a preallocated (padded) buffer
+        interior = [slice(p[0], p[0] + _get_size(sl, shape[d])) for d, (sl, p)
+                    in enumerate(zip(slice_list, pad_list))]
+        read_sl, out_sl = list(slice_list), list(interior)
+        halo = None
+        if reuse:
+            halo, overlap = reuse
+            hsl = slice_list[halo_dim]
+            read_sl[halo_dim] = slice(hsl.start + overlap, hsl.stop, hsl.step)
+            out_sl[halo_dim] = \
+                slice(interior[halo_dim].start + overlap,
+                      interior[halo_dim].stop)
+        new = None
+        if not reuse or read_sl[halo_dim].start < read_sl[halo_dim].stop:
+            new = self.data.data[tuple(read_sl)]
+
+        out = np.empty([i.stop + p[1] for i, p in zip(interior, pad_list)],
+                       dtype=new.dtype if new is not None else halo.dtype)
+        if reuse:
+            halo_out = list(interior)
+            halo_out[halo_dim] = slice(interior[halo_dim].start,
+                                       out_sl[halo_dim].start)
+            out[tuple(halo_out)] = halo
+        if new is not None:
+            out[tuple(out_sl)] = new
+        self.__keep_halo(out[tuple(interior)], slice_list, halo_dim)
+
+        if pad:
+            if not _pad_supported(slice_list, pad_list, mode, shape):
+                return np.pad(out[tuple(interior)], tuple(pad_list),
+                              mode=mode)
+            _pad_in_place(out, pad_list, mode)
+        return out
+
+    def __get_halo_dim(self):
+        """ The slice dimension that consecutive padded transfer blocks
+        overlap in (or None). """
+        if not self.trans.pad or self.dtype != 'in':
+            return None
+        pad_dict = self.pData.padding._get_padding_directions()
+        for dim in self.data.get_slice_dimensions():
+            if dim in pad_dict and \
+                    pad_dict[dim]['before'] + pad_dict[dim]['after']:
+                return dim
+        return None
+
+    def __get_halo_overlap(self, slice_list, dim):
+        """ Return the cached halo and the number of its frames that are at
+        the start of the (unpadded) slice list, or None. """
+        if dim is None or self._halo is None:
+            return None
+        halo_sl, data = self._halo
+        for d, (sl1, sl2) in enumerate(zip(halo_sl, slice_list)):
+            if d != dim and sl1 != sl2:
+                return None
+        h, s = halo_sl[dim], slice_list[dim]
+        if s.step not in [None, 1] or not h.start <= s.start < h.stop:
+            return None
+        overlap = min(h.stop, s.stop) - s.start
+        start = s.start - h.start
+        sl = [slice(None)]*data.ndim
+        sl[dim] = slice(start, start + overlap)
+        return data[tuple(sl)], overlap
+
+    def __keep_halo(self, data, slice_list, dim):
+        """ Keep a copy of the trailing frames of the block that may be
+        required by the next block. """
+        if dim is None:
+            return
+        pad_dict = self.pData.padding._get_padding_directions()
+        size = min(pad_dict[dim]['before'] + pad_dict[dim]['after'],
+                   data.shape[dim])
+        stop = slice_list[dim].stop
+        if not size or slice_list[dim].step not in [None, 1]:
+            self._halo = None
+            return
+        halo_sl = list(slice_list)
+        halo_sl[dim] = slice(stop - size, stop)
+        sl = [slice(None)]*data.ndim
+        sl[dim] = slice(-size, None)
+        self._halo = (halo_sl, np.array(data[tuple(sl)]))
+
+
+def _get_size(sl, length):
+    return len(range(*sl.indices(length)))
+
+
+def _pad_supported(slice_list, pad_list, mode, shape):
+    """ Check that the numpy pad mode can be reproduced by
+    :func:`_pad_in_place`. """
+    limit = {'edge': 1, 'constant': 0, 'wrap': 1, 'symmetric': 1,
+             'reflect': 2}
+    if not isinstance(mode, basestring) or mode not in limit:
+        return False
+    for d, (sl, pad) in enumerate(zip(slice_list, pad_list)):
+        if not sum(pad):
+            continue
+        size = _get_size(sl, shape[d])
+        if size < limit[mode]:
+            return False
+        if mode in ['symmetric', 'reflect'] and \
+                max(pad) > size + 1 - limit[mode]:
+            return False
+    return True
+
+
+def _pad_in_place(out, pad_list, mode):
+    """ Fill the padded regions of a preallocated array, whose interior
+    already contains the data, equivalent to numpy.pad.
+
+    :params ndarray out: The padded array.
+    :params list pad_list: The [before, after] pad amounts in each dimension.
+    :params str mode: The numpy pad mode (see :func:`_pad_supported`).
+    """
+    for dim, (before, after) in enumerate(pad_list):
+        if not before and not after:
+            continue
+        n = out.shape[dim] - before - after
+        if mode == 'edge':
+            idx = [np.zeros(before, dtype=int), np.zeros(after, dtype=int) +
+                   n - 1]
+        elif mode == 'reflect':
+            idx = [np.arange(before, 0, -1), n - 2 - np.arange(after)]
+        elif mode == 'symmetric':
+            idx = [np.arange(before - 1, -1, -1), n - 1 - np.arange(after)]
+        elif mode == 'wrap':
+            idx = [np.arange(-before, 0) % n, np.arange(after) % n]
+        else:
+            idx = None
+
+        sl = [slice(None)]*out.ndim
+        for region, pad in [(slice(0, before), 0),
+                            (slice(before + n, before + n + after), 1)]:
+            sl[dim] = region
+            if idx is None:
+                out[tuple(sl)] = 0
+            else:
+                out[tuple(sl)] = out.take(idx[pad] + before, axis=dim)
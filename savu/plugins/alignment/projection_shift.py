@@ -56,7 +56,7 @@ class ProjectionShift(BaseFilter, CpuPlugin):
         b. Default: None.
     :param n_keypoints: Number of keypoints to use in ORB feature \
         detector.  Default: 20.
-    :param out_datasets: Set the output dataset name. Default: ['proj_shift'].
+    :*param out_datasets: Hidden, dummy out_datasets entry. Default: [].
 
     :config_warn: The template parameter is required and must not be None.
     """
@@ -186,36 +186,25 @@ class ProjectionShift(BaseFilter, CpuPlugin):
         return np.transpose(np.array(new_shift))[1:-1]
 
     def post_process(self):
-        out_data = self.get_out_datasets()[0]
+        shift = self.get_frame_metadata('proj_shift')
         self.get_in_datasets()[0].meta_data.set(
-            'proj_align_shift_local', out_data.data[:, :])
+            'proj_align_shift_local', shift)
         self.get_in_datasets()[0].meta_data.set(
-            'proj_align_shift', np.cumsum(out_data.data[:, :], axis=0))
+            'proj_align_shift', np.cumsum(shift, axis=0))
 
     def get_max_frames(self):
         # Do not change this number as 8 is currently a requirement.
         return 8
 
     def nOutput_datasets(self):
-        return 1
+        return 0
 
     def setup(self):
-        # set up the output dataset that is created by the plugin
-        in_dataset, out_dataset = self.get_datasets()
-
-        in_pData, out_pData = self.get_plugin_datasets()
+        in_pData = self.get_plugin_in_datasets()
         in_pData[0].plugin_data_setup('PROJECTION', self.get_max_frames(),
                                       fixed=True)
-
-        new_shape = (in_dataset[0].get_shape()[
-            in_dataset[0].get_slice_directions()[0]], 2)
-
-        out_dataset[0].create_dataset(shape=new_shape,
-                                      axis_labels=['x.pixels', 'y.pixels'],
-                                      remove=True)
-        out_dataset[0].add_pattern("METADATA", core_dims=(1,), slice_dims=(0,))
-        out_pData[0].plugin_data_setup('METADATA', self.get_max_frames(),
-                                       fixed=True)
+        # the (x, y) shift of each projection
+        self.create_frame_metadata('proj_shift', shape=(2,))
 
     def set_filter_padding(self, in_data, out_data):
         pad_dim = in_data[0].get_slice_directions()[0]
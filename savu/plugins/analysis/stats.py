@@ -31,7 +31,7 @@ from savu.plugins.utils import register_plugin
 @register_plugin
 class Stats(Plugin, CpuPlugin):
     """
-    :param out_datasets: the output dataset. Default: ['stats'].
+    :*param out_datasets: Hidden, dummy out_datasets entry. Default: [].
     :param required_stats: create a list of required stats\
         calcs. Default: ['max'].
     :param direction: which direction to perform this. Default: 'PROJECTION'.
@@ -42,34 +42,22 @@ class Stats(Plugin, CpuPlugin):
         super(Stats, self).__init__("Stats")
 
     def process_frames(self, data):
-        data = data[0]
-        if 'max' in self.parameters['required_stats']:
-            maximum = np.max(data)
-            op = np.array([maximum])
-        return op
+        return np.max(data[0])
 
     def post_process(self):
-        out_datasets = self.get_out_datasets()
         in_meta_data = self.get_in_meta_data()[0]
-        data = out_datasets[0].data
-        if self.parameters['required_stats'] == 'max':
-            maximum = np.max(data)
-            in_meta_data.set('max', maximum)
+        if 'max' in self.parameters['required_stats']:
+            in_meta_data.set('max', np.max(self.get_frame_metadata('max')))
 
     def get_max_frames(self):
         return 'single'
 
     def setup(self):
         self.exp.log(self.name + " Start")
-        _in_dataset, out_dataset = self.get_datasets()
-        in_pData, out_pData = self.get_plugin_datasets()
+        in_pData = self.get_plugin_in_datasets()
         in_pData[0].plugin_data_setup(self.parameters["direction"],
                                       self.get_max_frames())
-        nFrames = in_pData[0].get_total_frames()
-        axis_labels = ['frame.unit', 'max.unit']
-        out_dataset[0].create_dataset(axis_labels=axis_labels,
-                                      shape=(nFrames, 1),
-                                      remove=True)
+        self.create_frame_metadata('max')
 
-        out_dataset[0].add_pattern("METADATA", core_dims=(1,), slice_dims=(0,))
-        out_pData[0].plugin_data_setup("METADATA", self.get_max_frames())
+    def nOutput_datasets(self):
+        return 0
@@ -24,14 +24,15 @@ from savu.plugins.filters.base_filter import BaseFilter
 from savu.data.plugin_list import CitationInformation
 
 import logging
+from multiprocessing.pool import ThreadPool
 import numpy as np
 import scipy.ndimage as ndi
-import pyfftw.interfaces.scipy_fftpack as fft
+import savu.core.fft_service as fft
 
+# maximum size (in bytes) of a batch of transformed candidate sinograms
+MAX_BATCH_BYTES = 2**28
 
 
-import sys
-
 @register_plugin
 class VoCentering(BaseFilter, CpuPlugin):
     """
@@ -49,8 +50,7 @@ class VoCentering(BaseFilter, CpuPlugin):
     :param step: Step of fine searching. Default: 0.5.
     :param datasets_to_populate: A list of datasets which require this \
         information. Default: [].
-    :param out_datasets: The default names\
-        . Default: ['cor_preview','cor_broadcast'].
+    :*param out_datasets: Hidden, dummy out_datasets entry. Default: [].
     :param broadcast_method: Method of broadcasting centre values calculated\
         from preview slices to full dataset. Available option: 'median', \
         'mean', 'nearest', 'linear_fit'. Default: 'median'.      
@@ -62,6 +62,8 @@ class VoCentering(BaseFilter, CpuPlugin):
 
     def __init__(self):
         super(VoCentering, self).__init__("VoCentering")
+        self.masks = {}
+        self.threads = 1
 
     def _create_mask(self, nrow, ncol, radius, drop):
         du = 1.0 / ncol
@@ -79,34 +81,119 @@ class VoCentering(BaseFilter, CpuPlugin):
         mask[:, cen_col-1:cen_col+2] = 0.0
         return mask
 
+    def _get_mask(self, nrow, ncol, radius, drop):
+        """ Get the (cached) mask, shifted to match the unshifted fft2 output,
+        as a boolean array. """
+        key = (nrow, ncol, radius, drop)
+        if key not in self.masks.keys():
+            mask = self._create_mask(nrow, ncol, radius, drop)
+            self.masks[key] = fft.ifftshift(mask) > 0
+        return self.masks[key]
+
+    def _column_fft(self, sino, bottom=False):
+        """
+        Transform the columns of one half of a double sinogram.  The columns
+        are zero padded to the length of the double sinogram, and shifted to
+        the bottom half if bottom is True.
+        """
+        nrow = sino.shape[0]
+        sino_fft = fft.fft(np.float32(sino), n=2*nrow, axis=0)
+        if bottom:
+            # a shift of nrow rows in a transform of length 2*nrow
+            sino_fft[1::2] *= -1
+        return sino_fft
+
+    def _shift_columns(self, coeffs, shift):
+        """
+        Shift an array along the columns with cubic spline interpolation.
+
+        :param ndarray coeffs: Cubic spline coefficients along axis 1.
+        :param float shift: The shift.
+        :returns: The shifted array.
+        """
+        ncol = coeffs.shape[1]
+        start = np.floor(-shift)
+        t = -shift - start
+        weights = [(1 - t)**3/6.0, (3*t**3 - 6*t**2 + 4)/6.0,
+                   (-3*t**3 + 3*t**2 + 3*t + 1)/6.0, t**3/6.0]
+        idx = np.arange(ncol) + int(start)
+        result = np.zeros_like(coeffs)
+        for i, w in enumerate(weights):
+            # mirror the coefficients at the boundaries
+            mirror = (ncol - 1) - np.abs((ncol - 1) - np.abs(idx + i - 1))
+            result += np.complex64(w)*coeffs[:, np.clip(mirror, 0, ncol - 1)]
+        return result
+
+    def _calculate_metric(self, sino, list_cor, get_sinos, mask):
+        """
+        Calculate the metric for each candidate centre of rotation, with the
+        candidates evaluated in batches.
+
+        Only the [Pi;2Pi] half of the double sinogram changes between
+        candidates, and all the changes (shifts and replacing columns) are
+        along the rows, so the transform of the columns is calculated once
+        for each half and the candidates are created from these.  Only the
+        transform along the rows is required per candidate.
+
+        :param ndarray sino: The [0;Pi] sinogram.
+        :param ndarray list_cor: Candidate centres of rotation.
+        :param func get_sinos: Returns the column transformed [Pi;2Pi] \
+            halves for a list of candidates, stacked along the first \
+            dimension.
+        :param ndarray mask: Boolean mask (see _get_mask).
+        :returns: The metric for each candidate.
+        :rtype: ndarray
+        """
+        (nrow, ncol) = sino.shape
+        sino_fft = self._column_fft(sino)
+        batch = max(1, MAX_BATCH_BYTES/(2*nrow*ncol*8))
+        list_metric = np.zeros(len(list_cor), dtype=np.float32)
+        for start in range(0, len(list_cor), batch):
+            cors = list_cor[start:start + batch]
+            sinos = get_sinos(cors)
+            sinos += sino_fft
+            fft_sinos = fft.fft(sinos)
+            list_metric[start:start + len(cors)] = \
+                np.abs(fft_sinos[:, mask]).sum(axis=1)/(2.0*nrow*ncol)
+        return list_metric
+
+    def _map(self, func, args):
+        """ Apply a function to a list of arguments, in a pool of threads if
+        more than one thread is available to this process. """
+        if self.threads > 1 and len(args) > 1:
+            pool = ThreadPool(min(self.threads, len(args)))
+            try:
+                return pool.map(func, args)
+            finally:
+                pool.close()
+        return map(func, args)
+
     def _coarse_search(self, sino, start_cor, stop_cor, ratio, drop):
         """
         Coarse search for finding the rotation center.
-        """        
+        """
         (nrow, ncol) = sino.shape
         start_cor, stop_cor = np.sort((start_cor,stop_cor))
         start_cor = np.int16(np.clip(start_cor, 0, ncol-1))
         stop_cor = np.int16(np.clip(stop_cor, 0, ncol-1))
-        cen_fliplr = (ncol - 1.0) / 2.0    
+        cen_fliplr = (ncol - 1.0) / 2.0
         # Flip left-right the [0:Pi ] sinogram to make a full [0;2Pi] sinogram
-        flip_sino = np.fliplr(sino)
+        flip_fft = self._column_fft(np.fliplr(sino), bottom=True)
         # Below image is used for compensating the shift of the [Pi;2Pi] sinogram
         # It helps to avoid local minima.
-        comp_sino = np.flipud(sino)    
+        comp_fft = self._column_fft(np.flipud(sino), bottom=True)
         list_cor = np.arange(start_cor, stop_cor + 1.0)
-        list_metric = np.zeros(len(list_cor), dtype=np.float32)
-        mask = self._create_mask(2 * nrow, ncol, 0.5 * ratio * ncol, drop)
-        sino_sino = np.vstack((sino, flip_sino))        
-        for i, cor in enumerate(list_cor):
-            shift = np.int16(2.0*(cor - cen_fliplr))
-            _sino = sino_sino[nrow:]
-            _sino[...] = np.roll(flip_sino, shift, axis=1)
-            if shift >= 0:
-                _sino[:, :shift] = comp_sino[:, :shift]
-            else:
-                _sino[:, shift:] = comp_sino[:, shift:]             
-            list_metric[i] = np.mean(
-                np.abs(np.fft.fftshift(fft.fft2(sino_sino)))*mask)
+        mask = self._get_mask(2 * nrow, ncol, 0.5 * ratio * ncol, drop)
+        cols = np.arange(ncol)
+
+        def get_sinos(cors):
+            shifts = np.int16(2.0*(cors - cen_fliplr))[:, np.newaxis]
+            # np.roll of the flipped sinogram for each shift
+            sinos = flip_fft[:, (cols - shifts) % ncol].transpose(1, 0, 2)
+            comp = np.where(shifts >= 0, cols < shifts, cols >= ncol + shifts)
+            return np.where(comp[:, np.newaxis, :], comp_fft, sinos)
+
+        list_metric = self._calculate_metric(sino, list_cor, get_sinos, mask)
         minpos = np.argmin(list_metric)
         if minpos==0:
             logging.warn('!!! WARNING !!! Global minimum is out of'
@@ -128,29 +215,34 @@ class VoCentering(BaseFilter, CpuPlugin):
         """
         # Denoising        
         (nrow, ncol) = sino.shape
-        flip_sino = np.fliplr(sino)
         search_radius = np.clip(np.abs(search_radius), 1, ncol//10 - 1)
         search_step = np.clip(np.abs(search_step), 0.1, 1.1)
         start_cor = np.clip(start_cor, search_radius, ncol - search_radius - 1)
         cen_fliplr = (ncol - 1.0) / 2.0
         list_cor = start_cor + np.arange(
                 -search_radius, search_radius + search_step, search_step)
-        comp_sino = np.flipud(sino) # Used to avoid local minima
-        list_metric = np.zeros(len(list_cor), dtype = np.float32)
-        mask = self._create_mask(2 * nrow, ncol, 0.5 * ratio * ncol, drop)
-        for i, cor in enumerate(list_cor):
+        # Used to avoid local minima
+        comp_fft = self._column_fft(np.flipud(sino), bottom=True)
+        mask = self._get_mask(2 * nrow, ncol, 0.5 * ratio * ncol, drop)
+        # the spline coefficients are the same for all shifts
+        flip_fft = self._column_fft(np.fliplr(sino), bottom=True)
+        coeffs = (ndi.spline_filter1d(flip_fft.real, order=3, axis=1) +
+                  1j*ndi.spline_filter1d(flip_fft.imag, order=3, axis=1))
+        coeffs = coeffs.astype(np.complex64)
+
+        def get_sino(cor):
             shift = 2.0*(cor - cen_fliplr)
-            sino_shift = ndi.interpolation.shift(
-                flip_sino, (0, shift), order = 3, prefilter = True)
+            sino_shift = self._shift_columns(coeffs, shift)
             if shift>=0:
                 shift_int = np.int16(np.ceil(shift))
-                sino_shift[:,:shift_int] = comp_sino[:,:shift_int]
+                sino_shift[:,:shift_int] = comp_fft[:,:shift_int]
             else:
                 shift_int = np.int16(np.floor(shift))
-                sino_shift[:,shift_int:] = comp_sino[:,shift_int:]
-            mat1 = np.vstack((sino, sino_shift))
-            list_metric[i] = np.mean(
-                np.abs(np.fft.fftshift(fft.fft2(mat1)))*mask)
+                sino_shift[:,shift_int:] = comp_fft[:,shift_int:]
+            return sino_shift
+
+        get_sinos = lambda cors: np.array(self._map(get_sino, list(cors)))
+        list_metric = self._calculate_metric(sino, list_cor, get_sinos, mask)
         min_pos = np.argmin(list_metric)
         cor = list_cor[min_pos]
         return cor
@@ -184,6 +276,7 @@ class VoCentering(BaseFilter, CpuPlugin):
             in_data[0].padding = {'pad_multi_frames': padding}
 
     def pre_process(self):
+        self.threads = fft.get_threads()
         self.drop = np.int16(self.parameters['row_drop'])
         self.smin, self.smax = np.int16(self.parameters['search_area'])
         self.search_radius = np.float32(self.parameters['search_radius'])
@@ -249,12 +342,11 @@ class VoCentering(BaseFilter, CpuPlugin):
         cor = self._fine_search(
             sino_fsearch, raw_cor*dsp_col + off_set, fine_srange,
              self.search_step, self.ratio, self.drop)
-        return [np.array([cor]), np.array([cor])]
+        return cor
 
-    def post_process(self):        
-        in_datasets, out_datasets = self.get_datasets()
-        cor_prev = out_datasets[0].data[...]
-        cor_broad = out_datasets[1].data[...]
+    def post_process(self):
+        cor_prev = self.get_frame_metadata('cor_preview')[:, None]
+        cor_broad = np.zeros(self.orig_shape)
         cor_broad[:] = np.median(np.squeeze(cor_prev))
         self.cor_for_executive_summary = np.median(cor_broad[:])
         if self.broadcast_method == 'mean':
@@ -270,10 +362,8 @@ class VoCentering(BaseFilter, CpuPlugin):
                 minpos = np.argmin(np.abs(pos-self.plugin_prev))
                 cor_broad[i,0] = cor_prev[minpos,0]
             self.cor_for_executive_summary = cor_broad[:]
-        out_datasets[1].data[:] = cor_broad[:]
         self.populate_meta_data('cor_preview', np.squeeze(cor_prev))
-        self.populate_meta_data('centre_of_rotation',
-                                out_datasets[1].data[:].squeeze(axis=1))
+        self.populate_meta_data('centre_of_rotation', cor_broad.squeeze(axis=1))
 
     def populate_meta_data(self, key, value):
         datasets = self.parameters['datasets_to_populate']
@@ -284,58 +374,30 @@ class VoCentering(BaseFilter, CpuPlugin):
 
     def setup(self):
         self.exp.log(self.name + " Start calculating center of rotation")
-        # set up the output dataset that is created by the plugin
-        in_dataset, out_dataset = self.get_datasets()
-        in_pData, out_pData = self.get_plugin_datasets()
+        in_dataset = self.get_in_datasets()
+        in_pData = self.get_plugin_in_datasets()
         in_pData[0].plugin_data_setup('SINOGRAM', self.get_max_frames())
         slice_dirs = list(in_dataset[0].get_slice_dimensions())
         self.orig_full_shape = in_dataset[0].get_shape()
 
-        # if preview parameters exist then use these
-        # else get the size of the data
-        # get n processes and take 4 different sets of 5 from the data if this is feasible based on the data size.
-        # calculate the slice list here and determine if it is feasible, else apply to max(n_processes, data_size)
-
         # reduce the data as per data_subset parameter
         self.set_preview(in_dataset[0], self.parameters['preview'])
-        total_frames = \
-            self._calc_total_frames(in_dataset[0].get_preview(), slice_dirs)
 
-        # copy all required information from in_dataset[0]
-        fullData = in_dataset[0]
-        new_shape = (np.prod(np.array(fullData.get_shape())[slice_dirs]), 1)
+        # the centre of rotation is calculated for each previewed sinogram
+        # and broadcast to all sinograms of the original data
         self.orig_shape = \
             (np.prod(np.array(self.orig_full_shape)[slice_dirs]), 1)
-        out_dataset[0].create_dataset(shape=new_shape,
-                                      axis_labels=['x.pixels', 'y.pixels'],
-                                      remove=True,
-                                      transport='hdf5')
-        out_dataset[0].add_pattern("METADATA", core_dims=(1,), slice_dims=(0,))
-
-        out_dataset[1].create_dataset(shape=self.orig_shape,
-                                      axis_labels=['x.pixels', 'y.pixels'],
-                                      remove=True,
-                                      transport='hdf5')
-        out_dataset[1].add_pattern("METADATA", core_dims=(1,), slice_dims=(0,))
-        out_pData[0].plugin_data_setup('METADATA', self.get_max_frames())
-        out_pData[1].plugin_data_setup('METADATA', self.get_max_frames())
-        out_pData[1].meta_data.set('fix_total_frames', total_frames)
+        self.create_frame_metadata('cor_preview')
         self.exp.log(self.name + " End")
 
-    def _calc_total_frames(self, preview, slice_dims):
-        starts, stops, steps, _ = preview.get_starts_stops_steps()
-        lengths = [len(np.arange(starts[i], stops[i], steps[i]))
-                   for i in range(len(starts))]
-        return np.prod([lengths[i] for i in slice_dims])
-
     def nOutput_datasets(self):
-        return 2
+        return 0
 
     def get_max_frames(self):
         return 'single'
 
-    def fix_transport(self):
-        return 'hdf5'
+    def quick_look_parameters(self):
+        return {'start_pixel': -1, 'search_area': -1, 'search_radius': -1}
 
     def get_citation_information(self):
         cite_info = CitationInformation()
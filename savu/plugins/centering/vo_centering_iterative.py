@@ -23,7 +23,7 @@ import logging
 import numpy as np
 import scipy.ndimage as ndi
 import scipy.ndimage.filters as filter
-import pyfftw.interfaces.scipy_fftpack as fft
+import savu.core.fft_service as fft
 
 from scipy import signal
 
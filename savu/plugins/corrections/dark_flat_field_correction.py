@@ -55,10 +55,11 @@ class DarkFlatFieldCorrection(BaseCorrection, CpuPlugin):
     def pre_process(self):
         inData = self.get_in_datasets()[0]
         in_pData = self.get_plugin_in_datasets()[0]
+        comm = self.get_communicator()
         logging.debug('getting the dark data')
-        self.dark = inData.data.dark_mean()
+        self.dark = inData.data.dark_mean(comm)
         logging.debug('getting the flat data')
-        self.flat = inData.data.flat_mean()
+        self.flat = inData.data.flat_mean(comm)
 
         pData_shape = in_pData.get_shape()
         tile = [1]*len(pData_shape)
@@ -105,9 +106,7 @@ class DarkFlatFieldCorrection(BaseCorrection, CpuPlugin):
         data = data[0]
         dark = self.convert_size(self.dark)
         flat_minus_dark = self.convert_size(self.flat_minus_dark)
-        data = np.nan_to_num((data-dark)/flat_minus_dark)
-        self.__data_check(data)
-        return data
+        return self.__correct(data, dark, flat_minus_dark)
 
     def correct_sino(self, data):
         data = data[0]
@@ -123,9 +122,20 @@ class DarkFlatFieldCorrection(BaseCorrection, CpuPlugin):
         dark = self.convert_size(start, end, self.dark, pad)
         flat_minus_dark = \
             self.convert_size(start, end, self.flat_minus_dark, pad)
-        data = np.nan_to_num((data-dark)/flat_minus_dark)
-        self.__data_check(data)
-        return data
+        return self.__correct(data, dark, flat_minus_dark)
+
+    def __correct(self, data, dark, flat_minus_dark):
+        """ Apply the correction, in place in the output buffer if it is
+        available. """
+        out = self.get_output_buffers()
+        result = np.subtract(data, dark, out=out[0] if out else None)
+        np.divide(result, flat_minus_dark, out=result)
+        np.nan_to_num(result, copy=False)
+        self.__data_check(result)
+        return result
+
+    def uses_output_buffers(self):
+        return True
 
     def fixed_flag(self):
         if self.parameters['pattern'] == 'PROJECTION':
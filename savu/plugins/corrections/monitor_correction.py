@@ -21,6 +21,7 @@
 """
 
 import logging
+import numpy as np
 from savu.plugins.plugin import Plugin
 from savu.plugins.driver.cpu_plugin import CpuPlugin
 from savu.plugins.utils import register_plugin
@@ -54,9 +55,15 @@ class MonitorCorrection(Plugin, CpuPlugin):
         nom_off = self.parameters['nominator_offset']
         denom_off = self.parameters['denominator_offset']
         monitor = monitor * denom_scale + denom_off
-        to_be_corrected = to_be_corrected * nom_scale + nom_off
-        out = to_be_corrected / monitor
-        return out
+        out = self.get_output_buffers()
+        result = np.multiply(to_be_corrected, float(nom_scale),
+                             out=out[0] if out else None)
+        result += nom_off
+        result /= monitor
+        return result
+
+    def uses_output_buffers(self):
+        return True
 
     def setup(self):
         in_datasets, out_datasets = self.get_datasets()
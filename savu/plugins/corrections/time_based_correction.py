@@ -58,20 +58,17 @@ class TimeBasedCorrection(BaseCorrection, CpuPlugin):
         self.split_idx = np.split(np.arange(len(self.image_key)), changes)
         self.data_key = inData.data.get_index(0)
 
-        self.dark, self.dark_idx = self.calc_average(inData.data.dark(), 2)
-        self.flat, self.flat_idx = self.calc_average(inData.data.flat(), 1)
+        comm = self.get_communicator()
+        self.dark = inData.data.dark_batch_means(comm)
+        self.dark_idx = self.get_batch_index(2)
+        self.flat = inData.data.flat_batch_means(comm)
+        self.flat_idx = self.get_batch_index(1)
 
         inData.meta_data.set('multiple_dark', self.dark)
         inData.meta_data.set('multiple_flat', self.flat)
 
-    def calc_average(self, data, key):
-        im_key = np.where(self.image_key == key)[0]
-        splits = np.where(np.diff(im_key) > 1)[0]+1
-        local_idx = np.split(np.arange(len(im_key)), splits)
-        mean_data = [np.mean(data[np.array(local_idx[i])], axis=0)
-                     for i in range(len(local_idx))]
-        list_idx = list(np.where([key in i for i in self.split_key])[0])
-        return mean_data, list_idx
+    def get_batch_index(self, key):
+        return list(np.where([key in i for i in self.split_key])[0])
 
     def process_frames(self, data):
         proj = data[0]
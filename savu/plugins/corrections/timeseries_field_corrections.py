@@ -51,8 +51,9 @@ class TimeseriesFieldCorrections(BaseCorrection, CpuPlugin):
 
     def pre_process(self):
         inData = self.get_in_datasets()[0]
-        self.dark = inData.data.dark_mean()
-        self.flat = inData.data.flat_mean()
+        comm = self.get_communicator()
+        self.dark = inData.data.dark_mean(comm)
+        self.flat = inData.data.flat_mean(comm)
         self.flat_minus_dark = self.flat - self.dark
 
         self.flat_minus_dark = self.flat - self.dark
@@ -59,6 +59,7 @@ class BaseDriver(object):
 
         logging.info("%s.%s", self.__class__.__name__, '_barrier')
         self.plugin_barrier()
+        self._gather_frame_metadata(self.get_communicator())
 
         logging.info("%s.%s", self.__class__.__name__, 'post_process')
         self.post_process()
@@ -39,14 +39,18 @@ class BasicDriver(object):
         self.base_pre_process()
         self.pre_process()
 
-        msg = "Pre-process completed for %s" % self.__class__.__name__
-        self.plugin_barrier(msg=msg)
+        previous, following = self._pipelined
+        if not previous:
+            msg = "Pre-process completed for %s" % self.__class__.__name__
+            self.plugin_barrier(msg=msg)
 
         logging.info("%s.%s", self.__class__.__name__, 'process_frames')
         transport._transport_process(self)
 
-        msg = "Process_frames completed for %s" % self.__class__.__name__
-        self.plugin_barrier(msg=msg)
+        if not following:
+            msg = "Process_frames completed for %s" % self.__class__.__name__
+            self.plugin_barrier(msg=msg)
+        self._gather_frame_metadata(self.get_communicator())
 
         logging.info("%s.%s", self.__class__.__name__, 'post_process')
         self.post_process()
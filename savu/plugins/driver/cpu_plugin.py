@@ -21,10 +21,15 @@
 
 """
 
+import os
+import logging
+import numpy as np
+from mpi4py import MPI
+
+import savu.core.utils as cu
 from savu.plugins.driver.plugin_driver import PluginDriver
 from savu.plugins.driver.basic_driver import BasicDriver
 
-import os
 _base = BasicDriver if os.environ['savu_mode'] == 'basic' else PluginDriver
 
 
@@ -37,5 +42,113 @@ class CpuPlugin(_base):
         super(CpuPlugin, self).__init__()
 
     def _run_plugin(self, exp, transport):
-        self._run_plugin_instances(transport)
+        expInfo = exp.meta_data
+        processes = expInfo.get("processes")
+        process = expInfo.get("process")
+        ranks = self._get_ranks(len(processes))
+
+        if len(ranks) == len(processes):
+            self._run_plugin_instances(transport)
+            return
+
+        in_pData, out_pData = self.get_plugin_datasets()
+        for pData in in_pData + out_pData:
+            pData.meta_data.set('mpi_procs', len(ranks))
+        if process == 0:
+            cu.user_message("%s will run on %i of the %i processes" %
+                            (self.name, len(ranks), len(processes)))
+        self.__create_new_communicator(ranks)
+
+        if process in ranks:
+            expInfo.set('processes', [processes[r] for r in ranks])
+            expInfo.set('process', self.new_comm.Get_rank())
+            self._run_plugin_instances(transport, communicator=self.new_comm)
+            self.__free_communicator()
+            expInfo.set('process', process)
+            expInfo.set('processes', processes)
+        else:
+            logging.info('No data for process %i: Waiting...', process)
+            self._revert_preview(self.parameters['in_datasets'])
+
+        self.exp._barrier()
+        self.__share_meta_data(process in ranks)
         return
+
+    def _get_ranks(self, nProcs):
+        """ Choose the processes that will run the plugin.  The number of
+        processes is limited to the number of transfer blocks (so that every
+        process receives data) and to the bounds given by min_max_cpus.  The
+        chosen ranks are spread evenly across the available processes (and
+        always include rank 0).
+
+        :params int nProcs: The number of available processes.
+        :returns: The (MPI.COMM_WORLD) ranks of the chosen processes.
+        :rtype: list(int)
+        """
+        in_pData, out_pData = self.get_plugin_datasets()
+        blocks = [int(np.ceil(p.meta_data.get('total_frames') /
+                              float(p._get_max_frames_transfer() or 1)))
+                  for p in in_pData + out_pData]
+        n = min(nProcs, max(blocks)) if blocks else nProcs
+        lower, upper = self.min_max_cpus()
+        if upper is not None:
+            n = min(n, upper)
+        if lower is not None:
+            n = max(n, min(lower, nProcs))
+        n = max(n, 1)
+        return [int(r) for r in np.linspace(0, nProcs, n, endpoint=False)]
+
+    def __create_new_communicator(self, ranks):
+        self.group = MPI.COMM_WORLD.Get_group()
+        self.new_group = MPI.Group.Incl(self.group, ranks)
+        self.new_comm = MPI.COMM_WORLD.Create(self.new_group)
+        self.exp._barrier()
+
+    def __free_communicator(self):
+        self.group.Free()
+        self.new_group.Free()
+        self.new_comm.Free()
+
+    def __share_meta_data(self, active):
+        """ Copy the state that may have been updated during the processing
+        (in pre_process, process_frames or post_process) from rank 0 to the
+        processes that did not run the plugin.  This is the meta data of
+        every dataset in the experiment (a plugin may populate datasets other
+        than its own, e.g. VoCentering 'datasets_to_populate') and the data
+        type parameters that are updated outside of __init__ (e.g. the dark
+        and flat field scales and means).
+        """
+        datasets = self.__get_all_datasets()
+        state = [self.__get_state(d) for d in datasets] if active else None
+        state = MPI.COMM_WORLD.bcast(state, root=0)
+        if not active:
+            for data, (mData, extras) in zip(datasets, state):
+                data.meta_data._set_dictionary(mData)
+                for key, value in extras.iteritems():
+                    setattr(data.data, key, value)
+
+    def __get_all_datasets(self):
+        """ The plugin datasets followed by all other datasets in the
+        experiment index, in the same order on every process. """
+        in_data, out_data = self.get_datasets()
+        datasets = in_data + out_data
+        for key in ['in_data', 'out_data']:
+            index = self.exp.index[key]
+            for name in sorted(index.keys()):
+                if not any(index[name] is d for d in datasets):
+                    datasets.append(index[name])
+        return datasets
+
+    def __get_state(self, data):
+        extras = data.data._base_extra_params() \
+            if hasattr(data.data, '_base_extra_params') else []
+        return (data.meta_data.get_dictionary(),
+                dict((k, getattr(data.data, k)) for k in extras))
+
+    def min_max_cpus(self):
+        """ Sets the bounds on the number of processes used by the plugin,
+        such that if bounds=[b1, b2] then b1 is the lower bound and b2 is the
+        upper bound.  Set each entry to None if there are no bounds.  The
+        number of processes never exceeds the number available.
+        """
+        return [None, None]
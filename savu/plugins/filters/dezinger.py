@@ -26,6 +26,7 @@
 import numpy as np
 import dezing
 
+import savu.core.utils as cu
 from savu.plugins.filters.base_filter import BaseFilter
 from savu.plugins.driver.cpu_plugin import CpuPlugin
 from savu.plugins.utils import register_plugin
@@ -49,36 +50,33 @@ class Dezinger(BaseFilter, CpuPlugin):
         self.errflag = 0
 
     def pre_process(self):
-        # Apply dezing to dark and flat images
+        # Apply dezing to dark and flat images (on the root process only)
         inData = self.get_in_datasets()[0]
-        dark = inData.data.dark()
-        flat = inData.data.flat()
+        comm = self.get_communicator()
         self.data_size = inData.get_shape()
 
-        pad_list = ((self.pad, self.pad), (0, 0), (0, 0))
-
-        # dezing the dark field        print "*****in data shape in base filter", in_dataset[0].get_shape()
-
+        dark = cu.root_bcast(
+            lambda: self._dezing_calibration(inData.data.dark()), comm)
         if dark.size:
-            (retval, self.warnflag, self.errflag) = dezing.setup_size(
-                dark.shape, self.parameters['outlier_mu'], self.pad,
-                mode=self.parameters['mode'])
-            dark = self._dezing(np.pad(dark, pad_list, mode='edge'))
-            inData.data.update_dark(dark[self.pad:-self.pad])
-            (retval, self.warnflag, self.errflag) = dezing.cleanup()
-
-        # dezing the flat field
+            inData.data.update_dark(dark)
+
+        flat = cu.root_bcast(
+            lambda: self._dezing_calibration(inData.data.flat()), comm)
         if flat.size:
-            (retval, self.warnflag, self.errflag) = dezing.setup_size(
-                flat.shape, self.parameters['outlier_mu'],
-                self.pad, mode=self.parameters['mode'])
-            flat = self._dezing(np.pad(flat, pad_list, mode='edge'))
-            inData.data.update_flat(flat[self.pad:-self.pad])
-            (retval, self.warnflag, self.errflag) = dezing.cleanup()
+            inData.data.update_flat(flat)
 
         # setup dezing for data
         self._dezing_setup(self.data_size)
 
+    def _dezing_calibration(self, data):
+        if not data.size:
+            return data
+        pad_list = ((self.pad, self.pad), (0, 0), (0, 0))
+        self._dezing_setup(data.shape)
+        data = self._dezing(np.pad(data, pad_list, mode='edge'))
+        (retval, self.warnflag, self.errflag) = dezing.cleanup()
+        return data[self.pad:-self.pad]
+
     def _dezing_setup(self, shape):
         (retval, self.warnflag, self.errflag) = \
             dezing.setup_size(shape, self.parameters['outlier_mu'],
@@ -27,6 +27,7 @@ import numpy as np
 
 import scipy.signal.signaltools as sig
 
+import savu.core.utils as cu
 from savu.plugins.filters.base_filter import BaseFilter
 from savu.plugins.driver.cpu_plugin import CpuPlugin
 from savu.plugins.utils import register_plugin
@@ -55,19 +56,27 @@ class DezingerSimple(BaseFilter, CpuPlugin):
         self._kernel = [1]*3
         self._kernel[self.proj_dim] = self.kernel_size
 
-        pad_list = [(0, 0)]*3
-        pad_list[self.proj_dim] = (self.pad, self.pad)
-
-        dark = inData.data.dark()
-        flat = inData.data.flat()
+        # the darks and flats are dezinged on the root process only
+        comm = self.get_communicator()
+        dark = cu.root_bcast(
+            lambda: self._dezing_calibration(inData.data.dark()), comm)
         if dark.size:
-            dark = np.pad(inData.data.dark(), pad_list, mode='edge')
-            dark = self._process_calibration_frames(dark)
-            inData.data.update_dark(dark[self.pad:-self.pad])
+            inData.data.update_dark(dark)
+        flat = cu.root_bcast(
+            lambda: self._dezing_calibration(inData.data.flat()), comm)
         if flat.size:
-            flat = np.pad(inData.data.flat(), pad_list, mode='edge')
-            flat = self._process_calibration_frames(flat)
-            inData.data.update_flat(flat[self.pad:-self.pad])
+            inData.data.update_flat(flat)
+
+    def _dezing_calibration(self, data):
+        if not data.size:
+            return data
+        pad_list = [(0, 0)]*3
+        pad_list[self.proj_dim] = (self.pad, self.pad)
+        data = self._process_calibration_frames(
+            np.pad(data, pad_list, mode='edge'))
+        sl = [slice(None)]*3
+        sl[self.proj_dim] = slice(self.pad, -self.pad)
+        return data[tuple(sl)]
 
     def _process_calibration_frames(self, data):
         nSlices = data.shape[self.proj_dim] - 2*self.pad
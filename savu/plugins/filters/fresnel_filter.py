@@ -24,7 +24,7 @@ from savu.plugins.plugin import Plugin
 from savu.plugins.driver.cpu_plugin import CpuPlugin
 from savu.plugins.utils import register_plugin
 import numpy as np
-import pyfftw.interfaces.scipy_fftpack as fft
+import savu.core.fft_service as fft
 
 
 @register_plugin
@@ -64,9 +64,12 @@ class FresnelFilter(Plugin, CpuPlugin):
         centerc = np.int16(np.ceil((ncolpad - 1) * 0.5))
         ulist = 1.0 * (np.arange(0, ncolpad) - centerc) / ncolpad
         listfactor = 1.0 + ratio * ulist**2
+        # the filter is symmetric, so only the non-negative frequencies of
+        # the (real) sinogram rows are required
+        listfactor = np.fft.ifftshift(listfactor)[:ncolpad//2 + 1]
         sinopad = np.pad(sinogram, ((0, 0), (pad, pad)), mode='edge')
-        sinophase = np.zeros((self.height1, ncolpad), dtype=np.float32)
-        for i in range(0, self.height1):
-            sinophase[i] = np.real(fft.ifft(np.fft.ifftshift(
-                np.fft.fftshift(fft.fft(sinopad[i])) / listfactor)))
-        return sinophase[:, pad:ncolpad - pad]
\ No newline at end of file
+        sinophase = fft.irfft(fft.rfft(sinopad) / listfactor, n=ncolpad)
+        return np.float32(sinophase[:, pad:ncolpad - pad])
+
+    def thread_safe(self):
+        return True
@@ -22,7 +22,7 @@
 """
 import logging
 import numpy as np
-import pyfftw.interfaces.scipy_fftpack as fft
+import savu.core.fft_service as fft
 
 
 from savu.plugins.filters.base_filter import BaseFilter
@@ -76,3 +76,5 @@ class HilbertFilter(BaseFilter, CpuPlugin):
     def get_max_frames(self):
         return 'single'
 
+    def thread_safe(self):
+        return True
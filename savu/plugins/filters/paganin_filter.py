@@ -23,7 +23,7 @@
 import math
 import logging
 import numpy as np
-import pyfftw.interfaces.scipy_fftpack as fft
+import savu.core.fft_service as fft
 
 from savu.plugins.filters.base_filter import BaseFilter
 from savu.plugins.driver.cpu_plugin import CpuPlugin
@@ -61,7 +61,7 @@ class PaganinFilter(BaseFilter, CpuPlugin):
         logging.debug("Calling super to make sure that all superclases are " +
                       " initialised")
         super(PaganinFilter, self).__init__("PaganinFilter")
-        self.filtercomplex = None
+        self.filter = None
         self.count = 0
 
     def set_filter_padding(self, in_pData, out_pData):
@@ -76,7 +76,9 @@ class PaganinFilter(BaseFilter, CpuPlugin):
         out_pData[0].padding = pad_dict
 
     def pre_process(self):
-        self._setup_paganin(*self.get_plugin_in_datasets()[0].get_shape())
+        in_pData = self.get_plugin_in_datasets()[0]
+        self.slice_dim = in_pData.get_slice_dimension()
+        self._setup_paganin(*in_pData.get_core_shape())
 
     def _setup_paganin(self, height, width):
         micron = 10**(-6)
@@ -89,38 +91,46 @@ class PaganinFilter(BaseFilter, CpuPlugin):
 
         height1 = height + 2 * self.parameters['Padtopbottom']
         width1 = width + 2 * self.parameters['Padleftright']
-        centery = np.ceil(height1 / 2.0) - 1.0
-        centerx = np.ceil(width1 / 2.0) - 1.0
-
-        # Define the paganin filter
-        dpx = 1.0 / (width1 * resolution)
-        dpy = 1.0 / (height1 * resolution)
-        pxlist = (np.arange(width1) - centerx) * dpx
-        pylist = (np.arange(height1) - centery) * dpy
-        pxx = np.zeros((height1, width1), dtype=np.float32)
-        pxx[:, 0:width1] = pxlist
-        pyy = np.zeros((height1, width1), dtype=np.float32)
-        pyy[0:height1, :] = np.reshape(pylist, (height1, 1))
-        pd = (pxx * pxx + pyy * pyy) * wavelength * distance * math.pi
-
-        filter1 = 1.0 + ratio * pd
-        self.filtercomplex = filter1 + filter1 * 1j
+
+        # Define the paganin filter, in the (unshifted) layout of the rfft2
+        # output
+        pxlist = np.fft.rfftfreq(width1, d=resolution)
+        pylist = np.fft.fftfreq(height1, d=resolution)
+        pd = (pxlist**2 + pylist[:, np.newaxis]**2) * wavelength * distance \
+            * math.pi
+        # sqrt(2) is the magnitude of the original complex filter,
+        # (1 + 1j)*filter1, so the results are unchanged
+        self.filter = np.float32(math.sqrt(2) * (1.0 + ratio * pd))
 
     def _paganin(self, data):
-        pci1 = fft.fft2(np.float32(data))
-        pci2 = fft.fftshift(pci1) / self.filtercomplex
-        fpci = np.abs(fft.ifft2(pci2))
-        result = -0.5 * self.parameters['Ratio'] * np.log(
-            fpci + self.parameters['increment'])
-        return result
+        """ Apply the filter to a projection, or a stack of projections
+        (stacked along the first dimension). """
+        pci = fft.rfft2(np.float32(data))
+        pci /= self.filter
+        fpci = fft.irfft2(pci, s=data.shape[-2:])
+        # reuse the work buffer for the remaining steps
+        np.abs(fpci, out=fpci)
+        fpci += self.parameters['increment']
+        np.log(fpci, out=fpci)
+        fpci *= -0.5 * self.parameters['Ratio']
+        return fpci
 
     def process_frames(self, data):
         proj = np.nan_to_num(data[0])  # Noted performance
         proj[proj == 0] = 1.0
-        return self._paganin(proj)
+        if proj.ndim is 2:
+            return self._paganin(proj)
+        proj = np.rollaxis(proj, self.slice_dim)
+        return np.rollaxis(self._paganin(proj), 0, self.slice_dim + 1)
 
     def get_max_frames(self):
-        return 'single'
+        return 'multiple'
+
+    def quick_look_parameters(self):
+        return {'Resolution': 1}
+
+    def thread_safe(self):
+        return True
 
     def get_citation_information(self):
         cite_info = CitationInformation()
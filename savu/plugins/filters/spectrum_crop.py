@@ -67,6 +67,14 @@ class SpectrumCrop(BaseFilter, CpuPlugin):
         in_pData[0].plugin_data_setup('SPECTRUM', self.get_max_frames())
         out_pData[0].plugin_data_setup('SPECTRUM', self.get_max_frames())
 
+    def get_loader_preview(self):
+        idx = np.where(self.new_idx)[0]
+        if self.new_idx.ndim != 1 or not idx.size or np.any(np.diff(idx) > 1):
+            return None
+        preview = [':']*len(self.get_in_datasets()[0].get_shape())
+        preview[-1] = '%i:%i' % (idx[0], idx[-1] + 1)
+        return preview
+
     def get_max_frames(self):
         return 'single'
 
@@ -66,13 +66,18 @@ class ThresholdFilter(BaseFilter, CpuPlugin):
         logging.debug("Data frame recieved for processing of shape %s",
                       str(data.shape))
 
-        result = numpy.zeros(data.shape, dtype=data.dtype)
+        out = self.get_output_buffers()
+        result = out[0] if out else numpy.empty(data.shape, dtype=data.dtype)
 
+        result.fill(0)
         result[data < self.threshold] = self.lowest
         result[data >= self.threshold] = self.highest
 
         return result
 
+    def uses_output_buffers(self):
+        return True
+
     def pre_process(self):
         in_dataset = self.get_in_datasets()[0]
         try:
@@ -57,9 +57,36 @@ class BaseLoader(Plugin):
     def set_data_reduction_params(self, data_obj):
         pDict = self.parameters
         self.data_mapping()
-        data_obj.get_preview().set_preview(pDict['preview'], load=True)
+        preview = self.__get_quick_look_preview(data_obj, pDict['preview'])
+        data_obj.get_preview().set_preview(preview, load=True)
         self.reduction_flag = True
 
+    def __get_quick_look_preview(self, data_obj, preview):
+        """ In quick-look mode, take every nth angle, sinogram and detector
+        pixel (in addition to any previewing already requested), where n is
+        the quick-look factor.
+        """
+        factor = self.exp.meta_data.get_dictionary().get('quick_look')
+        if not factor or factor == 1:
+            return preview
+        labels = ['rotation_angle', 'detector_y', 'detector_x']
+        dims = [data_obj.get_data_dimension_by_axis_label(l) for l in labels
+                if l in data_obj.get_axis_label_keys()]
+        if not dims:
+            return preview
+
+        nDims = len(data_obj.get_shape())
+        preview = data_obj.get_preview()._parse_preview(
+            list(preview) if isinstance(preview, list) else preview)
+        preview = data_obj.get_preview()._add_preview_defaults(
+            preview if preview else [':']*nDims)
+        for dim in dims:
+            entry = '0:end:1:1' if preview[dim] == ':' else preview[dim]
+            start, stop, step, chunk = entry.split(':')
+            preview[dim] = ':'.join([start, stop, '(%s)*%i' % (step, factor),
+                                     chunk])
+        return preview
+
     def get_NXapp(self, ltype, nx_file, entry):
         '''
         finds an application definition in a nexus file
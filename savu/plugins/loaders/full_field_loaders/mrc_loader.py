@@ -47,6 +47,9 @@ class MrcLoader(BaseLoader):
 
         filename = exp.meta_data.get("data_file")
         data_obj.data = MrcType(data_obj, filename)
+        if data_obj.data.stats:
+            # the statistics recorded in the header (no pass over the data)
+            data_obj.meta_data.set(['stats', 'global'], data_obj.data.stats)
 
         # dummy file
         path = exp.meta_data.get("data_file")
@@ -64,9 +67,9 @@ class MrcLoader(BaseLoader):
                                      'detector_y.pixel',
                                      'detector_x.pixel')
 
-            data_obj.add_pattern('PROJECTION', core_dir=(detX, detY),
+            data_obj.add_pattern('PROJECTION', core_dims=(detX, detY),
                                  slice_dims=(rot,))
-            data_obj.add_pattern('SINOGRAM', core_dir=(detX, rot),
+            data_obj.add_pattern('SINOGRAM', core_dims=(detX, rot),
                                  slice_dims=(detY,))
         elif nDims is 4:
             # 4D patterns need to be set here
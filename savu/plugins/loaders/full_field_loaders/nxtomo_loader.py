@@ -28,6 +28,7 @@ import numpy as np
 import savu.core.utils as cu
 from savu.plugins.loaders.base_loader import BaseLoader
 from savu.plugins.utils import register_plugin
+from savu.plugins.loaders.utils.swmr_dataset import SwmrDataset
 from savu.data.data_structures.data_types.data_plus_darks_and_flats \
     import ImageKey, NoImageKey
 
@@ -52,6 +53,17 @@ class NxtomoLoader(BaseLoader):
         . Default: False.
     :param ignore_flats: List of batch numbers of flats (start at 1) to \
         ignore. Default: None.
+    :u*param swmr_frames: For live processing of a file that is still being \
+        written (in SWMR mode), the total number of frames (including darks \
+        and flats) expected.  Frames are processed as they become \
+        available. Default: None.
+    :u*param swmr_timeout: The maximum time in seconds to wait for a new \
+        frame to be written in SWMR mode. Default: 600.
+    :u*param swmr_image_key: The final image key of a file that is still \
+        being written, as a python statement to be evaluated or a file, so \
+        the positions of darks and flats yet to be written are known.  If \
+        this is not given, processing waits until the image key has been \
+        written in full. Default: None.
     """
 
     def __init__(self, name='NxtomoLoader'):
@@ -67,10 +79,15 @@ class NxtomoLoader(BaseLoader):
 
         data_obj = exp.create_data_object('in_data', self.parameters['name'])
 
-        data_obj.backing_file = \
-            h5py.File(self.exp.meta_data.get("data_file"), 'r')
+        self.swmr = self.parameters['swmr_frames']
+        data_obj.backing_file = self.__open_file(
+            self.exp.meta_data.get("data_file"))
 
         data_obj.data = data_obj.backing_file[self.parameters['data_path']]
+        if self.swmr:
+            data_obj.data = SwmrDataset(
+                data_obj.data, self.swmr, timeout=self.parameters[
+                    'swmr_timeout'])
 
         self._set_dark_and_flat(data_obj)
 
@@ -98,6 +115,51 @@ class NxtomoLoader(BaseLoader):
         self.set_data_reduction_params(data_obj)
         data_obj.data._set_dark_and_flat()
 
+    def __open_file(self, path):
+        if not self.swmr:
+            return h5py.File(path, 'r')
+        logging.info("Opening %s in SWMR mode", path)
+        return h5py.File(path, 'r', libver='latest', swmr=True)
+
+    def __get_image_key(self, data_obj):
+        image_key = data_obj.backing_file[
+            'entry1/tomo_entry/instrument/detector/image_key']
+        if not self.swmr:
+            return image_key[...]
+        final_key = self.__get_final_image_key()
+        image_key = SwmrDataset(image_key, self.swmr,
+                                timeout=self.parameters['swmr_timeout'])
+        if final_key is None:
+            # the type of the frames not yet written is unknown
+            if not image_key.is_complete():
+                cu.user_message("Waiting for the image key to be written "
+                                "(set swmr_image_key to start processing "
+                                "earlier)")
+            return image_key[...]
+
+        written = image_key[:image_key.get_available_frames()]
+        if not np.array_equal(final_key[:len(written)], written):
+            raise Exception("The swmr_image_key parameter does not match the "
+                            "image key written to the file.")
+        return final_key
+
+    def __get_final_image_key(self):
+        key = self.parameters['swmr_image_key']
+        if key is None:
+            return None
+        if isinstance(key, str):
+            try:
+                exec("key = " + key)
+            except Exception as e:
+                logging.debug(e.message)
+                key = np.loadtxt(key)
+        key = np.asarray(key, dtype=int).ravel()
+        if key.size != self.swmr:
+            raise Exception("The swmr_image_key parameter has %s entries, "
+                            "but %s frames are expected." %
+                            (key.size, self.swmr))
+        return key
+
     def __get_nFrames(self, dObj):
         if self.parameters['3d_to_4d'] is False:
             return 0
@@ -173,8 +235,7 @@ class NxtomoLoader(BaseLoader):
         ignore = self.parameters['ignore_flats'] if \
             self.parameters['ignore_flats'] else None
         try:
-            image_key = data_obj.backing_file[
-                'entry1/tomo_entry/instrument/detector/image_key'][...]
+            image_key = self.__get_image_key(data_obj)
             data_obj.data = \
                 ImageKey(data_obj, image_key, 0, ignore=ignore)
         except KeyError:
@@ -194,8 +255,7 @@ class NxtomoLoader(BaseLoader):
 
     def __set_separate_dark_and_flat(self, data_obj):
         try:
-            image_key = data_obj.backing_file[
-                'entry1/tomo_entry/instrument/detector/image_key'][...]
+            image_key = self.__get_image_key(data_obj)
         except:
             image_key = None
         data_obj.data = NoImageKey(data_obj, image_key, 0)
@@ -247,7 +307,12 @@ class NxtomoLoader(BaseLoader):
         if path in data_obj.backing_file:
             idx = data_obj.data.get_image_key() == 0 if \
                 isinstance(data_obj.data, ImageKey) else slice(None)
-            return data_obj.backing_file[path][idx]
+            angles = data_obj.backing_file[path]
+            if self.swmr and angles.shape[0] < self.swmr:
+                self.log_warning("The rotation angles have not all been "
+                                 "written yet.")
+                return None
+            return angles[idx]
         else:
             self.log_warning("No rotation angle entry found in input file.")
             return None
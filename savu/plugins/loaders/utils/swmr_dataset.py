@@ -0,0 +1,102 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: swmr_dataset
+   :platform: Unix
+   :synopsis: A wrapper for a hdf5 dataset that is still being written to \
+       (single writer multiple reader mode).
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import time
+import logging
+import numpy as np
+
+
+class SwmrDataset(object):
+    """ Wraps a h5py dataset, opened in SWMR mode, that is growing along one
+    dimension.  The shape reported is the final (expected) shape of the
+    dataset and any read blocks until all the requested frames have been
+    written, so processing can begin before the acquisition is complete.
+
+    :param dataset: The h5py dataset.
+    :param int nFrames: The total number of frames expected along dim.
+    :param int dim: The dimension the dataset is growing along.
+    :param float timeout: Maximum time (in seconds) to wait for new frames.
+    :param float poll: Time (in seconds) between checks for new frames.
+    """
+
+    def __init__(self, dataset, nFrames, dim=0, timeout=600, poll=1.0):
+        self.dataset = dataset
+        self.dim = dim
+        self.timeout = timeout
+        self.poll = poll
+        shape = list(dataset.shape)
+        shape[dim] = nFrames
+        self.shape = tuple(shape)
+        self.dtype = dataset.dtype
+        self.ndim = len(shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, idx):
+        self.wait_for_frame(self.__get_max_index(idx))
+        return self.dataset[idx]
+
+    def get_available_frames(self):
+        """ Get the number of frames that have been written so far. """
+        self.dataset.refresh()
+        return self.dataset.shape[self.dim]
+
+    def is_complete(self):
+        return self.get_available_frames() >= self.shape[self.dim]
+
+    def wait_for_frame(self, index):
+        """ Block until frame 'index' (along the growing dimension) has been
+        written, or raise an exception after timeout seconds. """
+        if index < self.dataset.shape[self.dim]:
+            return
+        start = time.time()
+        logging.debug("Waiting for frame %s of %s", index, self.dataset.name)
+        while index >= self.get_available_frames():
+            if time.time() - start > self.timeout:
+                raise Exception(
+                    "Timed out after %ss waiting for frame %s of %s (%s "
+                    "frames available)." % (self.timeout, index,
+                                            self.dataset.name,
+                                            self.dataset.shape[self.dim]))
+            time.sleep(self.poll)
+
+    def __get_max_index(self, idx):
+        """ Find the largest index requested along the growing dimension. """
+        idx = idx if isinstance(idx, tuple) else (idx,)
+        if any(i is Ellipsis for i in idx) or len(idx) <= self.dim:
+            return self.shape[self.dim] - 1
+        entry = idx[self.dim]
+        length = self.shape[self.dim]
+        if isinstance(entry, slice):
+            start, stop, step = entry.indices(length)
+            n = len(xrange(start, stop, step))
+            return max(start, start + (n-1)*step) if n else -1
+        entry = np.asarray(entry)
+        if entry.dtype == np.bool:
+            entry = np.where(entry)[0]
+        if not entry.size:
+            return -1
+        entry = np.where(entry < 0, entry + length, entry)
+        return int(entry.max())
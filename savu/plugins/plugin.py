@@ -25,7 +25,9 @@ import ast
 import copy
 import logging
 import inspect
+import threading
 import numpy as np
+from collections import OrderedDict
 
 import savu.plugins.docstring_parser as doc
 from savu.plugins.plugin_datasets import PluginDatasets
@@ -54,6 +56,9 @@ class Plugin(PluginDatasets):
         self.global_index = None
         self.pcount = 0
         self.exp = None
+        self._frame_metadata = OrderedDict()
+        self._pipelined = (False, False)
+        self._out_buffers = threading.local()
 
     def _main_setup(self, exp, params):
         """ Performs all the required plugin setup.
@@ -79,6 +84,12 @@ class Plugin(PluginDatasets):
     def get_process_frames_counter(self):
         return self.pcount
 
+    def _set_pipelined(self, previous, following):
+        """ Set whether the plugin is pipelined with the previous and the
+        following plugins, in which case the processes are not synchronised
+        between them (see DependencyTracker). """
+        self._pipelined = (previous, following)
+
     def _set_parameters_this_instance(self, indices):
         """ Determines the parameters for this instance of the plugin, in the
         case of parameter tuning.
@@ -196,6 +207,55 @@ class Plugin(PluginDatasets):
                          "configurator to auto remove \nobsolete parameters."
                          % (key, self.name))
                 raise ValueError(error)
+        self.__apply_quick_look()
+
+    def __apply_quick_look(self):
+        """ Rescale pixel size dependent parameters when the data has been
+        reduced by the quick-look factor (see quick_look_parameters).
+        """
+        if self.exp is None or not \
+                self.exp.meta_data.get_dictionary().get('quick_look'):
+            return
+        factor = float(self.exp.meta_data.get('quick_look'))
+        for key, power in self.quick_look_parameters().iteritems():
+            scale = lambda v: self.__scale_param(v, factor**power, 1/factor)
+            self.parameters[key] = scale(self.parameters[key])
+            for entry in self.multi_params_dict.values():
+                if entry['label'].split('_params')[0] == key:
+                    entry['values'] = scale(entry['values'])
+
+    def __scale_param(self, value, scale, index_scale):
+        if isinstance(value, (list, tuple)):
+            return type(value)([self.__scale_param(v, scale, index_scale)
+                                for v in value])
+        if isinstance(value, dict):
+            # integer keys are detector indices (e.g. the rows of a centre of
+            # rotation per detector_y value)
+            return dict((self.__scale_key(k, index_scale),
+                         self.__scale_param(v, scale, index_scale))
+                        for k, v in value.iteritems())
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return value
+        return type(value)(value*scale)
+
+    def __scale_key(self, key, scale):
+        if isinstance(key, (int, long)) and not isinstance(key, bool):
+            return int(key*scale)
+        if isinstance(key, basestring) and key.strip().isdigit():
+            return type(key)(int(int(key)*scale))
+        return key
+
+    def quick_look_parameters(self):
+        """ Parameters that depend on the detector pixel size, and so must
+        be rescaled when running in quick-look mode (where the data is reduced
+        by an integer factor in each detector dimension).
+
+        :returns: parameter names and the power of the quick-look factor to
+            scale each value by, e.g. -1 for a number of pixels and 1 for a
+            pixel size.
+        :rtype: dict
+        """
+        return {}
 
     def __convert_multi_params(self, value, key):
         """ Set up parameter tuning.
@@ -257,12 +317,110 @@ class Plugin(PluginDatasets):
         and before returning the data to file."""
         return data
 
-    def plugin_process_frames(self, data):
-        frames = self.base_process_frames_after(self.process_frames(
-                self.base_process_frames_before(data)))
+    def plugin_process_frames(self, data, out=None):
+        return self._complete_process_frames(
+            self._run_process_frames(data, out))
+
+    def _run_process_frames(self, data, out=None):
+        """ The part of plugin_process_frames that may be run concurrently
+        by a thread safe plugin. """
+        self._out_buffers.frames = out
+        try:
+            return self.base_process_frames_after(self.process_frames(
+                    self.base_process_frames_before(data)))
+        finally:
+            self._out_buffers.frames = None
+
+    def get_output_buffers(self):
+        """ Get the preallocated arrays that process_frames may write its
+        results into, if the plugin uses output buffers (see
+        :meth:`uses_output_buffers`).  Return the arrays from process_frames
+        to avoid copying the results.
+
+        :returns: An array, shaped as the frames returned from process_frames,
+            for each output dataset (or None if they are not available, in
+            which case the results must be returned in new arrays).
+        :rtype: list(np.ndarray)
+        """
+        return getattr(self._out_buffers, 'frames', None)
+
+    def _complete_process_frames(self, frames):
+        """ The part of plugin_process_frames that is always run in frame
+        order, in the main thread. """
+        if self._frame_metadata:
+            frames = self.__collect_frame_metadata(frames)
         self.pcount += 1
         return frames
 
+    def create_frame_metadata(self, name, shape=(), dtype=np.float64):
+        """ Collect a scalar (or a small array) for each frame in memory,
+        instead of creating a 'METADATA' output dataset.  Call this in setup()
+        and return the values from process_frames, after the frames for any
+        output datasets and in the order the entries were created.  The values
+        from all processes are gathered before post_process() is called.
+
+        :params str name: The name of the entry.
+        :params tuple shape: The shape of the values for a single frame.
+        :params dtype: The data type of the values.
+        """
+        self._frame_metadata[name] = {'shape': tuple(shape), 'dtype': dtype,
+                                      'index': [], 'values': [],
+                                      'result': None}
+
+    def get_frame_metadata(self, name):
+        """ Get the values collected for each frame (available in
+        post_process()).
+
+        :params str name: The name of the entry.
+        :returns: The values for every frame of the first input dataset, in
+            frame order.
+        :rtype: np.ndarray
+        """
+        return self._frame_metadata[name]['result']
+
+    def __collect_frame_metadata(self, frames):
+        """ Store the frame metadata returned by process_frames and return
+        the frames for the output datasets. """
+        nOut = len(self.get_out_datasets())
+        frames = frames if isinstance(frames, list) else [frames]
+        index = self.get_plugin_in_datasets()[0].get_current_frame_idx()
+        for entry, values in zip(self._frame_metadata.values(),
+                                 frames[nOut:]):
+            values = np.asarray(values, dtype=entry['dtype'])\
+                .reshape((-1,) + entry['shape'])
+            entry['index'].append(index[:len(values)])
+            entry['values'].append(values)
+        return frames[:nOut] if nOut else None
+
+    def _gather_frame_metadata(self, comm=None):
+        """ Combine the frame metadata from all processes in the
+        communicator, so every process holds the values for all frames.
+        Frames that were not processed are NaN (or zero for integer types).
+        """
+        if not self._frame_metadata:
+            return
+        local = {}
+        for name, entry in self._frame_metadata.iteritems():
+            shape = (0,) + entry['shape']
+            local[name] = (
+                np.concatenate(entry['index']) if entry['index'] else
+                np.zeros(0, dtype=np.int64),
+                np.concatenate(entry['values']) if entry['values'] else
+                np.zeros(shape, dtype=entry['dtype']))
+            entry['index'], entry['values'] = [], []
+
+        gathered = comm.allgather(local) if comm and comm.size > 1 \
+            else [local]
+
+        nFrames = self.get_plugin_in_datasets()[0].get_total_frames()
+        for name, entry in self._frame_metadata.iteritems():
+            dtype = np.dtype(entry['dtype'])
+            fill = np.nan if dtype.kind in 'fc' else 0
+            result = np.full((nFrames,) + entry['shape'], fill, dtype=dtype)
+            for values in gathered:
+                result[values[name][0]] = values[name][1]
+            entry['result'] = result
+
     def process_frames(self, data):
         """
         This method is called after the plugin has been created by the
@@ -430,6 +588,39 @@ class Plugin(PluginDatasets):
         """
         return 'single'
 
+    def thread_safe(self):
+        """ Return True if process_frames can be called concurrently, for the
+        frames of a transfer block, from a pool of threads.  The plugin must
+        not update its own state in process_frames or rely on the current
+        slice list or frame index, and should spend its time in code that
+        releases the GIL (numpy, FFTW, C extensions) to benefit.
+        """
+        return False
+
+    def nThreads(self):
+        """ The number of threads used by a thread safe plugin. 'auto' shares
+        the cores of a node between the processes on that node.
+        """
+        return 'auto'
+
+    def uses_output_buffers(self):
+        """ Return True if process_frames writes its results in place into
+        the arrays from :meth:`get_output_buffers`, when they are available.
+        """
+        return False
+
+    def get_loader_preview(self):
+        """ If the plugin only crops or removes entries of its input dataset,
+        return the equivalent previewing parameters, so that the plugin can be
+        replaced by previewing in the loader (and the unwanted data is never
+        read).  Called after the plugin setup.
+
+        :returns: A preview entry for each dimension of the input dataset (or
+            None if the plugin cannot be replaced).
+        :rtype: list(str)
+        """
+        return None
+
     def final_parameter_updates(self):
         """ An opportunity to update the parameters after they have been set.
         """
@@ -448,6 +448,9 @@ class BaseRecon(Plugin):
     def get_max_frames(self):
         return 'multiple'
 
+    def quick_look_parameters(self):
+        return {'centre_of_rotation': -1, 'vol_shape': -1}
+
     def map_volume_dimensions(self, data):
         data._finalise_patterns()
         dim_rotAngle = data.get_data_patterns()['PROJECTION']['main_dir']
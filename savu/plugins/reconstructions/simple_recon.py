@@ -27,63 +27,151 @@ from savu.plugins.driver.cpu_plugin import CpuPlugin
 
 import numpy as np
 
+import savu.core.fft_service as fft
 from savu.plugins.utils import register_plugin
 
 
+# maximum size (in bytes) of the cached angle x pixel mapping
+MAX_MAPPING_CACHE = 2**28
+# maximum number of elements gathered from the sinograms in one chunk
+MAX_CHUNK_ELEMENTS = 2**20
+
+
 @register_plugin
 class SimpleRecon(BaseRecon, CpuPlugin):
     """
-    A Plugin to apply a simple reconstruction with no dependancies
+    A Plugin to apply a simple filtered back-projection reconstruction with \
+    no dependancies.
     """
 
     def __init__(self):
         super(SimpleRecon, self).__init__("SimpleRecon")
+        self.filters = {}
+        self.geometry = None
+        self.mapping = None
+
+    def pre_process(self):
+        in_pData, out_pData = self.get_plugin_datasets()
+        self.vol_shape = out_pData[0].get_core_shape()
+        self.in_frame_dim = in_pData[0].get_slice_dimension()
+        self.out_frame_dim = out_pData[0].get_slice_dimension()
+        rot = in_pData[0].get_data_dimension_by_axis_label('rotation_angle')
+        detX = self._get_detX_dim()
+        self.transpose = rot > detX
+
+    def _filter(self, sinograms):
+        """ Apply a ramp filter to all projections of all sinograms in a \
+        single (batched) real FFT.
+
+        :param ndarray sinograms: Sinograms of shape (nSinos, nAngles, nDet).
+        :returns: The filtered sinograms, with two columns of zeros appended \
+            at either end of the detector dimension.
+        :rtype: ndarray
+        """
+        nSinos, nAngles, nDet = sinograms.shape
+        # pad to avoid wrap-around (interperiod interference)
+        size = max(64, int(2**np.ceil(np.log2(2*nDet))))
+        if size not in self.filters.keys():
+            self.filters[size] = \
+                (2*np.abs(np.fft.rfftfreq(size))).astype(np.float32)
+        fs = fft.rfft(sinograms, n=size)
+        fs *= self.filters[size]
+        filtered = np.zeros((nSinos, nAngles, nDet + 4), dtype=np.float32)
+        filtered[..., 2:-2] = fft.irfft(fs, n=size)[..., :nDet]
+        return filtered
 
-    def _filter(self, sinogram):
-        ff = np.arange(sinogram.shape[0])
-        ff -= sinogram.shape[0]/2
-        ff = np.abs(ff)
-        fs = np.fft.fft(sinogram)
-        ffs = fs*ff
-        return np.fft.ifft(ffs).real
+    def _mapping_array(self, shape, angles, chunk=slice(None)):
+        """ Map each pixel of the reconstructed volume to a position on the \
+        detector (relative to the centre of rotation), for each angle.
 
-    def _back_project(self, mapping, sino_element, centre):
-        mapping_array = mapping+centre
-        return sino_element[mapping_array.astype('int')]
+        :param tuple shape: The shape of the reconstructed slice.
+        :param ndarray angles: The rotation angles in radians.
+        :param slice chunk: The angles to calculate the mapping for.
+        :returns: The mapping of shape (nAngles, nPixels).
+        :rtype: ndarray
+        """
+        # x runs along the columns and y along the rows (as np.meshgrid)
+        x = (np.arange(shape[1], dtype=np.float32) - shape[1]/2.)
+        y = (np.arange(shape[0], dtype=np.float32) - shape[0]/2.)
+        cos = np.cos(angles[chunk]).astype(np.float32)
+        sin = np.sin(angles[chunk]).astype(np.float32)
+        mapping = x[np.newaxis, np.newaxis, :]*cos[:, np.newaxis, np.newaxis]\
+            - y[np.newaxis, :, np.newaxis]*sin[:, np.newaxis, np.newaxis]
+        return mapping.reshape(len(cos), -1)
 
-    def _mapping_array(self, shape, center, theta):
-        x, y = np.meshgrid(np.arange(-center[0], shape[0] - center[0]),
-                           np.arange(-center[1], shape[1] - center[1]))
-        return x*np.cos(theta) - y*np.sin(theta)
+    def __get_mapping(self, shape, angles, chunk):
+        """ Get the mapping for a chunk of angles.  The full mapping is \
+        calculated once per geometry and cached if it is small enough. """
+        geometry = (tuple(shape), angles.tostring())
+        if geometry != self.geometry:
+            self.geometry = geometry
+            size = len(angles)*np.prod(shape)*np.dtype(np.float32).itemsize
+            self.mapping = self._mapping_array(shape, angles) \
+                if size <= MAX_MAPPING_CACHE else None
+        if self.mapping is not None:
+            return self.mapping[chunk]
+        return self._mapping_array(shape, angles, chunk=chunk)
+
+    def _back_project(self, filtered, angles, cor, shape):
+        """ Back-project filtered sinograms, with linear interpolation, in \
+        vectorised chunks of angles.
+
+        :param ndarray filtered: Filtered sinograms of shape \
+            (nSinos, nAngles, nDet + 4) (see _filter).
+        :param ndarray angles: The rotation angles in radians.
+        :param float cor: The centre of rotation.
+        :param tuple shape: The shape of the reconstructed slice.
+        :returns: The reconstructed slices of shape (nSinos,) + shape.
+        :rtype: ndarray
+        """
+        nSinos, nAngles, width = filtered.shape
+        nPixels = int(np.prod(shape))
+        flat = filtered.reshape(nSinos, -1)
+        result = np.zeros((nSinos, nPixels), dtype=np.float32)
+        step = max(1, MAX_CHUNK_ELEMENTS/(nPixels*nSinos))
+
+        for start in range(0, nAngles, step):
+            chunk = slice(start, min(start + step, nAngles))
+            # detector positions, offset by the columns of zeros at the start
+            pos = self.__get_mapping(shape, angles, chunk) + \
+                np.float32(cor + 2)
+            np.clip(pos, 0, width - 2, out=pos)
+            idx = pos.astype(np.int32)
+            weight = pos - idx.astype(np.float32)
+            idx += (np.arange(chunk.start, chunk.stop, dtype=np.int32) *
+                    width)[:, np.newaxis]
+            lower = np.take(flat, idx, axis=1)
+            upper = np.take(flat, idx + 1, axis=1)
+            upper -= lower
+            upper *= weight
+            result += lower.sum(axis=1)
+            result += upper.sum(axis=1)
+
+        result *= np.pi/(2*nAngles)
+        return result.reshape((nSinos,) + tuple(shape))
 
     def process_frames(self, data):
-        sino = data[0]
-        centre_of_rotations, angles, vol_shape, init = self.get_frame_params()
-        sinogram = sino[:, np.newaxis, :]
-        try:
-            centre = self.kwargs['centre']
-        except:
-            centre = (vol_shape[0]/2, vol_shape[1]/2)
-
-        results = []
-        for j in range(sinogram.shape[1]):
-            result = np.zeros(vol_shape, dtype=np.float32)
-            for i in range(sinogram.shape[0]):
-                theta = i*(np.pi/sinogram.shape[0])
-                mapping_array = self._mapping_array(vol_shape, centre, theta)
-                filt = np.zeros(sinogram.shape[2]*3, dtype=np.float32)
-                filt[sinogram.shape[2]:sinogram.shape[2]*2] = \
-                    self._filter(np.log(np.nan_to_num(sinogram[i, j, :])+1))
-                result += \
-                    self._back_project(mapping_array, filt,
-                                       (centre_of_rotations +
-                                           sinogram.shape[2]))
-            results.append(result[:, np.newaxis, :])
-        result = np.hstack(results)
-        return result
+        sino = np.nan_to_num(data[0]).astype(np.float32)
+        cors, angles, vol_shape, init = self.get_frame_params()
+        # (nSinos, nAngles, nDet)
+        sino = np.rollaxis(sino, self.in_frame_dim) if sino.ndim is 3 \
+            else sino[np.newaxis]
+        sino = np.swapaxes(sino, 1, 2) if self.transpose else sino
+        angles = np.deg2rad(np.asarray(angles, dtype=np.float64))
+
+        filtered = self._filter(sino)
+        result = np.empty((len(sino),) + tuple(self.vol_shape),
+                          dtype=np.float32)
+        cors = np.asarray(cors)[:len(sino)]
+        # sinograms sharing a centre of rotation are back-projected together
+        for cor in np.unique(cors):
+            idx = np.where(cors == cor)[0]
+            result[idx] = self._back_project(
+                filtered[idx], angles, cor, self.vol_shape)
+        return np.rollaxis(result, 0, self.out_frame_dim + 1)
 
     def get_max_frames(self):
-        return 'single'
+        return 'multiple'
 
     def get_citation_information(self):
         cite_info = CitationInformation()
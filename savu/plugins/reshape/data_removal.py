@@ -54,7 +54,7 @@ class DataRemoval(BaseFilter, CpuPlugin):
         in_data.amend_axis_label_values(
             in_pData._get_data_slice_list(self.sl))
 
-    def process_frames(self, data, frame_list):
+    def process_frames(self, data):
         return data[0][self.sl]
 
     def setup(self):
@@ -91,6 +91,18 @@ class DataRemoval(BaseFilter, CpuPlugin):
             self.indices = np.arange(*indices_list)
         return np.setxor1d(np.arange(orig_shape), self.indices)
 
+    def get_loader_preview(self):
+        shape = self.get_in_datasets()[0].get_shape()
+        dim = self.parameters['dim']
+        keep = self.calc_indices(shape[dim])
+        steps = np.unique(np.diff(keep))
+        if not keep.size or len(steps) > 1 or keep[-1] >= shape[dim]:
+            return None
+        preview = [':']*len(shape)
+        preview[dim] = '%i:%i:%i' % \
+            (keep[0], keep[-1] + 1, steps[0] if steps.size else 1)
+        return preview
+
     def nInput_datasets(self):
         return 1
 
@@ -24,6 +24,7 @@ from savu.plugins.plugin import Plugin
 from savu.plugins.driver.cpu_plugin import CpuPlugin
 from savu.plugins.utils import register_plugin
 from savu.data.plugin_list import CitationInformation
+import savu.plugins.ring_removal.stripe_sorting as ss
 import numpy as np
 from scipy.ndimage import median_filter
 from scipy.ndimage import binary_dilation
@@ -56,20 +57,12 @@ class RemoveAllRings(Plugin, CpuPlugin):
         in_pData[0].plugin_data_setup('SINOGRAM', 'single')
         out_pData[0].plugin_data_setup('SINOGRAM', 'single')
 
-    def remove_stripe_based_sorting(self, matindex, sinogram, size):
+    def remove_stripe_based_sorting(self, sinogram, size):
         """
         Algorithm 3 in the paper. Remove partial and full stripes\
         using the sorting technique.        
         """
-        sinogram = np.transpose(sinogram)
-        matcomb = np.asarray(np.dstack((matindex, sinogram)))
-        matsort = np.asarray(
-            [row[row[:, 1].argsort()] for row in matcomb])
-        matsort[:, :, 1] = median_filter(matsort[:, :, 1],(size,1))
-        matsortback = np.asarray(
-            [row[row[:, 0].argsort()] for row in matsort])
-        sino_corrected = matsortback[:, :, 1]
-        return np.transpose(sino_corrected)
+        return ss.remove_stripe_based_sorting(sinogram, size)
 
     def detect_stripe(self, listdata, snr):
         """
@@ -100,7 +93,7 @@ class RemoveAllRings(Plugin, CpuPlugin):
             listmask[listdata <= lower_thresh] = 1.0
         return listmask
     
-    def remove_large_stripe(self, matindex, sinogram, snr, size):
+    def remove_large_stripe(self, sinogram, snr, size):
         """
         Algorithm 5 in the paper. Use to remove large stripes
         ---------
@@ -123,14 +116,8 @@ class RemoveAllRings(Plugin, CpuPlugin):
         listmask = binary_dilation(listmask, iterations=1).astype(listmask.dtype)
         matfact = np.tile(listfact,(nrow,1))
         sinogram = sinogram / matfact
-        sinogram1 = np.transpose(sinogram)
-        matcombine = np.asarray(np.dstack((matindex, sinogram1)))
-        matsort = np.asarray(
-            [row[row[:, 1].argsort()] for row in matcombine])
-        matsort[:, :, 1] = np.transpose(sinosmoothed)
-        matsortback = np.asarray(
-            [row[row[:, 0].argsort()] for row in matsort])
-        sino_corrected = np.transpose(matsortback[:, :, 1])
+        _, index = ss.sort_forward(sinogram, axis=0)
+        sino_corrected = ss.sort_backward(sinosmoothed, index, axis=0)
         listxmiss = np.where(listmask > 0.0)[0]
         sinogram[:, listxmiss] = sino_corrected[:, listxmiss]
         return sinogram
@@ -176,8 +163,6 @@ class RemoveAllRings(Plugin, CpuPlugin):
         sino_shape = list(in_pData[0].get_shape())
         self.width1 = sino_shape[width_dim]
         self.height1 = sino_shape[height_dim]
-        listindex = np.arange(0.0, self.height1, 1.0)
-        self.matindex = np.tile(listindex,(self.width1,1))        
         self.la_size = np.clip(np.int16(self.parameters['la_size']), 1, self.width1-1)
         self.sm_size = np.clip(np.int16(self.parameters['sm_size']), 1, self.width1-1)
         self.snr = np.clip(np.float32(self.parameters['snr']), 1.0, None)
@@ -188,10 +173,13 @@ class RemoveAllRings(Plugin, CpuPlugin):
         """
         sinogram = np.copy(data[0])        
         sinogram = self.remove_unresponsive_and_fluctuating_stripe(sinogram, self.snr, self.la_size)        
-        sinogram = self.remove_large_stripe(self.matindex, sinogram, self.snr, self.la_size)
-        sinogram = self.remove_stripe_based_sorting(self.matindex, sinogram, self.sm_size) 
+        sinogram = self.remove_large_stripe(sinogram, self.snr, self.la_size)
+        sinogram = self.remove_stripe_based_sorting(sinogram, self.sm_size) 
         return sinogram
 
+    def thread_safe(self):
+        return True
+
     def get_citation_information(self):
         cite_info = CitationInformation()
         cite_info.description = \
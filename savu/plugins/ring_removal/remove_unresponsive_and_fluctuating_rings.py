@@ -24,6 +24,7 @@ from savu.plugins.plugin import Plugin
 from savu.plugins.driver.cpu_plugin import CpuPlugin
 from savu.plugins.utils import register_plugin
 from savu.data.plugin_list import CitationInformation
+import savu.plugins.ring_removal.stripe_sorting as ss
 import numpy as np
 from scipy.ndimage import median_filter
 from scipy.ndimage import binary_dilation
@@ -83,7 +84,7 @@ class RemoveUnresponsiveAndFluctuatingRings(Plugin, CpuPlugin):
             listmask[listdata <= lower_thresh] = 1.0
         return listmask
     
-    def remove_large_stripe(self, matindex, sinogram, snr, size):
+    def remove_large_stripe(self, sinogram, snr, size):
         """
         Algorithm 5 in the paper. Use to remove residual stripes
         ---------
@@ -106,14 +107,8 @@ class RemoveUnresponsiveAndFluctuatingRings(Plugin, CpuPlugin):
         listmask = binary_dilation(listmask, iterations=1).astype(listmask.dtype)
         matfact = np.tile(listfact,(nrow,1))
         sinogram = sinogram / matfact
-        sinogram1 = np.transpose(sinogram)
-        matcombine = np.asarray(np.dstack((matindex, sinogram1)))
-        matsort = np.asarray(
-            [row[row[:, 1].argsort()] for row in matcombine])
-        matsort[:, :, 1] = np.transpose(sinosmoothed)
-        matsortback = np.asarray(
-            [row[row[:, 0].argsort()] for row in matsort])
-        sino_corrected = np.transpose(matsortback[:, :, 1])
+        _, index = ss.sort_forward(sinogram, axis=0)
+        sino_corrected = ss.sort_backward(sinosmoothed, index, axis=0)
         listxmiss = np.where(listmask > 0.0)[0]
         sinogram[:, listxmiss] = sino_corrected[:, listxmiss]
         return sinogram
@@ -127,8 +122,6 @@ class RemoveUnresponsiveAndFluctuatingRings(Plugin, CpuPlugin):
         sino_shape = list(in_pData[0].get_shape())
         self.width1 = sino_shape[width_dim]
         self.height1 = sino_shape[height_dim]
-        listindex = np.arange(0.0, self.height1, 1.0)
-        self.matindex = np.tile(listindex,(self.width1,1))        
         self.size = np.clip(np.int16(self.parameters['size']), 1, self.width1-1)
         self.snr = np.clip(np.float32(self.parameters['snr']), 1.0, None)
         
@@ -158,9 +151,12 @@ class RemoveUnresponsiveAndFluctuatingRings(Plugin, CpuPlugin):
             matzmiss = finter(listxmiss, listy)
             sinogram[:, listxmiss] = matzmiss
         # Use algorithm 5 to remove residual stripes
-        sinogram = self.remove_large_stripe(self.matindex, sinogram, self.snr, self.size) 
+        sinogram = self.remove_large_stripe(sinogram, self.snr, self.size) 
         return sinogram
 
+    def thread_safe(self):
+        return True
+
     def get_citation_information(self):
         cite_info = CitationInformation()
         cite_info.description = \
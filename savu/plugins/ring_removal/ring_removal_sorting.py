@@ -24,8 +24,8 @@ from savu.plugins.plugin import Plugin
 from savu.plugins.driver.cpu_plugin import CpuPlugin
 from savu.plugins.utils import register_plugin
 from savu.data.plugin_list import CitationInformation
+import savu.plugins.ring_removal.stripe_sorting as ss
 import numpy as np
-from scipy.ndimage import median_filter
 
 
 @register_plugin
@@ -49,8 +49,8 @@ class RingRemovalSorting(Plugin, CpuPlugin):
         in_dataset, out_dataset = self.get_datasets()
         out_dataset[0].create_dataset(in_dataset[0])
         in_pData, out_pData = self.get_plugin_datasets()
-        in_pData[0].plugin_data_setup('SINOGRAM', 'single')
-        out_pData[0].plugin_data_setup('SINOGRAM', 'single')
+        in_pData[0].plugin_data_setup('SINOGRAM', 'multiple')
+        out_pData[0].plugin_data_setup('SINOGRAM', 'multiple')
 
     def pre_process(self):
         in_pData = self.get_plugin_in_datasets()
@@ -61,19 +61,17 @@ class RingRemovalSorting(Plugin, CpuPlugin):
         sino_shape = list(in_pData[0].get_shape())
         self.width1 = sino_shape[width_dim]
         self.height1 = sino_shape[height_dim]
-        listindex = np.arange(0.0, self.height1, 1.0)
-        self.matindex = np.tile(listindex,(self.width1,1))        
+        self.width_dim = width_dim
+        self.height_dim = height_dim
 
     def process_frames(self, data):
-        sinogram = np.transpose(np.copy(data[0]))
+        # all the sinograms passed in are processed together
         size = np.clip(np.int16(self.parameters['size']), 1, self.width1-1)
-        matcomb = np.asarray(np.dstack((self.matindex, sinogram)))
-        matsort = np.asarray([row[row[:, 1].argsort()] for row in matcomb])
-        matsort[:, :, 1] = median_filter(matsort[:, :, 1],(size,1))
-        matsortback = np.asarray(
-            [row[row[:, 0].argsort()] for row in matsort])
-        sino_corrected = matsortback[:, :, 1]
-        return np.transpose(sino_corrected)
+        return ss.remove_stripe_based_sorting(
+            data[0], size, angle_dim=self.height_dim, det_dim=self.width_dim)
+
+    def thread_safe(self):
+        return True
 
     def get_citation_information(self):
         cite_info = CitationInformation()
@@ -24,7 +24,7 @@
 
 import logging
 import numpy as np
-import pyfftw.interfaces.numpy_fft as fft
+import savu.core.fft_service as fft
 import pywt
 
 from savu.plugins.filters.base_filter import BaseFilter
@@ -91,7 +91,7 @@ class RingRemovalWaveletfft(BaseFilter, CpuPlugin):
              # FFT transform of horizontal frequency bands.
             for j in range(self.level):
                  # FFT
-                fcV = np.fft.fftshift(np.fft.fft2(cV[j]))
+                fcV = fft.fftshift(fft.fft2(cV[j]))
                 my, mx = fcV.shape
                 # Damping of ring artifact information.
                 y_hat = (np.arange(-my, my, 2, dtype='float') + 1) / 2
@@ -99,7 +99,7 @@ class RingRemovalWaveletfft(BaseFilter, CpuPlugin):
                 fcV = np.multiply(fcV, np.transpose(np.tile(damp, (mx, 1))))
     
                  # Inverse FFT.
-                cV[j] = np.real(np.fft.ifft2(np.fft.ifftshift(fcV)))
+                cV[j] = np.real(fft.ifft2(fft.ifftshift(fcV)))
             # Wavelet reconstruction.
             for j in range(self.level)[::-1]:
                 sino = sino[0:cH[j].shape[0], 0:cH[j].shape[1]]
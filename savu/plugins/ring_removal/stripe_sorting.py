@@ -0,0 +1,84 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: stripe_sorting
+   :platform: Unix
+   :synopsis: Vectorised sorting functions shared by the sorting-based ring \
+       removal plugins.
+
+.. moduleauthor:: Nghia Vo <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import numpy as np
+from scipy.ndimage import median_filter
+
+
+def sort_forward(sinogram, axis=0):
+    """
+    Sort the intensities of each detector pixel (along the rotation angle
+    axis) of one or more sinograms.
+
+    :param ndarray sinogram: The sinogram(s).
+    :param int axis: The rotation angle axis.
+    :returns: The sorted sinogram(s) and the sort indices.
+    :rtype: tuple(ndarray, ndarray)
+    """
+    index = np.argsort(sinogram, axis=axis)
+    return sinogram[_along_axis(index, axis)], index
+
+
+def sort_backward(sorted_sino, index, axis=0):
+    """
+    Return sorted sinogram(s) to the original order (the inverse of
+    sort_forward).
+
+    :param ndarray sorted_sino: The sorted sinogram(s).
+    :param ndarray index: The sort indices returned by sort_forward.
+    :param int axis: The rotation angle axis.
+    :returns: The sinogram(s) in the original order.
+    :rtype: ndarray
+    """
+    sinogram = np.empty_like(sorted_sino)
+    sinogram[_along_axis(index, axis)] = sorted_sino
+    return sinogram
+
+
+def _along_axis(index, axis):
+    """ Convert indices along one axis (e.g. from argsort) to a fancy index
+    into the whole array (as np.take_along_axis, which requires numpy 1.15).
+    """
+    grid = list(np.ix_(*[np.arange(n) for n in index.shape]))
+    grid[axis] = index
+    return tuple(grid)
+
+
+def remove_stripe_based_sorting(sinogram, size, angle_dim=0, det_dim=1):
+    """
+    Algorithm 3 in the paper. Remove partial and full stripes using the
+    sorting technique, for one or more sinograms.
+
+    :param ndarray sinogram: The sinogram(s).
+    :param int size: Window size of the median filter.
+    :param int angle_dim: The rotation angle axis.
+    :param int det_dim: The detector x axis.
+    :returns: The stripe-removed sinogram(s).
+    :rtype: ndarray
+    """
+    sino_sort, index = sort_forward(sinogram, axis=angle_dim)
+    window = [1]*sinogram.ndim
+    window[det_dim] = size
+    sino_sort = median_filter(sino_sort, tuple(window))
+    return sort_backward(sino_sort, index, axis=angle_dim)
@@ -23,6 +23,7 @@
 
 from mpi4py import MPI
 import os
+import numpy as np
 
 from savu.plugins.savers.base_saver import BaseSaver
 from savu.plugins.utils import register_plugin
@@ -61,6 +62,32 @@ class BaseImageSaver(BaseSaver, CpuPlugin):
     def setup(self):
         super(BaseImageSaver, self).setup()
         in_pData = self.get_plugin_in_datasets()[0]
-        if in_pData.get_total_frames() > self.max_files:
+        if self.get_nFiles(in_pData.get_total_frames()) > self.max_files:
             emsg = "Sorry, your data is too big to use an image saver."
             raise Exception(emsg)
+
+    def get_nFiles(self, nFrames):
+        """ The number of files the saver will create.
+
+        :params int nFrames: The total number of frames to save.
+        """
+        return nFrames
+
+    def _get_min_and_max(self):
+        """ The global range of the data from the dataset statistics, or
+        'image' if no statistics have been calculated. """
+        data = self.get_in_datasets()[0]
+        pattern = self.parameters['pattern']
+        try:
+            stats = data.meta_data.get(['stats', 'global'])
+            self._data_range = (stats['min'], stats['max'])
+            return self._data_range
+        except KeyError:
+            pass
+        try:
+            the_min = np.min(data.meta_data.get(['stats', 'min', pattern]))
+            the_max = np.max(data.meta_data.get(['stats', 'max', pattern]))
+            self._data_range = (the_min, the_max)
+        except KeyError:
+            self._data_range = 'image'
+        return self._data_range
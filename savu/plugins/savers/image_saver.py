@@ -23,7 +23,6 @@
 
 import skimage.exposure
 import skimage.io
-import numpy as np
 
 from savu.plugins.savers.base_image_saver import BaseImageSaver
 from savu.plugins.utils import register_plugin
@@ -33,8 +32,8 @@ from savu.plugins.driver.cpu_plugin import CpuPlugin
 @register_plugin
 class ImageSaver(BaseImageSaver, CpuPlugin):
     """
-    A class to save tomography data to image files.  Run the MaxAndMin plugin\
-    before this to rescale the data.
+    A class to save tomography data to image files.  Run the Statistics (or \
+    MinAndMax) plugin before this to rescale the data.
 
     :param pattern: How to slice the data. Default: 'VOLUME_XZ'.
     :param format: Image format. Default: 'jpeg'.
@@ -67,20 +66,9 @@ class ImageSaver(BaseImageSaver, CpuPlugin):
 
         self.count += 1
 
-    def _get_min_and_max(self):
-        data = self.get_in_datasets()[0]
-        pattern = self.parameters['pattern']
-        try:
-            the_min = np.min(data.meta_data.get(['stats', 'min', pattern]))
-            the_max = np.max(data.meta_data.get(['stats', 'max', pattern]))
-            self._data_range = (the_min, the_max)
-        except KeyError:
-            self._data_range = 'image'
-        return self._data_range
-        
     def executive_summary(self):
         if self._data_range == 'image':
             return ["To rescale and normalise the data between global max and "
-                    "min values, please run MaxAndMin plugin before "
-                    "ImageSaver."]
+                    "min values, please run the Statistics or MinAndMax plugin "
+                    "before ImageSaver."]
         return ["Nothing to Report"]
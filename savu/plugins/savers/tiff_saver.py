@@ -21,19 +21,34 @@
 
 """
 
-import tifffile as tf
+import numpy as np
 
+import savu.core.utils as cu
 from savu.plugins.savers.base_image_saver import BaseImageSaver
+from savu.plugins.savers.utils.tiff_utils import TiffWriterPool
 from savu.plugins.utils import register_plugin
 from savu.plugins.driver.cpu_plugin import CpuPlugin
 
+BIT_DEPTHS = {8: np.uint8, 16: np.uint16}
+
 
 @register_plugin
 class TiffSaver(BaseImageSaver, CpuPlugin):
     """
-    A class to save tomography data to tiff files
+    A class to save tomography data to tiff files.  The files are encoded and \
+    written in background threads, so the processing is not held up.
     :param pattern: How to slice the data. Default: 'VOLUME_XZ'.
     :param prefix: Override the default output tiff file prefix. Default: None.
+    :param mode: How to group the frames into files: 'slice' (one tiff per \
+        frame), 'chunk' (multi-page BigTIFF stacks of chunk_size frames) or \
+        'stack' (one multi-page BigTIFF stack per process). Default: 'slice'.
+    :param chunk_size: The number of frames in each file in 'chunk' \
+        mode. Default: 100.
+    :param compression: The zlib compression level, from 0 (no compression) \
+        to 9. Default: 0.
+    :param bit_depth: Rescale the data to 8 or 16 bit unsigned integers, \
+        using the global range from the Statistics (or MinAndMax) plugin. \
+        Default: None.
 
     :config_warn: Do not use this plugin if the raw data is greater than \
     100 GB.
@@ -41,9 +56,64 @@ class TiffSaver(BaseImageSaver, CpuPlugin):
 
     def __init__(self, name='TiffSaver'):
         super(TiffSaver, self).__init__(name)
+        self.writer = None
+        self.fname = None
+        self._data_range = None
+
+    def pre_process(self):
+        super(TiffSaver, self).pre_process()
+        if self.parameters['bit_depth'] and \
+                self.parameters['bit_depth'] not in BIT_DEPTHS.keys():
+            raise Exception("The bit_depth should be 8 or 16.")
+        if self.parameters['bit_depth']:
+            self._get_min_and_max()
+        threads = cu.get_threads_per_process(self.exp)
+        self.writer = TiffWriterPool(
+            threads, 2*threads, bigtiff=self.parameters['mode'] != 'slice',
+            compress=self.parameters['compression'])
+        self.fname = None
 
     def process_frames(self, data):
         frame = self.get_global_frame_index()[self.count]
-        filename = '%s%05i.tiff' % (self.filename, frame)
-        tf.imsave(filename, data[0])
+        mode = self.parameters['mode']
+        if mode == 'slice' or self.fname is None or \
+                (mode == 'chunk' and
+                 not self.count % self.parameters['chunk_size']):
+            if self.fname:
+                self.writer.close(self.fname)
+            self.fname = '%s%05i.tiff' % (self.filename, frame)
+        self.writer.add_page(self.fname, self.__get_page(data[0]))
+        if mode == 'slice':
+            self.writer.close(self.fname)
         self.count += 1
+
+    def __get_page(self, data):
+        """ A copy of the frame (as the writer threads hold on to it),
+        rescaled to the requested bit depth. """
+        if not self.parameters['bit_depth']:
+            return np.array(data)
+        dtype = BIT_DEPTHS[self.parameters['bit_depth']]
+        the_min, the_max = (np.min(data), np.max(data)) if \
+            self._data_range == 'image' else self._data_range
+        scale = np.iinfo(dtype).max/float(max(the_max - the_min, 1e-20))
+        page = np.clip((data - the_min)*scale, 0, np.iinfo(dtype).max)
+        return np.rint(page).astype(dtype)
+
+    def post_process(self):
+        self.writer.finish()
+
+    def get_nFiles(self, nFrames):
+        nProcs = len(self.exp.meta_data.get('processes'))
+        if self.parameters['mode'] == 'stack':
+            return nProcs
+        if self.parameters['mode'] == 'chunk':
+            return int(np.ceil(nFrames/float(self.parameters['chunk_size']))) \
+                + nProcs
+        return nFrames
+
+    def executive_summary(self):
+        if self._data_range == 'image':
+            return ["To rescale the data to %i bits between the global max "
+                    "and min values, please run the Statistics or MinAndMax "
+                    "plugin before TiffSaver." % self.parameters['bit_depth']]
+        return ["Nothing to Report"]
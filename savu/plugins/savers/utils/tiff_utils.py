@@ -0,0 +1,110 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: tiff_utils
+   :platform: Unix
+   :synopsis: A class to encode and write (single or multi-page) tiff files \
+       in a pool of background threads.
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import threading
+import collections
+import tifffile as tf
+from multiprocessing.pool import ThreadPool
+
+
+class _TiffFile(object):
+    """ The pages waiting to be written to a tiff file. """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pages = collections.deque()
+        self.writer = None
+
+
+class TiffWriterPool(object):
+    """ Encodes and writes tiff files in a pool of background threads.  The
+    pages of a file are written in the order they were added, and different
+    files are written concurrently.  At most max_pending pages are held in
+    memory: add_page blocks until a writer thread is free.
+
+    :param int nThreads: The number of writer threads.
+    :param int max_pending: The maximum number of pages waiting to be written.
+    :param bool bigtiff: Write BigTIFF files (for files larger than 4 GB).
+    :param int compress: The zlib compression level (0 for none).
+    """
+
+    def __init__(self, nThreads, max_pending, bigtiff=False, compress=0):
+        self.bigtiff = bigtiff
+        self.compress = compress
+        self.pool = ThreadPool(nThreads)
+        self.pending = threading.BoundedSemaphore(max_pending)
+        self.files = {}
+        self.error = None
+
+    def add_page(self, fname, page):
+        """ Add a page to the end of a file (the page must not be modified
+        after it has been added).
+
+        :params str fname: The file name.
+        :params ndarray page: The image to write.
+        """
+        self.pending.acquire()
+        self.__submit(fname, page)
+
+    def close(self, fname):
+        """ Close a file, after its pages have been written. """
+        self.pending.acquire()
+        self.__submit(fname, None)
+        del self.files[fname]
+
+    def finish(self):
+        """ Close all the files, wait for the writer threads to finish and
+        raise any error that occurred while writing. """
+        for fname in self.files.keys():
+            self.close(fname)
+        self.pool.close()
+        self.pool.join()
+        if self.error:
+            raise self.error
+
+    def __submit(self, fname, page):
+        if fname not in self.files:
+            self.files[fname] = _TiffFile()
+        tiff = self.files[fname]
+        tiff.pages.append(page)
+        self.pool.apply_async(self.__write, (fname, tiff))
+
+    def __write(self, fname, tiff):
+        # each task writes the oldest page, so the pages are written in order
+        try:
+            with tiff.lock:
+                page = tiff.pages.popleft()
+                if page is None:
+                    if tiff.writer:
+                        tiff.writer.close()
+                    return
+                if self.error:
+                    return
+                if tiff.writer is None:
+                    tiff.writer = tf.TiffWriter(fname, bigtiff=self.bigtiff)
+                tiff.writer.save(page, compress=self.compress)
+        except Exception as e:
+            self.error = self.error if self.error else e
+        finally:
+            self.pending.release()
@@ -32,43 +32,31 @@ class MinAndMax(Plugin, CpuPlugin):
     by the pattern parameter)
 
     :u*param pattern: How to slice the data. Default: 'VOLUME_XZ'.
-    :param out_datasets: The default names. Default: ['the_min','the_max'].
+    :*param out_datasets: Hidden, dummy out_datasets entry. Default: [].
     """
 
     def __init__(self):
         super(MinAndMax, self).__init__("MinAndMax")
 
     def process_frames(self, data):
-        return [np.array([np.min(data[0])]), np.array([np.max(data[0])])]
+        return [np.min(data[0]), np.max(data[0])]
 
     def post_process(self):
-        # do some curve fitting here
-        in_datasets, out_datasets = self.get_datasets()
-        the_min = np.squeeze(out_datasets[0].data[...])
-        the_max = np.squeeze(out_datasets[1].data[...])
+        in_datasets = self.get_in_datasets()
         pattern = self._get_pattern()
-        in_datasets[0].meta_data.set(['stats', 'min', pattern], the_min)
-        in_datasets[0].meta_data.set(['stats', 'max', pattern], the_max)
+        in_datasets[0].meta_data.set(['stats', 'min', pattern],
+                                     self.get_frame_metadata('min'))
+        in_datasets[0].meta_data.set(['stats', 'max', pattern],
+                                     self.get_frame_metadata('max'))
 
     def setup(self):
-        in_dataset, out_datasets = self.get_datasets()
-        in_pData, out_pData = self.get_plugin_datasets()
+        in_pData = self.get_plugin_in_datasets()
         in_pData[0].plugin_data_setup(self._get_pattern(), 'single')
-
-        slice_dirs = list(in_dataset[0].get_slice_dimensions())
-        orig_shape = in_dataset[0].get_shape()
-        new_shape = (np.prod(np.array(orig_shape)[slice_dirs]), 1)
-
-        labels = ['x.pixels', 'y.pixels']
-        for i in range(len(out_datasets)):
-            out_datasets[i].create_dataset(shape=new_shape, axis_labels=labels,
-                        remove=True, transport='hdf5')
-            out_datasets[i].add_pattern(
-                    "METADATA", core_dims=(1,), slice_dims=(0,))
-            out_pData[i].plugin_data_setup('METADATA', 'single')
+        self.create_frame_metadata('min')
+        self.create_frame_metadata('max')
 
     def _get_pattern(self):
         return self.parameters['pattern']
-        
+
     def nOutput_datasets(self):
-        return 2
+        return 0
@@ -0,0 +1,66 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+.. module:: statistics
+   :platform: Unix
+   :synopsis: A plugin to calculate the global statistics of a dataset in a \
+       single pass.
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+from savu.plugins.plugin import Plugin
+from savu.plugins.utils import register_plugin
+from savu.plugins.driver.cpu_plugin import CpuPlugin
+from savu.plugins.stats.stats_utils import StatsAccumulator
+
+
+@register_plugin
+class Statistics(Plugin, CpuPlugin):
+    """
+    A plugin to calculate the global min, max, mean, variance, standard \
+    deviation, NaN and Inf counts, percentiles and histogram of a dataset in \
+    a single pass.  The results are combined across all processes and added \
+    to the dataset meta data under ['stats', 'global'], without creating an \
+    output dataset.
+
+    :u*param pattern: How to slice the data. Default: 'VOLUME_XZ'.
+    :param percentiles: The percentiles to calculate. Default: [1, 50, 99].
+    :param bins: The number of histogram bins. Default: 256.
+    :*param out_datasets: Hidden, dummy out_datasets entry. Default: [].
+    """
+
+    def __init__(self):
+        super(Statistics, self).__init__("Statistics")
+
+    def setup(self):
+        in_pData = self.get_plugin_in_datasets()
+        in_pData[0].plugin_data_setup(self.parameters['pattern'], 'multiple')
+
+    def pre_process(self):
+        self.stats = StatsAccumulator(percentiles=self.parameters['percentiles'],
+                                      bins=self.parameters['bins'])
+
+    def process_frames(self, data):
+        self.stats.update(data[0])
+
+    def post_process(self):
+        self.stats.reduce(self.get_communicator())
+        in_meta_data = self.get_in_meta_data()[0]
+        in_meta_data.set(['stats', 'global'], self.stats.get_dictionary())
+
+    def nInput_datasets(self):
+        return 1
+
+    def nOutput_datasets(self):
+        return 0
@@ -0,0 +1,193 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+.. module:: stats_utils
+   :platform: Unix
+   :synopsis: A streaming statistics accumulator, which gathers the global \
+       statistics of a dataset in a single pass and combines the partial \
+       results from all processes.
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+import numpy as np
+from mpi4py import MPI
+
+# the number of bins in the internal histogram (used for the percentiles)
+NBINS = 2**16
+# limits the bin index (value/bin width) to the range of an int64
+MIN_RELATIVE_WIDTH = 2.0**-40
+# the smallest bin width (so the bin index of float32 data is finite)
+MIN_WIDTH = 2.0**-100
+
+
+def _get_grid(lo, hi, k=None):
+    """ Find the internal histogram grid that covers the range [lo, hi].  The
+    bin width is a power of two, 2**k, and the bin edges are multiples of the
+    width, so grids from different frames and processes can be combined
+    exactly by merging neighbouring bins.
+
+    :params float lo: The minimum value.
+    :params float hi: The maximum value.
+    :params int k: The smallest exponent allowed (or None).
+    :returns: The width exponent and the index of the first bin.
+    :rtype: tuple(int, int)
+    """
+    width = max((hi - lo)/float(NBINS),
+                max(abs(lo), abs(hi))*MIN_RELATIVE_WIDTH, MIN_WIDTH)
+    k_min = int(np.ceil(np.log2(width)))
+    k = k_min if k is None else max(k_min, k)
+    while True:
+        start = int(np.floor(lo/2.0**k))
+        if hi < (start + NBINS)*2.0**k:
+            return k, start
+        k += 1
+
+
+def _regrid(hist, k, start, new_k, new_start):
+    """ Move the counts of an internal histogram to a coarser grid. """
+    index = (start + np.arange(NBINS, dtype=np.int64)) >> (new_k - k)
+    return np.bincount(index - new_start, weights=hist,
+                       minlength=NBINS).astype(np.int64)
+
+
+class StatsAccumulator(object):
+    """ Accumulates the min, max, mean, variance, NaN and Inf counts and a
+    histogram of the finite values of a dataset, one frame (or stack of
+    frames) at a time.  The histogram grid grows to fit the data, so no prior
+    knowledge of the data range is required, and the percentiles are
+    interpolated from it (to within one bin, at most 1/16384 of the data
+    range, of the value at that rank).
+
+    :param list(float) percentiles: The percentiles to calculate.
+    :param int bins: The number of bins in the output histogram.
+    """
+
+    def __init__(self, percentiles=None, bins=256):
+        self.percentiles = percentiles if percentiles else []
+        self.bins = bins
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.nan_count = 0
+        self.inf_count = 0
+        self.k = None
+        self.start = 0
+        self.hist = np.zeros(NBINS, dtype=np.int64)
+
+    def update(self, data):
+        """ Add an array of values to the statistics. """
+        data = np.asarray(data)
+        finite = np.isfinite(data)
+        nFinite = np.count_nonzero(finite)
+        if nFinite != data.size:
+            nans = np.count_nonzero(np.isnan(data))
+            self.nan_count += nans
+            self.inf_count += data.size - nFinite - nans
+            data = data[finite]
+        if not data.size:
+            return
+
+        lo, hi = float(np.min(data)), float(np.max(data))
+        mean = np.mean(data, dtype=np.float64)
+        m2 = float(np.sum(np.square(data - mean, dtype=np.float64)))
+        self.__merge_moments(data.size, float(mean), m2, lo, hi)
+
+        self.__set_grid(*_get_grid(self.min, self.max, self.k))
+        index = np.floor(data*2.0**-self.k).astype(np.int64) - self.start
+        self.hist += np.bincount(index.ravel(), minlength=NBINS)
+
+    def __merge_moments(self, count, mean, m2, lo, hi):
+        """ Combine the count, mean and sum of squared differences (Chan et
+        al.) of two sets of values. """
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta*count/float(total)
+        self.m2 += m2 + delta**2*self.count*count/float(total)
+        self.count = total
+        self.min = min(self.min, lo)
+        self.max = max(self.max, hi)
+
+    def __set_grid(self, k, start):
+        if self.k is not None and (k, start) != (self.k, self.start):
+            self.hist = _regrid(self.hist, self.k, self.start, k, start)
+        self.k, self.start = k, start
+
+    def reduce(self, comm=MPI.COMM_WORLD):
+        """ Combine the statistics from all processes in a communicator, so
+        that every process holds the global statistics. """
+        if comm is None or comm == MPI.COMM_NULL or comm.size == 1:
+            return
+        states = comm.allgather((self.count, self.mean, self.m2, self.min,
+                                 self.max, self.nan_count, self.inf_count,
+                                 self.k))
+        count, mean, m2 = self.count, self.mean, self.m2
+        self.count, self.mean, self.m2 = 0, 0.0, 0.0
+        self.nan_count = self.inf_count = 0
+        for c, mu, s, lo, hi, nans, infs, k in states:
+            self.nan_count += nans
+            self.inf_count += infs
+            if c:
+                self.__merge_moments(c, mu, s, lo, hi)
+
+        if not self.count:
+            return
+        ks = [s[-1] for s in states if s[-1] is not None]
+        grid = _get_grid(self.min, self.max, max(ks))
+        if count:
+            self.__set_grid(*grid)
+        else:
+            self.k, self.start = grid
+        comm.Allreduce(MPI.IN_PLACE, self.hist, op=MPI.SUM)
+
+    def get_percentiles(self):
+        """ Interpolate the percentiles from the cumulative histogram. """
+        if not self.count:
+            return np.full(len(self.percentiles), np.nan)
+        cdf = np.concatenate([[0], np.cumsum(self.hist)])/float(self.count)
+        edges = (self.start + np.arange(NBINS + 1))*2.0**self.k
+        values = np.interp(np.array(self.percentiles)/100.0, cdf, edges)
+        return np.clip(values, self.min, self.max)
+
+    def get_histogram(self):
+        """ The histogram of the finite values, with 'bins' equal bins between
+        the min and max values (each internal bin is assigned by its centre).
+
+        :returns: The counts and the bin edges.
+        :rtype: tuple(ndarray, ndarray)
+        """
+        if not self.count:
+            return np.zeros(self.bins, dtype=np.int64), \
+                np.linspace(0, 1, self.bins + 1)
+        lo, hi = self.min, self.max if self.max > self.min else self.min + 1
+        edges = np.linspace(lo, hi, self.bins + 1)
+        centres = (self.start + np.arange(NBINS) + 0.5)*2.0**self.k
+        index = np.clip(((centres - lo)/(hi - lo)*self.bins).astype(int),
+                        0, self.bins - 1)
+        counts = np.bincount(index, weights=self.hist, minlength=self.bins)
+        return counts.astype(np.int64), edges
+
+    def get_dictionary(self):
+        """ The statistics as a dictionary (for the dataset meta data). """
+        var = self.m2/self.count if self.count else np.nan
+        hist, edges = self.get_histogram()
+        return {'min': self.min if self.count else np.nan,
+                'max': self.max if self.count else np.nan,
+                'mean': self.mean if self.count else np.nan,
+                'var': var, 'std': np.sqrt(var), 'count': self.count,
+                'nan_count': self.nan_count, 'inf_count': self.inf_count,
+                'percentiles': np.array(self.percentiles, dtype=np.float64),
+                'percentile_values': self.get_percentiles(),
+                'histogram': hist, 'histogram_edges': edges}
@@ -0,0 +1,106 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: chunked_transport_test
+   :platform: Unix
+   :synopsis: unittest test class for storing intermediate datasets as \
+       directories of chunk files
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+import os
+import glob
+import shutil
+import tempfile
+import unittest
+import h5py
+import numpy as np
+
+import savu.test.test_utils as tu
+from savu.core.plugin_runner import PluginRunner
+from savu.data.chunked_directory import ChunkedDirectory
+
+
+class ChunkedTransportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_chunked_directory(self):
+        array = np.random.rand(7, 5, 6).astype(np.float32)
+        for fmt in ['raw', 'npy']:
+            path = os.path.join(self.folder, fmt)
+            data = ChunkedDirectory(path, array.shape, array.dtype,
+                                    chunks=(3, 2, 4), chunk_format=fmt)
+            # regions that are not aligned with the chunks
+            data[0:4] = array[0:4]
+            data[4:7, :, 1:6] = array[4:7, :, 1:6]
+            expected = array.copy()
+            expected[4:7, :, 0] = 0  # unwritten entries are zero
+
+            data = ChunkedDirectory.open(path)
+            self.assertEqual(data.chunks, (3, 2, 4))
+            np.testing.assert_array_equal(data[...], expected)
+            np.testing.assert_array_equal(data[-1], expected[-1])
+            np.testing.assert_array_equal(
+                data[1:6:2, [4, 0, 2], 3], expected[1:6:2][:, [4, 0, 2], 3])
+            self.assertEqual(len(os.listdir(path)), 1 + 3*3*2)
+            if fmt == 'npy':
+                chunk = np.load(os.path.join(path, '2.2.1'))
+                np.testing.assert_array_equal(chunk[0, 0, :2],
+                                              expected[6, 4, 4:])
+
+    def __run(self, transport):
+        np.random.seed(0)
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        options['transport'] = transport
+        plugins = ['savu.plugins.filters.median_filter',
+                   'savu.plugins.filters.threshold_filter']
+        # the median filter output is replaced, so it is an intermediate
+        # dataset
+        params = [{'size': (20, 10, 12)}, {},
+                  {'intensity_threshold': 5}, {}]
+        tu.set_plugin_list(options, plugins, params)
+        PluginRunner(options)._run_plugin_list()
+
+        results, self.chunked = {}, []
+        out_path = options['out_path']
+        for name in ['tomo_p1', 'tomo_p2']:
+            path = glob.glob(os.path.join(out_path, '*', name + '*')) + \
+                glob.glob(os.path.join(out_path, name + '*'))
+            if os.path.isdir(path[0]):
+                self.chunked.append(name)
+                results[name] = ChunkedDirectory.open(path[0])[...]
+            else:
+                with h5py.File(path[0], 'r') as f:
+                    results[name] = f[f.keys()[0] + '/data'][...]
+        shutil.rmtree(out_path)
+        return results
+
+    def test_chunked_transport(self):
+        hdf5 = self.__run('hdf5')
+        chunked = self.__run('chunked')
+        # the final result is still written to hdf5
+        self.assertEqual(self.chunked, ['tomo_p1'])
+        for name in hdf5.keys():
+            np.testing.assert_array_equal(hdf5[name], chunked[name])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,6 +22,7 @@
 """
 
 import unittest
+import numpy as np
 
 import savu.test.test_utils as tu
 from savu.core.plugin_runner import PluginRunner
@@ -41,5 +42,23 @@ class Test(unittest.TestCase):
         self.assertEqual(exp.index['in_data'][out_data_name].get_shape(),
                          (91, 68, 80))
 
+    def test_cached_dark_and_flat_means(self):
+        loader = "full_field_loaders.random_3d_tomo_loader"
+        params = {'size': (20, 5, 6)}
+        data, pData = tu.get_data_object(tu.load_random_data(loader, params))
+        dtype = data.data
+
+        dark = dtype.dark_mean()
+        self.assertEqual(dark.shape, (5, 6))
+        self.assertTrue(np.all(dark == 0))
+        self.assertTrue(dtype.dark_mean() is dark)
+
+        dtype.update_dark(np.ones((2, 5, 6))*2)
+        self.assertTrue(np.all(dtype.dark_mean() == 2))
+
+        flat = dtype.flat_batch_means()
+        self.assertEqual(flat.shape, (1, 5, 6))
+        self.assertTrue(np.all(flat == 1))
+
 if __name__ == "__main__":
     unittest.main()
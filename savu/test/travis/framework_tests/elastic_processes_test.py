@@ -0,0 +1,145 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: elastic_processes_test
+   :platform: Unix
+   :synopsis: unittest test class for choosing the number of processes that \
+       run each CPU plugin
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+import os
+import sys
+import json
+import h5py
+import tempfile
+import unittest
+import subprocess
+import numpy as np
+from distutils.spawn import find_executable
+
+import savu.test.test_utils as tu
+from savu.plugins.stats.statistics import Statistics
+from savu.test.travis.framework_tests.plugin_runner_test import \
+    run_protected_plugin_runner_no_process_list
+
+
+class ElasticProcessesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ranks = {}
+        self._get_ranks = Statistics._get_ranks
+        ranks = self.ranks
+        _get_ranks = self._get_ranks
+
+        def _get_ranks_wrapper(plugin, nProcs):
+            pData = plugin.get_plugin_in_datasets()[0]
+            ranks['blocks'] = int(np.ceil(
+                pData.meta_data.get('total_frames') /
+                float(pData._get_max_frames_transfer())))
+            for n in [4, 64]:
+                ranks[n] = _get_ranks(plugin, n)
+            return _get_ranks(plugin, nProcs)
+        Statistics._get_ranks = _get_ranks_wrapper
+
+    def tearDown(self):
+        Statistics._get_ranks = self._get_ranks
+        if 'min_max_cpus' in Statistics.__dict__:
+            del Statistics.min_max_cpus
+
+    def __run(self):
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        plugin = 'savu.plugins.stats.statistics'
+        params = dict(tu.set_data_dict(['tomo'], []), pattern='PROJECTION')
+        return run_protected_plugin_runner_no_process_list(
+            options, plugin, data=[{'size': (20, 10, 12)}, params, {}])
+
+    def test_ranks_limited_by_blocks(self):
+        exp = self.__run()
+        self.assertEqual(exp.meta_data.get('processes'), ['CPU0'])
+        blocks = self.ranks['blocks']
+        self.assertEqual(len(self.ranks[64]), min(blocks, 64))
+        self.assertEqual(len(self.ranks[4]), min(blocks, 4))
+        self.assertEqual(self.ranks[64][0], 0)
+        self.assertEqual(len(set(self.ranks[64])), len(self.ranks[64]))
+
+    def test_ranks_limited_by_bounds(self):
+        Statistics.min_max_cpus = lambda plugin: [None, 1]
+        self.__run()
+        self.assertEqual(self.ranks[64], [0])
+        Statistics.min_max_cpus = lambda plugin: [40, None]
+        self.__run()
+        self.assertEqual(self.ranks[4], [0, 1, 2, 3])
+        self.assertEqual(len(self.ranks[64]), 40)
+        self.assertEqual(self.ranks[64][:3], [0, 1, 3])
+
+    @unittest.skipUnless(h5py.get_config().mpi and find_executable('mpirun'),
+                         "requires mpirun and parallel hdf5")
+    def test_reduced_ranks_share_state(self):
+        # VoCentering only runs on one process, but the reconstruction on
+        # every process must use the centre of rotation it calculated
+        out_path = tempfile.mkdtemp()
+        cmd = ['mpirun', '-np', '2', sys.executable, '-c',
+               'from %s import _run_vo_centering_recon; '
+               '_run_vo_centering_recon("%s")' % (__name__, out_path)]
+        if os.geteuid() == 0:
+            cmd[1:1] = ['--allow-run-as-root']
+        subprocess.check_call(cmd)
+        with open(os.path.join(out_path, 'cors.json'), 'r') as f:
+            cors = json.load(f)
+        self.assertEqual(len(cors), 2)
+        self.assertEqual(cors[0], cors[1])
+
+
+def _run_vo_centering_recon(out_path):
+    """ Run a previewed VoCentering (populating a dataset other than its
+    input) followed by a reconstruction, and save the centre of rotation
+    used by the reconstruction on each process.  Run under mpirun.
+    """
+    from mpi4py import MPI
+    from savu.plugins.reconstructions.simple_recon import SimpleRecon
+
+    cors = []
+    set_cor = SimpleRecon.set_centre_of_rotation
+
+    def set_cor_wrapper(plugin, *args):
+        set_cor(plugin, *args)
+        cors.append(np.asarray(plugin.cor).tolist())
+    SimpleRecon.set_centre_of_rotation = set_cor_wrapper
+
+    options = tu.set_options(tu.get_test_data_path('24737.nxs'),
+                             process_names='CPU0,CPU1', out_path=out_path)
+    options['cluster'] = False
+    options['loader'] = \
+        'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+    plugins = ['savu.plugins.basic_operations.no_process_plugin',
+               'savu.plugins.centering.vo_centering',
+               'savu.plugins.reconstructions.simple_recon']
+    centering = dict(tu.set_data_dict(['tomo'], []),
+                     preview=[':', '0', ':'], datasets_to_populate=['tomo2'],
+                     search_area=(-2, 2))
+    data = [{'size': (20, 10, 12)}, tu.set_data_dict(['tomo'], ['tomo2']),
+            centering, tu.set_data_dict(['tomo2'], ['recon']), {}]
+    run_protected_plugin_runner_no_process_list(options, plugins, data=data)
+
+    cors = MPI.COMM_WORLD.gather(cors, root=0)
+    if MPI.COMM_WORLD.rank == 0:
+        with open(os.path.join(out_path, 'cors.json'), 'w') as f:
+            json.dump(cors, f)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: estimator_test
+   :platform: Unix
+   :synopsis: unittest test class for the process list cost estimator
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import savu.test.test_utils as tu
+import savu.core.estimator as est
+from savu.core.plugin_runner import PluginRunner
+
+
+class EstimatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.history = os.path.join(self.tmpdir, 'history.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def __get_plugin_runner(self):
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        plugin = 'savu.plugins.corrections.dark_flat_field_correction'
+        tu.set_plugin_list(options, plugin, [
+            {'size': (20, 10, 12)}, tu.set_data_dict(['tomo'], ['tomo']), {}])
+        runner = PluginRunner(options)
+        runner.exp.meta_data.get('system_params')['estimate_settings'] = \
+            {'throughput_history': self.history, 'memory_per_node': 1}
+        return runner
+
+    def test_estimate(self):
+        estimator = self.__get_plugin_runner()._estimate_plugin_list()
+        costs = estimator.costs[0]
+        self.assertEqual(costs['name'], 'DarkFlatFieldCorrection')
+        self.assertEqual(costs['bytes_read'], 16*10*12*4)
+        self.assertEqual(costs['bytes_written'], 16*10*12*4)
+        self.assertEqual(costs['processes'], 1)
+        self.assertEqual(costs['runtime'], None)
+        self.assertEqual(estimator.warnings, [])
+
+    def test_estimate_warnings_and_runtime(self):
+        runner = self.__get_plugin_runner()
+        costs = {'bytes_read': 16*10*12*4, 'processes': 1}
+        est.record_throughput(runner.exp, 'DarkFlatFieldCorrection', costs,
+                              2.0)
+        estimator = runner._estimate_plugin_list(nProcesses=40)
+        costs = estimator.costs[0]
+        self.assertEqual(costs['processes'], 40)
+        self.assertEqual(costs['blocks_per_process'], 1)
+        self.assertAlmostEqual(costs['runtime'], 2.0/40)
+        self.assertEqual(len(estimator.warnings), 1)
+
+    def test_history_is_opt_in(self):
+        runner = self.__get_plugin_runner()
+        del runner.exp.meta_data.get('system_params')['estimate_settings']
+        self.assertEqual(est.get_history_file(runner.exp), None)
+        costs = {'bytes_read': 16*10*12*4, 'processes': 1}
+        est.record_throughput(runner.exp, 'DarkFlatFieldCorrection', costs,
+                              2.0)
+        self.assertFalse(os.path.exists(self.history))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: fft_service_test
+   :platform: Unix
+   :synopsis: unittest test class for the shared FFT functions
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from multiprocessing.pool import ThreadPool
+
+import savu.core.fft_service as fft
+
+
+class FftServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data = np.random.rand(6, 10).astype(np.float32)
+
+    def tearDown(self):
+        fft.set_threads(1)
+
+    def test_transforms(self):
+        data = self.data
+        spectrum = np.fft.fft2(data)
+        np.testing.assert_allclose(fft.fft2(data), spectrum, atol=1e-4)
+        np.testing.assert_allclose(fft.ifft2(spectrum), data, atol=1e-4)
+        np.testing.assert_allclose(
+            fft.fft(data, n=12, axis=0), np.fft.fft(data, n=12, axis=0),
+            atol=1e-4)
+        np.testing.assert_allclose(fft.rfft2(data), np.fft.rfft2(data),
+                                   atol=1e-4)
+        np.testing.assert_allclose(fft.irfft(fft.rfft(data), n=10), data,
+                                   atol=1e-4)
+        self.assertEqual(fft.fft2(data).dtype, np.complex64)
+
+    def test_plan_cache(self):
+        fft.set_threads(2)
+        result = fft.fft2(self.data)
+        nPlans = len(fft._plans)
+        # the output of a plan is reused, so the results must be copies
+        fft.fft2(2*self.data)
+        self.assertEqual(len(fft._plans), nPlans)
+        np.testing.assert_allclose(result, np.fft.fft2(self.data), atol=1e-4)
+        fft.set_threads(1)
+        self.assertEqual(len(fft._plans), 0)
+
+    def test_plan_cache_limit(self):
+        fft.clear_plans()
+        for n in range(fft.MAX_PLANS + 4):
+            fft.fft(self.data, n=n+1)
+        self.assertEqual(len(fft._plans), fft.MAX_PLANS)
+        # the least recently used plans are freed first
+        self.assertEqual(min(k[4] for k in fft._plans.keys()),
+                         (('axis', -1), ('n', 5)))
+        fft.clear_plans()
+        self.assertEqual(len(fft._plans), 0)
+
+    def test_worker_threads(self):
+        fft.set_threads(4)
+        pool = ThreadPool(2, initializer=fft.init_worker_thread)
+        try:
+            self.assertEqual(pool.map(lambda i: fft.get_threads(), [0, 1]),
+                             [1, 1])
+            np.testing.assert_allclose(
+                pool.apply(fft.fft2, (self.data,)), np.fft.fft2(self.data),
+                atol=1e-4)
+        finally:
+            pool.close()
+        self.assertEqual(fft.get_threads(), 4)
+
+    def test_wisdom(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(tmpdir, 'wisdom', 'fftw_wisdom.json')
+            fft.fft2(self.data)
+            fft.save_wisdom(fname)
+            self.assertTrue(os.path.exists(fname))
+            fft.load_wisdom(fname)
+        finally:
+            shutil.rmtree(tmpdir)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: halo_reuse_test
+   :platform: Unix
+   :synopsis: unittest test class for padding transfer blocks in place and \
+       reusing the overlapping frames of consecutive blocks
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+import os
+import shutil
+import unittest
+import h5py
+import numpy as np
+import scipy.signal.signaltools as sig
+
+import savu.test.test_utils as tu
+import savu.data.transport_data.slice_lists as sl
+from savu.core.plugin_runner import PluginRunner
+
+
+class _Reads(object):
+    """ An array that records the slice lists it is read with. """
+
+    def __init__(self, array):
+        self.array = array
+        self.shape = array.shape
+        self.reads = []
+
+    def __getitem__(self, idx):
+        self.reads.append(idx)
+        return self.array[idx]
+
+
+class _Padding(object):
+
+    def __init__(self, pad, mode):
+        self.pad, self.mode = pad, mode
+
+    def _get_padding_directions(self):
+        return {0: {'before': self.pad, 'after': self.pad}}
+
+
+class _Data(object):
+    """ The parts of Data used by GlobalData. """
+
+    def __init__(self, array, pad, mode):
+        self.data = _Reads(array)
+        self.pData = type('PData', (object,), {})()
+        self.pData.padding = _Padding(pad, mode)
+        self.data_info = type('DataInfo', (object,), {})()
+        self.data_info.get_dictionary = lambda: {}
+
+    def _get_plugin_data(self):
+        return self.pData
+
+    def get_shape(self):
+        return self.data.shape
+
+    def get_core_dimensions(self):
+        return (1, 2)
+
+    def get_slice_dimensions(self):
+        return (0,)
+
+
+class _Transport(object):
+
+    def __init__(self, data):
+        self.data = data
+        self.pad = True
+
+
+class HaloReuseTest(unittest.TestCase):
+
+    def test_halo_reuse(self):
+        array = np.random.rand(10, 4, 5)
+        for mode in ['edge', 'reflect', 'symmetric']:
+            data = _Data(array, 2, mode)
+            gdata = sl.GlobalData('in', _Transport(data))
+            expected = np.pad(array, ((2, 2), (0, 0), (0, 0)), mode=mode)
+            for start in range(-2, 5, 3):
+                block = (slice(start, start + 7, 1), slice(0, 4, 1),
+                         slice(0, 5, 1))
+                np.testing.assert_array_equal(
+                    gdata._get_padded_data(block),
+                    expected[start + 2:start + 9])
+            # only the first block reads the overlapping frames
+            frames = [r[0] for r in data.data.reads]
+            self.assertEqual(frames[0], slice(0, 5, 1))
+            self.assertEqual(frames[1:], [slice(5, 8, 1), slice(8, 10, 1)])
+
+    def test_pad_in_place(self):
+        data = np.random.rand(6, 4, 5)
+        pad_list = [[2, 3], [0, 0], [4, 1]]
+        interior = (slice(2, 8), slice(0, 4), slice(4, 9))
+        for mode in ['edge', 'constant', 'wrap', 'symmetric', 'reflect']:
+            out = np.empty((11, 4, 10))
+            out[interior] = data
+            self.assertTrue(sl._pad_supported(
+                list(interior), pad_list, mode, (20, 20, 20)))
+            sl._pad_in_place(out, pad_list, mode)
+            np.testing.assert_array_equal(
+                out, np.pad(data, pad_list, mode=mode))
+
+        too_small = [slice(0, 2), slice(0, 4), slice(0, 5)]
+        self.assertFalse(sl._pad_supported(
+            too_small, [[2, 0], [0, 0], [0, 0]], 'reflect', (6, 4, 5)))
+        self.assertFalse(sl._pad_supported(
+            list(interior), pad_list, 'mean', (6, 4, 5)))
+
+    def test_padded_filter(self):
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        plugin = 'savu.plugins.filters.median_filter'
+        tu.set_plugin_list(options, [plugin], [{'size': (20, 10, 12)},
+                           {'kernel_size': (5, 3, 3)}, {}])
+        PluginRunner(options)._run_plugin_list()
+
+        path = options['out_path']
+        with h5py.File(os.path.join(path, 'input_array.h5'), 'r') as f:
+            proj = f['test'][4:]
+        with h5py.File(os.path.join(path, 'tomo_p1_median_filter.h5'),
+                       'r') as f:
+            result = f['1-MedianFilter-tomo/data'][...]
+        shutil.rmtree(path)
+
+        padded = np.pad(proj, ((2, 2), (0, 0), (0, 0)), mode='edge')
+        expected = sig.medfilt(padded, (5, 3, 3))[2:-2]
+        np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+if __name__ == "__main__":
+    unittest.main()
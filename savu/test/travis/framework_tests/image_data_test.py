@@ -0,0 +1,81 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: image_data_test
+   :platform: Unix
+   :synopsis: unittest test class for the threaded reading of image stacks
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import tifffile as tf
+
+import savu.test.test_utils as tu
+from savu.data.data_structures.data_types.image_data import ImageData
+
+
+class ImageDataTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.images = np.random.randint(
+            0, 60000, size=(9, 12, 14)).astype(np.uint16)
+        # a mixture of uncompressed (memory-mapped) and compressed tiffs
+        for i, image in enumerate(self.images):
+            fname = os.path.join(self.folder, 'image_%05d.tif' % i)
+            tf.imsave(fname, image, compress=6 if i % 2 else 0)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def __get_image_data(self):
+        exp = tu.load_random_data(
+            'full_field_loaders.random_3d_tomo_loader', {'size': (9, 12, 14)})
+        data = exp.index['in_data'][exp.index['in_data'].keys()[0]]
+        return ImageData(self.folder, data, [2])
+
+    def test_image_data(self):
+        image_data = self.__get_image_data()
+        expected = self.images.transpose(1, 2, 0)
+        self.assertEqual(image_data.get_shape(), expected.shape)
+
+        blocks = [(slice(0, 12, 1), slice(0, 14, 1), slice(0, 3, 1)),
+                  (slice(2, 10, 2), slice(1, 13, 1), slice(3, 6, 1)),
+                  (slice(0, 12, 1), slice(0, 14, 1), slice(6, 9, 1)),
+                  (slice(5, 6, 1), slice(0, 14, 3), slice(1, 9, 4))]
+        for block in blocks:
+            np.testing.assert_array_equal(image_data[block], expected[block])
+
+        self.assertEqual(set(image_data._mapped.keys()), set([0, 2, 4, 6, 8]))
+        self.assertEqual(set(image_data._decoded.keys()), set([1, 3, 5, 7]))
+
+    def test_image_data_without_memmap(self):
+        # tifffile versions without a memmap function
+        memmap = tf.memmap
+        del tf.memmap
+        try:
+            image_data = self.__get_image_data()
+            expected = self.images.transpose(1, 2, 0)
+            block = (slice(0, 12, 1), slice(0, 14, 1), slice(0, 9, 1))
+            np.testing.assert_array_equal(image_data[block], expected[block])
+        finally:
+            tf.memmap = memmap
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: output_buffers_test
+   :platform: Unix
+   :synopsis: unittest test class for plugins writing their results in place \
+       into preallocated output buffers
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+import os
+import shutil
+import unittest
+import h5py
+import numpy as np
+
+import savu.test.test_utils as tu
+from savu.plugins.filters.threshold_filter import ThresholdFilter
+from savu.plugins.corrections.dark_flat_field_correction import \
+    DarkFlatFieldCorrection
+from savu.test.travis.framework_tests.plugin_runner_test import \
+    run_protected_plugin_runner_no_process_list
+
+
+class OutputBuffersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.in_place = []
+        self.process_frames = ThresholdFilter.process_frames
+        in_place = self.in_place
+        process_frames = self.process_frames
+
+        def _process_frames(plugin, data):
+            result = process_frames(plugin, data)
+            out = plugin.get_output_buffers()
+            in_place.append(out is not None and result is out[0])
+            return result
+        ThresholdFilter.process_frames = _process_frames
+
+    def tearDown(self):
+        ThresholdFilter.process_frames = self.process_frames
+
+    def __run(self, cls, params, buffers):
+        uses_output_buffers = cls.uses_output_buffers
+        if not buffers:
+            cls.uses_output_buffers = lambda plugin: False
+        # the same random data for each run
+        np.random.seed(0)
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        try:
+            run_protected_plugin_runner_no_process_list(
+                options, cls.__module__,
+                data=[{'size': (20, 10, 12)}, params, {}])
+        finally:
+            cls.uses_output_buffers = uses_output_buffers
+        name = cls.__module__.split('.')[-1]
+        fname = os.path.join(options['out_path'], 'tomo_p1_%s.h5' % name)
+        with h5py.File(fname, 'r') as f:
+            result = f['1-%s-tomo/data' % cls.__name__][...]
+        shutil.rmtree(options['out_path'])
+        return result
+
+    def test_threshold_filter(self):
+        params = {'intensity_threshold': 5}
+        copied = self.__run(ThresholdFilter, params, False)
+        self.assertFalse(any(self.in_place))
+        del self.in_place[:]
+        in_place = self.__run(ThresholdFilter, params, True)
+        self.assertTrue(self.in_place and all(self.in_place))
+        np.testing.assert_array_equal(copied, in_place)
+
+    def test_dark_flat_field_correction(self):
+        copied = self.__run(DarkFlatFieldCorrection, {}, False)
+        in_place = self.__run(DarkFlatFieldCorrection, {}, True)
+        np.testing.assert_allclose(copied, in_place, rtol=1e-6)
+
+if __name__ == "__main__":
+    unittest.main()
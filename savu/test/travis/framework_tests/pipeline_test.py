@@ -0,0 +1,167 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: pipeline_test
+   :platform: Unix
+   :synopsis: unittest test class for pipelining consecutive plugins
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+import os
+import shutil
+import unittest
+import h5py
+import numpy as np
+
+import savu.test.test_utils as tu
+from savu.core.plugin_runner import PluginRunner
+from savu.core.dependency_tracker import DependencyTracker
+from savu.data.meta_data import MetaData
+from savu.plugins.plugin import Plugin
+from savu.plugins.driver.cpu_plugin import CpuPlugin
+
+
+class PipelineTest(unittest.TestCase):
+
+    def __run(self, pipeline):
+        # the same random data for each run
+        np.random.seed(0)
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        options['pipeline'] = pipeline
+        plugins = ['savu.plugins.ring_removal.remove_large_rings',
+                   'savu.plugins.stats.min_and_max',
+                   'savu.plugins.ring_removal.ring_removal_sorting',
+                   'savu.plugins.ring_removal.remove_all_rings']
+        data = [tu.set_data_dict(['tomo'], ['tomo']),
+                dict(tu.set_data_dict(['tomo'], []), pattern='SINOGRAM'),
+                tu.set_data_dict(['tomo'], ['tomo']),
+                tu.set_data_dict(['tomo'], ['tomo'])]
+        tu.set_plugin_list(
+            options, plugins, [{'size': (20, 10, 12)}] + data + [{}])
+        runner = PluginRunner(options)
+        exp = runner._run_plugin_list()
+
+        results = []
+        for i, name in [(1, 'RemoveLargeRings'), (3, 'RingRemovalSorting'),
+                        (4, 'RemoveAllRings')]:
+            fname = os.path.join(options['out_path'], 'tomo_p%i_%s.h5' % (
+                i, options['plugin_list'][i]['id'].split('.')[-1]))
+            with h5py.File(fname, 'r') as f:
+                results.append(f['%i-%s-tomo/data' % (i, name)][...])
+        stats = exp.index['in_data']['tomo'].meta_data.get(
+            ['stats', 'max', 'SINOGRAM'])
+        shutil.rmtree(options['out_path'])
+        return runner.pipelined, results, stats
+
+    def test_pipeline(self):
+        pipelined, serial, serial_stats = self.__run(False)
+        self.assertEqual(pipelined, [False]*4)
+        pipelined, results, stats = self.__run(True)
+        # frame meta data is combined from all processes after MinAndMax
+        self.assertEqual(pipelined, [True, False, True, False])
+        for result, expected in zip(results, serial):
+            np.testing.assert_array_equal(result, expected)
+        np.testing.assert_array_equal(stats, serial_stats)
+
+
+class _FakeData(object):
+    """ A dataset with the transfer slice lists of a single process. """
+
+    def __init__(self, name, slice_lists):
+        self.name = name
+        self.slice_lists = slice_lists
+
+    def get_name(self):
+        return self.name
+
+    def _get_transport_data(self):
+        return self
+
+    def _get_slice_lists_per_process(self, dtype):
+        return {'transfer': self.slice_lists}
+
+
+class _FakePlugin(Plugin, CpuPlugin):
+
+    def __init__(self, in_data, out_data):
+        super(_FakePlugin, self).__init__('FakePlugin')
+        self.extra_dims = []
+        self.in_data = in_data
+        self.out_data = out_data
+
+    def get_datasets(self):
+        return self.in_data, self.out_data
+
+    def _get_ranks(self, nProcs):
+        return range(nProcs)
+
+
+class DependencyTrackerTest(unittest.TestCase):
+
+    def __get_blocks(self, dim, nFrames, process, nProcs, pad=0):
+        """ The transfer blocks (of single frames) of a process, sliced in
+        the dim dimension of a (8, 8, 8) dataset and padded by pad frames.
+        """
+        frames = nFrames/nProcs
+        blocks = []
+        for i in range(process*frames, (process + 1)*frames):
+            sl = [slice(None)]*3
+            sl[dim] = slice(max(i - pad, 0), min(i + 1 + pad, nFrames), 1)
+            blocks.append(tuple(sl))
+        return blocks
+
+    def __get_pipelined(self, reads, nProcs=2):
+        """ Determine the pipelined plugins from the trackers of each process
+        (combined in the same way as the MPI reduction).  The first plugin
+        writes 'tomo' in projections and the second plugin reads 'tomo' with
+        the blocks given by reads(process).
+        """
+        pipelined = []
+        for process in range(nProcs):
+            exp = type('Experiment', (object,), {})()
+            exp.meta_data = MetaData()
+            exp.meta_data.set('processes', ['CPU%i' % p for p in
+                                            range(nProcs)])
+            exp.meta_data.set('process', process)
+            exp.meta_data.set('mpi', False)
+            tracker = DependencyTracker(exp)
+            writes = self.__get_blocks(0, 8, process, nProcs)
+            tracker.add_plugin(0, _FakePlugin(
+                [], [_FakeData('tomo', writes)]))
+            tracker.add_plugin(1, _FakePlugin(
+                [_FakeData('tomo', reads(process))], []))
+            pipelined.append(tracker.get_pipelined(2))
+        return [all(p) for p in zip(*pipelined)]
+
+    def test_local_frames_are_pipelined(self):
+        pipelined = self.__get_pipelined(
+            lambda p: self.__get_blocks(0, 8, p, 2))
+        self.assertEqual(pipelined, [True, False])
+
+    def test_padded_frames_are_not_pipelined(self):
+        # the padded blocks include frames written by the other process
+        pipelined = self.__get_pipelined(
+            lambda p: self.__get_blocks(0, 8, p, 2, pad=1))
+        self.assertEqual(pipelined, [False, False])
+
+    def test_pattern_change_is_not_pipelined(self):
+        pipelined = self.__get_pipelined(
+            lambda p: self.__get_blocks(1, 8, p, 2))
+        self.assertEqual(pipelined, [False, False])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: preview_pushdown_test
+   :platform: Unix
+   :synopsis: unittest test class for replacing data removal plugins with \
+       previewing in the loader
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+import os
+import shutil
+import unittest
+import h5py
+import numpy as np
+
+import savu.test.test_utils as tu
+from savu.core.plugin_runner import PluginRunner
+
+
+class PreviewPushdownTest(unittest.TestCase):
+
+    def __run(self, pushdown, loader_params):
+        # the same random data for each run
+        np.random.seed(0)
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        options['pushdown'] = pushdown
+        plugins = ['savu.plugins.reshape.data_removal',
+                   'savu.plugins.ring_removal.remove_large_rings']
+        params = {'indices': '0:2', 'dim': 2, 'pattern': 'SINOGRAM'}
+        tu.set_plugin_list(options, plugins,
+                           [dict(size=(20, 10, 12), **loader_params),
+                            params, {}, {}])
+        exp = PluginRunner(options)._run_plugin_list()
+        names = [p['name'] for p in exp.meta_data.plugin_list.plugin_list]
+        n = names.index('RemoveLargeRings')
+        fname = os.path.join(options['out_path'],
+                             'tomo_p%i_remove_large_rings.h5' % n)
+        with h5py.File(fname, 'r') as f:
+            result = f['%i-RemoveLargeRings-tomo/data' % n][...]
+        shutil.rmtree(options['out_path'])
+        return names, result
+
+    def test_pushdown(self):
+        names, serial = self.__run(False, {})
+        self.assertTrue('DataRemoval' in names)
+        names, pushed = self.__run(True, {})
+        self.assertFalse('DataRemoval' in names)
+        self.assertEqual(pushed.shape, (16, 10, 10))
+        np.testing.assert_array_equal(serial, pushed)
+
+    def test_no_pushdown(self):
+        # the loader is already previewing the dimension
+        names, result = self.__run(True, {'preview': [':', ':', '1:11']})
+        self.assertTrue('DataRemoval' in names)
+        self.assertEqual(result.shape, (16, 10, 8))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: quick_look_test
+   :platform: Unix
+   :synopsis: unittest test class for quick-look (reduced resolution) runs
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import unittest
+
+import savu.test.test_utils as tu
+import savu.plugins.utils as pu
+
+
+class QuickLookTest(unittest.TestCase):
+
+    def __load_data(self, factor, preview=[]):
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        options['quick_look'] = factor
+        tu._add_loader_to_plugin_list(
+            options, params={'size': (20, 10, 12), 'preview': preview})
+        return tu.plugin_runner(options)
+
+    def test_quick_look_preview(self):
+        exp = self.__load_data(2)
+        data = exp.index['in_data']['tomo']
+        self.assertEqual(data.get_shape(), (8, 5, 6))
+        self.assertEqual(len(data.meta_data.get('rotation_angle')), 8)
+
+    def test_quick_look_with_preview(self):
+        exp = self.__load_data(2, preview=['0:8', 'mid-2:mid+2', ':'])
+        data = exp.index['in_data']['tomo']
+        self.assertEqual(data.get_shape(), (4, 2, 6))
+
+    def test_quick_look_with_preview_string(self):
+        exp = self.__load_data(2, preview='[0:8, mid, :]')
+        data = exp.index['in_data']['tomo']
+        self.assertEqual(data.get_shape(), (4, 1, 6))
+
+    def test_quick_look_with_nprocs_preview(self):
+        exp = self.__load_data(2, preview=['0:8', 'nprocs', ':'])
+        data = exp.index['in_data']['tomo']
+        self.assertEqual(data.get_shape(), (4, 1, 6))
+
+    def test_quick_look_parameters(self):
+        exp = self.__load_data(4)
+        plugin = pu.get_plugin('savu.plugins.filters.paganin_filter')
+        plugin.exp = exp
+        plugin._set_parameters({'Resolution': 1.5})
+        self.assertEqual(plugin.parameters['Resolution'], 6.0)
+
+        plugin = pu.get_plugin('savu.plugins.centering.vo_centering')
+        plugin.exp = exp
+        plugin._set_parameters({'start_pixel': 100})
+        self.assertEqual(plugin.parameters['start_pixel'], 25)
+        self.assertEqual(plugin.parameters['search_area'], (-12, 12))
+
+        # the keys of a centre of rotation per detector row are row indices
+        plugin = pu.get_plugin('savu.plugins.reconstructions.simple_recon')
+        plugin.exp = exp
+        plugin._set_parameters({'centre_of_rotation': {8: 40.0, '100': 52.0}})
+        self.assertEqual(plugin.parameters['centre_of_rotation'],
+                         {2: 10.0, '25': 13.0})
+
+if __name__ == "__main__":
+    unittest.main()
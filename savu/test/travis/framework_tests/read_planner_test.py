@@ -0,0 +1,87 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: read_planner_test
+   :platform: Unix
+   :synopsis: unittest test class for merging indexed reads into contiguous \
+       hyperslab reads
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import h5py
+import numpy as np
+
+import savu.data.data_structures.data_types.read_planner as rp
+
+
+class ReadPlannerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.array = np.random.rand(60, 7, 9).astype(np.float32)
+        self.h5file = h5py.File(os.path.join(self.folder, 'test.h5'), 'w')
+        self.dset = self.h5file.create_dataset(
+            'test', data=self.array, chunks=(4, 7, 9))
+
+    def tearDown(self):
+        self.h5file.close()
+        shutil.rmtree(self.folder)
+
+    def test_plan_reads(self):
+        index = np.array([0, 1, 2, 10, 11, 40, 41, 43])
+        # separate calls are cheaper than reading any gaps
+        self.assertEqual(rp.plan_reads(index, rp.READ_CALL_COST),
+                         [(0, 3), (10, 12), (40, 42), (43, 44)])
+        # reading gaps of up to 10 entries is cheaper than a separate call
+        self.assertEqual(rp.plan_reads(index, rp.READ_CALL_COST/10),
+                         [(0, 12), (40, 44)])
+        # gaps within a chunk are read anyway
+        self.assertEqual(rp.plan_reads(index, rp.READ_CALL_COST, chunk=4),
+                         [(0, 3), (10, 12), (40, 44)])
+        self.assertEqual(rp.plan_reads(np.array([], dtype=int), 1), [])
+
+    def test_read_index(self):
+        indices = [[3, 4, 5, 20, 21, 22, 57, 59],
+                   [30, 2, 2, 17, 16, 45],
+                   [-1, 0],
+                   [8]]
+        slices = [(slice(None), slice(None)),
+                  (slice(1, 6, 2), slice(0, 8, 3))]
+        for data in [self.array, self.dset]:
+            for idx in indices:
+                for sl in slices:
+                    index = (idx,) + sl
+                    np.testing.assert_array_equal(
+                        rp.read_index(data, index, 0),
+                        self.array[np.array(idx)][(slice(None),) + sl])
+            # the indexed dimension need not be the first
+            index = (slice(2, 50), [6, 0, 1], slice(None))
+            np.testing.assert_array_equal(rp.read_index(data, index, 1),
+                                          self.array[2:50, [6, 0, 1], :])
+
+    def test_read_index_dtype(self):
+        result = rp.read_index(self.dset, ([1, 5], slice(None), slice(None)),
+                               0, dtype=np.float64)
+        self.assertEqual(result.dtype, np.float64)
+        self.assertEqual(result.shape, (2, 7, 9))
+        empty = rp.read_index(self.dset, ([], slice(None), slice(None)), 0)
+        self.assertEqual(empty.shape, (0, 7, 9))
+
+if __name__ == "__main__":
+    unittest.main()
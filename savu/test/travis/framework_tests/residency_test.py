@@ -0,0 +1,126 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: residency_test
+   :platform: Unix
+   :synopsis: unittest test class for keeping intermediate datasets in memory
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+import os
+import glob
+import shutil
+import tempfile
+import unittest
+import h5py
+import numpy as np
+
+import savu
+import savu.test.test_utils as tu
+from savu.core.plugin_runner import PluginRunner
+from savu.core.residency import ResidencyManager
+
+
+class ResidencyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.events = []
+        events = self.events
+        make_resident = ResidencyManager._ResidencyManager__make_resident
+        release = ResidencyManager._ResidencyManager__release
+        self.methods = (make_resident, release)
+
+        def _make_resident(manager, data, *args):
+            make_resident(manager, data, *args)
+            if manager._is_resident(data):
+                events.append(('resident', data.get_name()))
+
+        def _release(manager, key, spill=True):
+            events.append(('spill' if spill else 'free', key[0]))
+            release(manager, key, spill=spill)
+
+        ResidencyManager._ResidencyManager__make_resident = _make_resident
+        ResidencyManager._ResidencyManager__release = _release
+
+    def tearDown(self):
+        ResidencyManager._ResidencyManager__make_resident, \
+            ResidencyManager._ResidencyManager__release = self.methods
+        shutil.rmtree(self.folder)
+
+    def __system_params(self, budget):
+        path = os.path.join(os.path.dirname(savu.__path__[0]),
+                            'system_files', 'dls', 'system_parameters.yml')
+        fname = os.path.join(self.folder, 'system_parameters_%s.yml' % budget)
+        with open(path, 'r') as f:
+            params = f.read()
+        with open(fname, 'w') as f:
+            f.write(params.replace('memory_budget       : 0',
+                                   'memory_budget       : %s' % budget))
+        return fname
+
+    def __run(self, budget):
+        # the same random data for each run
+        np.random.seed(0)
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        options['system_params'] = self.__system_params(budget)
+        plugins = ['savu.plugins.filters.median_filter',
+                   'savu.plugins.filters.threshold_filter',
+                   'savu.plugins.basic_operations.basic_operations']
+        params = [{'size': (20, 10, 12)},
+                  {'in_datasets': ['tomo'], 'out_datasets': ['med']},
+                  {'in_datasets': ['tomo'], 'out_datasets': ['thr'],
+                   'intensity_threshold': 5},
+                  {'in_datasets': ['med', 'thr'], 'out_datasets': ['res'],
+                   'operations': ['med + thr']}, {}]
+        tu.set_plugin_list(options, plugins, params)
+        PluginRunner(options)._run_plugin_list()
+
+        results = {}
+        for name in ['med', 'thr', 'res']:
+            fname = glob.glob(os.path.join(
+                options['out_path'], '*', name + '_p*.h5')) + glob.glob(
+                os.path.join(options['out_path'], name + '_p*.h5'))
+            with h5py.File(fname[0], 'r') as f:
+                entry = f.keys()[0]
+                results[name] = f[entry + '/data'][...]
+        shutil.rmtree(options['out_path'])
+        return results
+
+    def test_residency(self):
+        files = self.__run(0)
+        self.assertEqual(self.events, [])
+
+        # both intermediate datasets fit in memory
+        memory = self.__run(1e-3)
+        self.assertEqual(self.events, [('resident', 'med'),
+                                       ('resident', 'thr'),
+                                       ('spill', 'med'), ('spill', 'thr')])
+        for name in files.keys():
+            np.testing.assert_array_equal(files[name], memory[name])
+
+        # only one intermediate dataset fits, so the least recently used is
+        # written to file
+        del self.events[:]
+        evicted = self.__run(1e-5)
+        self.assertEqual(self.events, [('resident', 'med'), ('spill', 'med'),
+                                       ('resident', 'thr'), ('spill', 'thr')])
+        for name in files.keys():
+            np.testing.assert_array_equal(files[name], evicted[name])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: stitch_data_test
+   :platform: Unix
+   :synopsis: unittest test class for stacking and concatenating datasets
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+import unittest
+import numpy as np
+
+import savu.test.test_utils as tu
+from savu.data.data_structures.data import Data
+from savu.data.data_structures.data_types.stitch_data import StitchData
+
+
+class StitchDataTest(unittest.TestCase):
+
+    def setUp(self):
+        exp = tu.load_random_data(
+            'full_field_loaders.random_3d_tomo_loader', {'size': (8, 5, 6)})
+        self.arrays = [np.random.randint(0, 100, size=(4, 5, 6)).astype(t)
+                       for t in [np.int16, np.float32, np.int16]]
+        self.obj_list = []
+        for i, array in enumerate(self.arrays):
+            data = Data('data%i' % i, exp)
+            data.data = array
+            data.set_shape(array.shape)
+            self.obj_list.append(data)
+
+    def test_stack(self):
+        stitched = StitchData(self.obj_list, 'stack', 3)
+        expected = np.stack(self.arrays, axis=3)
+        self.assertEqual(stitched.get_shape(), expected.shape)
+        sl = (slice(1, 4, 1), slice(0, 5, 2), slice(0, 6, 1), slice(0, 3, 1))
+        result = stitched[sl]
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_array_equal(result, expected[sl])
+
+    def test_cat(self):
+        stitched = StitchData(self.obj_list, 'cat', 0)
+        expected = np.concatenate(self.arrays, axis=0)
+        self.assertEqual(stitched.get_shape(), expected.shape)
+        sl = (slice(2, 11, 1), slice(0, 5, 1), slice(1, 6, 2))
+        result = stitched[sl]
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_array_equal(result, expected[sl])
+
+    def test_remove(self):
+        arrays = [a[:, 2:3, :] for a in self.arrays]
+        for obj, array in zip(self.obj_list, arrays):
+            obj.data = array
+            obj.set_shape(array.shape)
+        stitched = StitchData(self.obj_list, 'stack', 2, remove=[1])
+        expected = np.stack([a[:, 0, :] for a in arrays], axis=2)
+        self.assertEqual(stitched.get_shape(), expected.shape)
+        sl = (slice(0, 4, 1), slice(0, 6, 1), slice(1, 3, 1))
+        np.testing.assert_array_equal(stitched[sl], expected[sl])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: threaded_process_test
+   :platform: Unix
+   :synopsis: unittest test class for processing the frames of thread safe \
+       plugins in a pool of threads
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+
+import os
+import time
+import shutil
+import threading
+import unittest
+import h5py
+import numpy as np
+
+import savu.test.test_utils as tu
+from savu.plugins.ring_removal.remove_large_rings import RemoveLargeRings
+from savu.test.travis.framework_tests.plugin_runner_test import \
+    run_protected_plugin_runner_no_process_list
+
+
+class ThreadedProcessTest(unittest.TestCase):
+
+    def setUp(self):
+        self.threads = set()
+        self.process_frames = RemoveLargeRings.process_frames
+        threads = self.threads
+        process_frames = self.process_frames
+
+        def _process_frames(plugin, data):
+            threads.add(threading.current_thread().name)
+            # give the other threads a chance to take frames, so the test
+            # does not depend on how the threads are scheduled
+            time.sleep(0.01)
+            return process_frames(plugin, data)
+        RemoveLargeRings.process_frames = _process_frames
+
+    def tearDown(self):
+        RemoveLargeRings.process_frames = self.process_frames
+        if 'nThreads' in RemoveLargeRings.__dict__:
+            del RemoveLargeRings.nThreads
+
+    def __run(self, nThreads):
+        RemoveLargeRings.nThreads = lambda plugin: nThreads
+        # the same random data for each run
+        np.random.seed(0)
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        plugin = 'savu.plugins.ring_removal.remove_large_rings'
+        run_protected_plugin_runner_no_process_list(
+            options, plugin, data=[{'size': (20, 10, 12)},
+                                   tu.set_data_dict(['tomo'], ['tomo']), {}])
+        fname = os.path.join(options['out_path'],
+                             'tomo_p1_remove_large_rings.h5')
+        with h5py.File(fname, 'r') as f:
+            result = f['1-RemoveLargeRings-tomo/data'][...]
+        shutil.rmtree(options['out_path'])
+        return result
+
+    def test_threaded_process(self):
+        serial = self.__run(1)
+        self.assertEqual(self.threads, set(['MainThread']))
+        self.threads.clear()
+        threaded = self.__run(3)
+        self.assertTrue('MainThread' not in self.threads)
+        self.assertTrue(len(self.threads) > 1)
+        np.testing.assert_array_equal(serial, threaded)
+
+if __name__ == "__main__":
+    unittest.main()
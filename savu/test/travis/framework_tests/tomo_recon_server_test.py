@@ -0,0 +1,97 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: tomo_recon_server_test
+   :platform: Unix
+   :synopsis: unittest test class for the savu job queue server
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import os
+import argparse
+import time
+import shutil
+import tempfile
+import unittest
+
+import savu.test.test_utils as tu
+import savu.tomo_recon_server as trs
+
+
+class TomoReconServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = tempfile.mkdtemp()
+        self.data = tu.get_test_data_path('24888.nxs')
+        self.process = tu.get_test_process_path('basic_tomo_process.nxs')
+
+    def tearDown(self):
+        shutil.rmtree(self.queue)
+
+    def __add_job(self, name, args):
+        path = os.path.join(self.queue, name + trs.JOB_EXT)
+        with open(path, 'w') as f:
+            f.write('# a comment\n' + args + '\n')
+        return path
+
+    def test_claim_jobs_in_order(self):
+        self.__add_job('a', 'in.nxs process.nxs out -f first')
+        time.sleep(0.01)
+        self.__add_job('b', 'in2.nxs process.nxs out')
+
+        job, args = trs._claim_job(self.queue)
+        self.assertEqual(args, ['in.nxs', 'process.nxs', 'out', '-f', 'first'])
+        self.assertTrue(job.endswith('a.job.running'))
+        trs._finish_job(job, 'done')
+        self.assertTrue(os.path.exists(os.path.join(self.queue, 'a.job.done')))
+
+        job, args = trs._claim_job(self.queue)
+        self.assertEqual(args, ['in2.nxs', 'process.nxs', 'out'])
+        self.assertEqual(trs._claim_job(self.queue), None)
+
+    def test_stop_file(self):
+        self.__add_job('a', 'in.nxs process.nxs out')
+        open(os.path.join(self.queue, trs.STOP_FILE), 'w').close()
+        self.assertEqual(trs._claim_job(self.queue), 'stop')
+
+    def test_job_options(self):
+        server_args = argparse.Namespace(names='CPU0,CPU1', cluster=False)
+        out = os.path.join(self.queue, 'out')
+        options = trs._get_job_options(
+            [self.data, self.process, out, '-f', 'test'], server_args)
+        self.assertEqual(options['nProcesses'], 2)
+        self.assertEqual(options['out_path'], os.path.join(out, 'test'))
+        self.assertTrue(os.path.exists(options['out_path']))
+
+    def test_invalid_jobs(self):
+        server_args = argparse.Namespace(names='CPU0', cluster=False)
+        invalid = [['--unknown_flag'],
+                   ['missing.nxs', self.process, self.queue],
+                   [self.data, 'missing.nxs', self.queue],
+                   [self.data, self.data, self.queue]]
+        for job_args in invalid:
+            self.assertRaises(Exception, trs._parse_job, job_args,
+                              server_args)
+
+    def test_invalid_job_is_skipped(self):
+        self.__add_job('a', 'missing.nxs %s %s' % (self.process, self.queue))
+        trs.main([self.queue, '--exit_when_empty'])
+        self.assertTrue(
+            os.path.exists(os.path.join(self.queue, 'a.job.failed')))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,10 +21,12 @@
 
 """
 import unittest
+import numpy as np
 from savu.test import test_utils as tu
 
+from savu.plugins.filters.paganin_filter import PaganinFilter
 from savu.test.travis.framework_tests.plugin_runner_test import \
-    run_protected_plugin_runner
+    run_protected_plugin_runner, run_protected_plugin_runner_no_process_list
 
 
 class PaganinTest(unittest.TestCase):
@@ -34,5 +36,67 @@ class PaganinTest(unittest.TestCase):
         process_file = tu.get_test_process_path('paganin_filter_test.nxs')
         run_protected_plugin_runner(tu.set_options(data_file,
                                                    process_file=process_file))
+
+    def test_paganin_multiple_frames(self):
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        plugin = 'savu.plugins.filters.paganin_filter'
+        data = [{'size': (20, 10, 12)}, tu.set_data_dict(['tomo'], ['tomo']),
+                {'Padtopbottom': 3, 'Padleftright': 4}]
+        exp = run_protected_plugin_runner_no_process_list(
+            options, plugin, data=data)
+        self.assertEqual(exp.index['in_data']['tomo'].get_shape(),
+                         (16, 10, 12))
+
+    def test_paganin_filter(self):
+        plugin = PaganinFilter()
+        plugin.parameters = {'Distance': 1.0, 'Energy': 53.0,
+                             'Resolution': 1.28, 'Ratio': 250.0,
+                             'Padtopbottom': 0, 'Padleftright': 0,
+                             'increment': 0.0}
+        height, width = 31, 41
+        plugin._setup_paganin(height, width)
+        data = np.random.rand(3, height, width).astype(np.float32) + 0.5
+
+        # centred complex filter applied to the full spectrum
+        py, px = np.meshgrid(np.fft.fftshift(np.fft.fftfreq(height, 1.28e-6)),
+                             np.fft.fftshift(np.fft.fftfreq(width, 1.28e-6)),
+                             indexing='ij')
+        wavelength = (1240.0 / 53000.0) * 1e-9
+        filter1 = 1.0 + 250.0*(px**2 + py**2)*wavelength*np.pi
+        for frame, result in zip(data, plugin._paganin(data)):
+            spectrum = np.fft.fftshift(np.fft.fft2(frame))
+            expected = np.abs(np.fft.ifft2(
+                np.fft.ifftshift(spectrum/(filter1 + filter1*1j))))
+            expected = -0.5*250.0*np.log(expected)
+            np.testing.assert_allclose(result, expected, rtol=1e-4)
+
+    def test_paganin_filter_even_size(self):
+        plugin = PaganinFilter()
+        plugin.parameters = {'Distance': 1.0, 'Energy': 53.0,
+                             'Resolution': 1.28, 'Ratio': 250.0,
+                             'Padtopbottom': 0, 'Padleftright': 0,
+                             'increment': 0.0}
+        height, width = 32, 40
+        plugin._setup_paganin(height, width)
+        data = np.random.rand(3, height, width).astype(np.float32) + 0.5
+
+        # the zero frequency is only scaled by the magnitude of (1 + 1j)
+        self.assertAlmostEqual(plugin.filter[0, 0], np.sqrt(2), places=6)
+
+        # the same filter applied to the full (unshifted) spectrum
+        py, px = np.meshgrid(np.fft.fftfreq(height, 1.28e-6),
+                             np.fft.fftfreq(width, 1.28e-6), indexing='ij')
+        wavelength = (1240.0 / 53000.0) * 1e-9
+        pd = (px**2 + py**2)*wavelength*np.pi
+        flt = np.sqrt(2)*(1.0 + 250.0*pd)
+        for frame, result in zip(data, plugin._paganin(data)):
+            filtered = np.fft.ifft2(np.fft.fft2(frame)/flt)
+            self.assertAlmostEqual(filtered.real.mean(),
+                                   frame.mean()/np.sqrt(2), places=5)
+            expected = -0.5*250.0*np.log(np.abs(filtered))
+            np.testing.assert_allclose(result, expected, rtol=1e-4)
+
 if __name__ == "__main__":
     unittest.main()
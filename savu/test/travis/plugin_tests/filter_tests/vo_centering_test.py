@@ -22,7 +22,10 @@
 """
 
 import unittest
+import numpy as np
+
 from savu.test import test_utils as tu
+from savu.plugins.centering.vo_centering import VoCentering
 from savu.test.travis.framework_tests.plugin_runner_test import \
     run_protected_plugin_runner
 
@@ -57,5 +60,55 @@ class VoCenterTest(unittest.TestCase):
         run_protected_plugin_runner(tu.set_options(data_file,
                                                    process_file=process_file))
 
+    def __get_sinogram(self, cor, nrow=91, ncol=200):
+        angles = np.linspace(0, np.pi, nrow, endpoint=False)
+        x = np.arange(ncol)
+        sino = np.zeros((nrow, ncol), dtype=np.float32)
+        for radius, phase, width in [(30, 0.3, 10), (50, 2.0, 5), (0, 0, 15)]:
+            pos = cor + radius*np.cos(angles + phase)
+            sino += np.exp(-((x - pos[:, np.newaxis])/width)**2)
+        return sino
+
+    def test_vo_centering_search(self):
+        plugin = VoCentering()
+        plugin.threads = 2
+        for cor in [100.0, 103.5, 97.25]:
+            sino = self.__get_sinogram(cor)
+            coarse = plugin._coarse_search(sino, 80, 120, 0.5, 20)
+            self.assertEqual(coarse, np.floor(cor))
+            fine = plugin._fine_search(sino, coarse + 1, 3., 0.25, 0.5, 20)
+            self.assertEqual(fine, cor)
+
+    def test_vo_centering_batched_metric(self):
+        # compare with the metric calculated from the full double sinogram
+        plugin = VoCentering()
+        sino = self.__get_sinogram(101.0)
+        (nrow, ncol) = sino.shape
+        mask = plugin._create_mask(2*nrow, ncol, 0.25*ncol, 20)
+        list_cor = np.array([95.0, 101.0, 107.0])
+        shifts = np.int16(2.0*(list_cor - (ncol - 1.0)/2.0))
+        expected = []
+        for shift in shifts:
+            shifted = np.roll(np.fliplr(sino), shift, axis=1)
+            shifted[:, :shift] = np.flipud(sino)[:, :shift]
+            fft = np.fft.fft2(np.vstack((sino, shifted)))
+            expected.append(np.mean(np.abs(np.fft.fftshift(fft))*mask))
+
+        flip_fft = plugin._column_fft(np.fliplr(sino), bottom=True)
+        comp_fft = plugin._column_fft(np.flipud(sino), bottom=True)
+
+        def get_sinos(cors):
+            sinos = []
+            for shift in np.int16(2.0*(cors - (ncol - 1.0)/2.0)):
+                sinos.append(np.roll(flip_fft, shift, axis=1))
+                sinos[-1][:, :shift] = comp_fft[:, :shift]
+            return np.array(sinos)
+
+        metric = plugin._calculate_metric(
+            sino, list_cor, get_sinos,
+            plugin._get_mask(2*nrow, ncol, 0.25*ncol, 20))
+        np.testing.assert_allclose(metric, expected, rtol=1e-5)
+
+
 if __name__ == "__main__":
     unittest.main()
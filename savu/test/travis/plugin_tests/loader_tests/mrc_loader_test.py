@@ -0,0 +1,82 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: mrc_loader_test
+   :platform: Unix
+   :synopsis: testing the mrc loader
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from savu.test import test_utils as tu
+import savu.plugins.loaders.utils.mrc_header as header_format
+
+
+def write_mrc(fname, data, byte_order, extended=0):
+    """ Write a 3D float32 array to an MRC file. """
+    dtype = np.dtype(header_format.rec_header_dtd).newbyteorder(byte_order)
+    header = np.zeros(1, dtype=dtype)
+    header['nx'], header['ny'], header['nz'] = data.shape
+    header['mode'] = 2
+    header['next'] = extended
+    header['amin'], header['amax'] = data.min(), data.max()
+    header['amean'], header['rms'] = data.mean(), data.std()
+    header['stamp'] = [17, 17, 0, 0] if byte_order == '>' else [68, 65, 0, 0]
+    with open(fname, 'wb') as f:
+        f.write(header.tobytes())
+        f.write(b'\0'*extended)
+        f.write(data.astype(byte_order + 'f4').tobytes(order='F'))
+
+
+class MrcLoaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.data = np.random.rand(6, 5, 4).astype(np.float32)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def __load(self, byte_order, extended):
+        fname = os.path.join(self.folder, 'test%s.mrc' % byte_order)
+        write_mrc(fname, self.data, byte_order, extended=extended)
+        options = tu.set_options(fname)
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.mrc_loader'
+        tu._add_loader_to_plugin_list(options)
+        exp = tu.plugin_runner(options)
+        return exp.index['in_data']['tomo']
+
+    def test_mrc_loader(self):
+        for byte_order, extended in [('<', 0), ('>', 96)]:
+            data_obj = self.__load(byte_order, extended)
+            self.assertEqual(data_obj.get_shape(), self.data.shape)
+            sl = (slice(1, 5, 2), slice(0, 5, 1), slice(3, 4, 1))
+            result = data_obj.data[sl]
+            self.assertTrue(result.dtype.isnative)
+            np.testing.assert_array_equal(result, self.data[sl])
+
+            stats = data_obj.meta_data.get(['stats', 'global'])
+            self.assertAlmostEqual(stats['min'], self.data.min())
+            self.assertAlmostEqual(stats['max'], self.data.max())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: swmr_dataset_test
+   :platform: Unix
+   :synopsis: Tests for reading a hdf5 dataset that is still being written.
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import os
+import h5py
+import shutil
+import tempfile
+import unittest
+import threading
+import numpy as np
+
+import savu.test.test_utils as tu
+from savu.plugins.loaders.utils.swmr_dataset import SwmrDataset
+
+
+class SwmrDatasetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        fname = os.path.join(self.tmpdir, 'swmr.h5')
+        self.wfile = h5py.File(fname, 'w', libver='latest')
+        self.wdata = self.wfile.create_dataset(
+            'data', shape=(3, 4, 5), maxshape=(None, 4, 5), dtype=np.float32)
+        self.wdata[...] = 1
+        self.wfile.swmr_mode = True
+        self.rfile = h5py.File(fname, 'r', libver='latest', swmr=True)
+
+    def tearDown(self):
+        self.rfile.close()
+        self.wfile.close()
+        shutil.rmtree(self.tmpdir)
+
+    def __grow(self):
+        self.wdata.resize((6, 4, 5))
+        self.wdata[3:] = 2
+        self.wdata.flush()
+
+    def test_read_available_frames(self):
+        data = SwmrDataset(self.rfile['data'], 6, timeout=1)
+        self.assertEqual(data.shape, (6, 4, 5))
+        self.assertEqual(data[0:3, 1].shape, (3, 5))
+        self.assertFalse(data.is_complete())
+
+    def test_wait_for_frames(self):
+        data = SwmrDataset(self.rfile['data'], 6, timeout=10, poll=0.05)
+        threading.Timer(0.2, self.__grow).start()
+        self.assertEqual(data[[1, 5]].mean(), 1.5)
+        self.assertTrue(data.is_complete())
+
+    def test_fancy_index(self):
+        data = SwmrDataset(self.rfile['data'], 6, timeout=10, poll=0.05)
+        index = (np.array([0, 2]), slice(None), slice(1, 3))
+        self.assertEqual(data[index].shape, (2, 4, 2))
+        threading.Timer(0.2, self.__grow).start()
+        index = (np.array([1, 4]), slice(None), slice(0, 2))
+        self.assertEqual(data[index].mean(), 1.5)
+
+    def test_timeout(self):
+        data = SwmrDataset(self.rfile['data'], 6, timeout=0.2, poll=0.05)
+        with self.assertRaises(Exception):
+            data[4:6]
+
+class SwmrLoaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.fname = os.path.join(self.tmpdir, 'scan.nxs')
+        self.wfile = h5py.File(self.fname, 'w', libver='latest')
+        entry = 'entry1/tomo_entry/'
+        data = self.wfile.create_dataset(
+            entry + 'data/data', shape=(5, 4, 6), maxshape=(None, 4, 6),
+            dtype=np.float32)
+        data[...] = 1
+        # two flats are still to be written at the end of the scan
+        key = self.wfile.create_dataset(
+            entry + 'instrument/detector/image_key', shape=(5,),
+            maxshape=(None,), dtype=np.int32)
+        key[...] = [2, 1, 0, 0, 0]
+        self.wfile.swmr_mode = True
+
+    def tearDown(self):
+        self.wfile.close()
+        shutil.rmtree(self.tmpdir)
+
+    def __load(self, params):
+        options = tu.set_options(self.fname, out_path=self.tmpdir)
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.nxtomo_loader'
+        params.update({'swmr_frames': 7, 'angles': 'np.linspace(0, 180, 3)'})
+        tu._add_loader_to_plugin_list(options, params=params)
+        return tu.plugin_runner(options).index['in_data']['tomo']
+
+    def test_final_image_key(self):
+        data_obj = self.__load({'swmr_image_key': '[2, 1, 0, 0, 0, 1, 1]'})
+        self.assertEqual(list(data_obj.data.get_index(1, full=True)),
+                         [1, 5, 6])
+        self.assertEqual(data_obj.get_shape(), (3, 4, 6))
+
+    def test_incomplete_image_key(self):
+        # frames not yet written are not assumed to be projections
+        with self.assertRaisesRegexp(Exception, 'Timed out'):
+            self.__load({'swmr_timeout': 0.2})
+        with self.assertRaisesRegexp(Exception, 'does not match'):
+            self.__load({'swmr_image_key': '[2, 0, 0, 0, 0, 1, 1]'})
+
+if __name__ == "__main__":
+    unittest.main()
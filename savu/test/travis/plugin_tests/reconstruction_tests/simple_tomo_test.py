@@ -21,9 +21,13 @@
 
 """
 import unittest
+import numpy as np
+
 from savu.test import test_utils as tu
+from savu.plugins.reconstructions.simple_recon import SimpleRecon
 from savu.test.travis.framework_tests.plugin_runner_test \
-    import run_protected_plugin_runner
+    import run_protected_plugin_runner, \
+    run_protected_plugin_runner_no_process_list
 
 
 class SimpleTomoTest(unittest.TestCase):
@@ -35,5 +39,58 @@ class SimpleTomoTest(unittest.TestCase):
         run_protected_plugin_runner(tu.set_options(data_file,
                                                    process_file=process_file))
 
+    def test_process_multiple_sinograms(self):
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        plugin = 'savu.plugins.reconstructions.simple_recon'
+        data = [{'size': (20, 10, 12)}, tu.set_data_dict(['tomo'], ['tomo']),
+                {'centre_of_rotation': 6.0}]
+        exp = run_protected_plugin_runner_no_process_list(
+            options, plugin, data=data)
+        self.assertEqual(exp.index['in_data']['tomo'].get_shape(),
+                         (12, 10, 12))
+
+    def test_filtered_back_projection(self):
+        # the projection of a disc is the same at all angles
+        nPixels, nAngles, radius = 64, 90, 20.
+        s = np.arange(nPixels) - nPixels/2. + 0.5
+        proj = 2*np.sqrt(np.clip(radius**2 - s**2, 0, None))
+        sino = np.tile(proj, (2, nAngles, 1)).astype(np.float32)
+        angles = np.linspace(0, np.pi, nAngles, endpoint=False)
+
+        plugin = SimpleRecon()
+        recon = plugin._back_project(plugin._filter(sino), angles,
+                                     nPixels/2., (nPixels, nPixels))
+        self.assertEqual(recon.shape, (2, nPixels, nPixels))
+        centre = recon[:, 22:42, 22:42]
+        self.assertAlmostEqual(centre.mean(), 1.0, delta=0.1)
+        self.assertAlmostEqual(recon[:, :6, :6].mean(), 0.0, delta=0.1)
+
+    def test_orientation(self):
+        # an off-centre point at (row, column) = (31, 11), where a pixel is
+        # projected to x*cos(theta) - y*sin(theta) from the centre, with x
+        # along the columns and y along the rows
+        nPixels, nAngles = 64, 90
+        row, col = 31, 11
+        x, y = col - nPixels/2., row - nPixels/2.
+        angles = np.linspace(0, np.pi, nAngles, endpoint=False)
+        pos = nPixels/2. + x*np.cos(angles) - y*np.sin(angles)
+        s = np.arange(nPixels)
+        sino = np.exp(-((s[np.newaxis] - pos[:, np.newaxis])/1.5)**2)
+        sino = sino[np.newaxis].astype(np.float32)
+
+        plugin = SimpleRecon()
+        recon = plugin._back_project(plugin._filter(sino), angles,
+                                     nPixels/2., (nPixels, nPixels))
+        peak = np.unravel_index(np.argmax(recon[0]), recon[0].shape)
+        self.assertEqual(peak, (row, col))
+
+        # a non-square slice has the same orientation
+        recon = plugin._back_project(plugin._filter(sino), angles,
+                                     nPixels/2., (nPixels, nPixels + 8))
+        peak = np.unravel_index(np.argmax(recon[0]), recon[0].shape)
+        self.assertEqual(peak, (row, col + 4))
+
 if __name__ == "__main__":
     unittest.main()
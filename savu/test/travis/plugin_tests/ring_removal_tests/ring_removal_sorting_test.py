@@ -19,10 +19,13 @@
 .. moduleauthor:: Nghia Vo <scientificsoftware@diamond.ac.uk>
 """
 import unittest
+import numpy as np
+from scipy.ndimage import median_filter
 from savu.test import test_utils as tu
 
+import savu.plugins.ring_removal.stripe_sorting as ss
 from savu.test.travis.framework_tests.plugin_runner_test import \
-    run_protected_plugin_runner
+    run_protected_plugin_runner, run_protected_plugin_runner_no_process_list
 
 
 class RingRemovalSortingTest(unittest.TestCase):
@@ -32,5 +35,31 @@ class RingRemovalSortingTest(unittest.TestCase):
         process_file = tu.get_test_process_path('ring_removal_sorting_test.nxs')
         run_protected_plugin_runner(tu.set_options(data_file,
                                                    process_file=process_file))
+
+    def test_ring_removal_sorting_multiple_frames(self):
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        plugin = 'savu.plugins.ring_removal.ring_removal_sorting'
+        data = [{'size': (20, 10, 12)}, tu.set_data_dict(['tomo'], ['tomo']),
+                {'size': 5}]
+        exp = run_protected_plugin_runner_no_process_list(
+            options, plugin, data=data)
+        self.assertEqual(exp.index['in_data']['tomo'].get_shape(),
+                         (16, 10, 12))
+
+    def test_remove_stripe_based_sorting(self):
+        sinos = np.random.rand(15, 3, 20).astype(np.float32)
+        result = ss.remove_stripe_based_sorting(sinos, 5, angle_dim=0,
+                                                det_dim=2)
+        for i in range(sinos.shape[1]):
+            # sort each column of a single sinogram in turn
+            sino = sinos[:, i, :]
+            index = np.argsort(sino, axis=0)
+            sino_sort = median_filter(np.sort(sino, axis=0), (1, 5))
+            expected = np.zeros_like(sino)
+            for j in range(sino.shape[1]):
+                expected[index[:, j], j] = sino_sort[:, j]
+            np.testing.assert_array_equal(result[:, i, :], expected)
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
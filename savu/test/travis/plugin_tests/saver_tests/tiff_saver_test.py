@@ -20,10 +20,17 @@
 .. moduleauthor:: Mark Basham <scientificsoftware@diamond.ac.uk>
 
 """
+import os
+import glob
+import shutil
 import unittest
+import h5py
+import numpy as np
+import tifffile as tf
+
 from savu.test import test_utils as tu
 from savu.test.travis.framework_tests.plugin_runner_test import \
-    run_protected_plugin_runner
+    run_protected_plugin_runner, run_protected_plugin_runner_no_process_list
 
 
 class TiffSaverTest(unittest.TestCase):
@@ -34,6 +41,56 @@ class TiffSaverTest(unittest.TestCase):
         run_protected_plugin_runner(tu.set_options(data_file,
                                                    process_file=process_file))
 
+    def __run(self, plugins, params):
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        if len(plugins) == 1:
+            run_protected_plugin_runner_no_process_list(
+                options, plugins[0],
+                data=[{'size': (20, 10, 12)}] + params + [{}])
+        else:
+            tu.set_plugin_list(options, plugins,
+                               [{'size': (20, 10, 12)}] + params + [{}])
+            run_protected_plugin_runner(options)
+
+        with h5py.File(os.path.join(options['out_path'], 'input_array.h5'),
+                       'r') as f:
+            # remove the darks and flats and order the data by sinogram
+            data = f['test'][4:].transpose(1, 0, 2)
+        files = sorted(glob.glob(
+            os.path.join(options['out_path'], 'TiffSaver-tomo', '*')))
+        pages = []
+        for fname in files:
+            with tf.TiffFile(fname) as tiff:
+                pages += [p.asarray() for p in tiff.pages]
+        shutil.rmtree(options['out_path'])
+        return data, [os.path.basename(f) for f in files], np.array(pages)
+
+    def test_tiff_saver_modes(self):
+        plugin = 'savu.plugins.savers.tiff_saver'
+        expected_files = {'slice': range(10), 'chunk': [0, 3, 6, 9],
+                          'stack': [0]}
+        for mode, compression in [('slice', 0), ('chunk', 6), ('stack', 0)]:
+            params = dict(tu.set_data_dict(['tomo'], []), pattern='SINOGRAM',
+                          mode=mode, chunk_size=3, compression=compression)
+            data, files, pages = self.__run([plugin], [params])
+            self.assertEqual(files, ['tomo_test_%05i.tiff' % i for i in
+                                     expected_files[mode]])
+            np.testing.assert_array_equal(pages, data)
+
+    def test_tiff_saver_bit_depth(self):
+        plugins = ['savu.plugins.stats.statistics',
+                   'savu.plugins.savers.tiff_saver']
+        params = [dict(tu.set_data_dict(['tomo'], []), pattern='SINOGRAM'),
+                  dict(tu.set_data_dict(['tomo'], []), pattern='SINOGRAM',
+                       bit_depth=8)]
+        data, files, pages = self.__run(plugins, params)
+        self.assertEqual(pages.dtype, np.uint8)
+        self.assertEqual((pages.min(), pages.max()), (0, 255))
+        expected = (data - data.min())*255.0/(data.max() - data.min())
+        np.testing.assert_allclose(pages, expected, atol=0.5001)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,53 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: min_and_max_test
+   :platform: Unix
+   :synopsis: unittest test class for the min and max plugin, which collects \
+       its results as frame metadata
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+import unittest
+import numpy as np
+from savu.test import test_utils as tu
+
+from savu.test.travis.framework_tests.plugin_runner_test import \
+    run_protected_plugin_runner_no_process_list
+
+
+class MinAndMaxTest(unittest.TestCase):
+
+    def test_min_and_max(self):
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        plugin = 'savu.plugins.stats.min_and_max'
+        params = dict(tu.set_data_dict(['tomo'], []), pattern='PROJECTION')
+        exp = run_protected_plugin_runner_no_process_list(
+            options, plugin, data=[{'size': (20, 10, 12),
+                                    'range': [0, 10000]}, params, {}])
+        mData = exp.index['in_data']['tomo'].meta_data
+        the_min = mData.get(['stats', 'min', 'PROJECTION'])
+        the_max = mData.get(['stats', 'max', 'PROJECTION'])
+        self.assertEqual(the_min.shape, (16,))
+        self.assertEqual(the_max.shape, (16,))
+        # every frame has been collected
+        self.assertFalse(np.any(np.isnan(the_min)))
+        self.assertTrue(np.all(the_min >= 0))
+        self.assertTrue(np.all(the_min < the_max))
+        self.assertTrue(np.all(the_max < 10000))
+
+if __name__ == "__main__":
+    unittest.main()
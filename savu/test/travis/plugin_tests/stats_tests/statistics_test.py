@@ -0,0 +1,76 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: statistics_test
+   :platform: Unix
+   :synopsis: unittest test class for the statistics plugin
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+"""
+import unittest
+import numpy as np
+from savu.test import test_utils as tu
+
+from savu.plugins.stats.stats_utils import StatsAccumulator
+from savu.test.travis.framework_tests.plugin_runner_test import \
+    run_protected_plugin_runner_no_process_list
+
+
+class StatisticsTest(unittest.TestCase):
+
+    def test_statistics(self):
+        options = tu.set_options(tu.get_test_data_path('24737.nxs'))
+        options['loader'] = \
+            'savu.plugins.loaders.full_field_loaders.random_3d_tomo_loader'
+        plugin = 'savu.plugins.stats.statistics'
+        params = dict(tu.set_data_dict(['tomo'], []), pattern='PROJECTION')
+        exp = run_protected_plugin_runner_no_process_list(
+            options, plugin, data=[{'size': (20, 10, 12)}, params, {}])
+        stats = exp.index['in_data']['tomo'].meta_data.get(['stats', 'global'])
+        self.assertEqual(stats['count'], 16*10*12)
+        self.assertEqual(stats['histogram'].sum(), 16*10*12)
+        self.assertEqual(stats['nan_count'], 0)
+        self.assertTrue(1 <= stats['min'] <= stats['mean'] <= stats['max'] < 10)
+
+    def test_stats_accumulator(self):
+        data = np.random.rand(6, 20, 30).astype(np.float32)
+        # widen the range in later frames, so the histogram grid must grow
+        data *= np.arange(1, 7, dtype=np.float32)[:, None, None]**3
+        data[0, 0, :3] = [np.nan, np.inf, -np.inf]
+        stats = StatsAccumulator(percentiles=[5, 50, 95], bins=16)
+        for frames in np.array_split(data, 4):
+            stats.update(frames)
+        result = stats.get_dictionary()
+
+        finite = data[np.isfinite(data)].astype(np.float64)
+        self.assertEqual(result['count'], finite.size)
+        self.assertEqual(result['nan_count'], 1)
+        self.assertEqual(result['inf_count'], 2)
+        self.assertEqual(result['min'], finite.min())
+        self.assertEqual(result['max'], finite.max())
+        self.assertAlmostEqual(result['mean'], finite.mean())
+        self.assertAlmostEqual(result['var'], finite.var(), places=5)
+        # within one internal bin of the values either side of each rank
+        tol = (finite.max() - finite.min())/16384.0
+        lower = np.percentile(finite, [5, 50, 95], interpolation='lower')
+        higher = np.percentile(finite, [5, 50, 95], interpolation='higher')
+        self.assertTrue(np.all(result['percentile_values'] >= lower - tol))
+        self.assertTrue(np.all(result['percentile_values'] <= higher + tol))
+        hist, edges = np.histogram(finite, 16)
+        np.testing.assert_allclose(result['histogram_edges'], edges)
+        self.assertEqual(result['histogram'].sum(), finite.size)
+        self.assertTrue(np.abs(result['histogram'] - hist).sum() <= 10)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,8 +33,10 @@ from savu.core.basic_plugin_runner import BasicPluginRunner
 from savu.core.plugin_runner import PluginRunner
 
 
-def __option_parser():
+def __option_parser(args=None):
     """ Option parser for command line arguments.
+
+    :params list args: arguments to parse (defaults to sys.argv)
     """
     version = "%(prog)s " + __version__
     parser = argparse.ArgumentParser(prog='savu')
@@ -67,12 +69,33 @@ def __option_parser():
                         default=False)
     sys_params_help = "Override default path to Savu system parameters file."
     parser.add_argument("--system_params", help=sys_params_help, default=None)
+    quick_help = "Quick-look mode: process every nth angle, sinogram and "\
+        "detector pixel, rescaling pixel size dependent plugin parameters."
+    parser.add_argument("--quick_look", type=int, metavar='n',
+                        help=quick_help, default=None)
+    estimate_help = "Run the plugin list check only and estimate the data "\
+        "size, memory use and runtime of each plugin (optionally for n "\
+        "processes)."
+    parser.add_argument("--estimate", type=int, nargs='?', const=0,
+                        metavar='n', help=estimate_help, default=None)
+    pipeline_help = "Start each plugin on a process as soon as the process "\
+        "has written the frames it requires, without waiting for the other "\
+        "processes (where the data access patterns allow)."
+    parser.add_argument("--pipeline", action="store_true", help=pipeline_help,
+                        default=False)
+    pushdown_help = "Replace plugins that only crop or remove data from a "\
+        "loaded dataset with previewing in the loader, so the unwanted data "\
+        "is never read."
+    parser.add_argument("--pushdown", action="store_true",
+                        help=pushdown_help, default=False)
+    transport_help = "The transport mechanism: 'hdf5' (default) or "\
+        "'chunked', which stores the intermediate datasets as directories of "\
+        "chunk files, written independently by each process."
+    parser.add_argument("--transport", help=transport_help, default="hdf5")
 
     # Hidden arguments
     # process names
     parser.add_argument("-n", "--names", help=hide, default="CPU0")
-    # transport mechanism
-    parser.add_argument("--transport", help=hide, default="hdf5")
     # Set Savu mode
     parser.add_argument("-m", "--mode", help=hide, default="full",
                         choices=['basic', 'full'])
@@ -111,17 +134,28 @@ def __option_parser():
     parser.add_argument("--checkpoint", nargs="?", choices=choices,
                         const='plugin', help=check_help, default=None)
 
-    args = parser.parse_args()
+    args = parser.parse_args(args)
     __check_conditions(parser, args)
     return args
 
 
+def _parse_args(args):
+    """ Parse a list of savu command line arguments.
+
+    :params list args: the command line arguments (excluding 'savu')
+    :returns: the parsed arguments
+    """
+    return __option_parser(args=args)
+
+
 def __check_conditions(parser, args):
     if args.checkpoint and not args.folder:
         msg = "--checkpoint flag requires '-f folder_name', where folder_name"\
               " contains the partially completed Savu job.  The out_folder"\
               " should be the path to this folder."
         parser.error(msg)
+    if args.quick_look is not None and args.quick_look < 1:
+        parser.error("--quick_look requires a positive integer value.")
 
 
 def _set_options(args):
@@ -150,6 +184,10 @@ def _set_options(args):
     options['email'] = args.email
     options['femail'] = args.femail
     options['system_params'] = args.system_params
+    options['quick_look'] = args.quick_look
+    options['estimate'] = args.estimate
+    options['pipeline'] = args.pipeline
+    options['pushdown'] = args.pushdown
 
     out_folder_name = \
         args.folder if args.folder else __get_folder_name(options['data_file'])
@@ -211,7 +249,10 @@ def main(input_args=None):
     options = _set_options(args)
     pRunner = PluginRunner if options['mode'] == 'full' else BasicPluginRunner
 
-    if options['nProcesses'] == 1:
+    if options['estimate'] is not None:
+        PluginRunner(options)._estimate_plugin_list(
+            nProcesses=options['estimate'])
+    elif options['nProcesses'] == 1:
         plugin_runner = pRunner(options)
         plugin_runner._run_plugin_list()
     else:
@@ -0,0 +1,223 @@
+# Copyright 2014 Diamond Light Source Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+.. module:: tomo_recon_server
+   :platform: Unix
+   :synopsis: A long running Savu process that runs a queue of jobs, one \
+       after another, inside a single (warm) MPI job.
+
+.. moduleauthor:: Nicola Wadeson <scientificsoftware@diamond.ac.uk>
+
+"""
+
+import argparse
+import traceback
+import logging
+import shlex
+import time
+import glob
+import sys
+import os
+from mpi4py import MPI
+
+import savu.tomo_recon as tr
+from savu.version import __version__
+from savu.core.basic_plugin_runner import BasicPluginRunner
+from savu.core.plugin_runner import PluginRunner
+from savu.data.plugin_list import PluginList
+
+JOB_EXT = '.job'
+STOP_FILE = 'STOP'
+
+
+def __option_parser(args=None):
+    """ Option parser for the server command line arguments.
+    """
+    version = "%(prog)s " + __version__
+    parser = argparse.ArgumentParser(
+        prog='savu_server', description="Run Savu jobs from a queue folder. "
+        "Each job is a file with the extension '%s', containing the "
+        "arguments that would otherwise be passed to savu (e.g. 'in_file "
+        "process_list out_folder -f name'). The server exits when a file "
+        "named '%s' appears in the queue folder." % (JOB_EXT, STOP_FILE))
+    hide = argparse.SUPPRESS
+
+    parser.add_argument('queue_folder', help='Folder to poll for job files.')
+    parser.add_argument('--version', action='version', version=version)
+    poll_help = "Time in seconds between checks for new jobs."
+    parser.add_argument("--poll", help=poll_help, type=float, default=5.0)
+    empty_help = "Exit when there are no more jobs in the queue."
+    parser.add_argument("--exit_when_empty", action="store_true",
+                        help=empty_help, default=False)
+
+    # Hidden arguments (applied to every job)
+    parser.add_argument("-n", "--names", help=hide, default="CPU0")
+    parser.add_argument("-c", "--cluster", action="store_true", help=hide,
+                        default=False)
+    return parser.parse_args(args)
+
+
+def _get_job_list(queue_folder):
+    """ Get the jobs waiting in the queue, oldest first. """
+    jobs = glob.glob(os.path.join(queue_folder, '*' + JOB_EXT))
+    return sorted(jobs, key=lambda f: (os.path.getmtime(f), f))
+
+
+def _claim_job(queue_folder):
+    """ Take the next job from the queue.
+
+    :params str queue_folder: the folder containing the job files
+    :returns: 'stop', None (no jobs) or a (job file, arguments) tuple
+    :rtype: str or None or tuple
+    """
+    if os.path.exists(os.path.join(queue_folder, STOP_FILE)):
+        return 'stop'
+    for job in _get_job_list(queue_folder):
+        running = job + '.running'
+        try:
+            os.rename(job, running)
+        except OSError:
+            continue  # the job has been removed or taken by another server
+        with open(running, 'r') as f:
+            lines = [l.strip() for l in f.readlines()]
+        args = ' '.join([l for l in lines if l and not l.startswith('#')])
+        return running, shlex.split(args)
+    return None
+
+
+def _finish_job(job, status):
+    """ Rename a running job file to reflect its final status. """
+    os.rename(job, job[:-len('.running')] + '.' + status)
+
+
+def _parse_job(job_args, server_args):
+    """ Parse and check the arguments of a single job, without any collective
+    operations, so that an invalid job can be rejected by the root process.
+
+    :params list job_args: the savu command line arguments of the job
+    :params server_args: the parsed server arguments
+    :returns: the parsed job arguments
+    :raises Exception: if the arguments, data file or process list are
+        invalid
+    """
+    try:
+        args = tr._parse_args(job_args)
+    except SystemExit:
+        raise ValueError("Invalid arguments: %s" % ' '.join(job_args))
+    # process names must match the running MPI job
+    args.names = server_args.names
+    args.cluster = args.cluster or server_args.cluster
+
+    if not os.path.exists(args.in_file):
+        raise IOError("The data file %s does not exist." % args.in_file)
+    if not os.path.isfile(args.process_list):
+        raise IOError("The process list %s does not exist."
+                      % args.process_list)
+    PluginList()._populate_plugin_list(args.process_list)
+    return args
+
+
+def _get_job_options(job_args, server_args):
+    """ Create the options dictionary for a single job. """
+    return tr._set_options(_parse_job(job_args, server_args))
+
+
+def _run_job(options):
+    pRunner = PluginRunner if options['mode'] == 'full' else BasicPluginRunner
+    plugin_runner = pRunner(options)
+    plugin_runner._run_plugin_list()
+
+
+def __reset_logging(handlers):
+    """ Remove all logging handlers added during a job, so that the next job
+    logs to its own output folder.
+    """
+    logger = logging.getLogger()
+    for handler in logger.handlers[:]:
+        if handler not in handlers:
+            logger.removeHandler(handler)
+            handler.close()
+
+
+def __get_next_job(server_args, comm):
+    """ Poll the queue (on the root process) until a job is available and
+    share it with all processes. """
+    while True:
+        job = _claim_job(server_args.queue_folder) if comm.rank == 0 \
+            else None
+        job = comm.bcast(job, root=0)
+        if job is not None or server_args.exit_when_empty:
+            return job if job is not None else 'stop'
+        time.sleep(server_args.poll)
+
+
+def __check_job(job_file, job_args, server_args, comm):
+    """ Check a job on the root process and share the result, so that all
+    processes skip an invalid job (which is marked as failed).
+
+    :returns: the parsed job arguments, or None if the job is invalid
+    """
+    args = error = None
+    if comm.rank == 0:
+        try:
+            args = _parse_job(job_args, server_args)
+        except Exception as e:
+            error = str(e)
+    args, error = comm.bcast((args, error), root=0)
+    if error is not None and comm.rank == 0:
+        print "Savu job %s failed: %s" % (job_file, error)
+        _finish_job(job_file, 'failed')
+    return args
+
+
+def main(input_args=None):
+    server_args = __option_parser(args=input_args)
+    comm = MPI.COMM_WORLD
+    mpi = len(server_args.names.split(',')) > 1
+    handlers = logging.getLogger().handlers[:]
+
+    while True:
+        job = __get_next_job(server_args, comm)
+        if job == 'stop':
+            break
+
+        job_file, job_args = job
+        args = __check_job(job_file, job_args, server_args, comm)
+        if args is None:
+            __reset_logging(handlers)
+            continue
+
+        status = 'done'
+        try:
+            _run_job(tr._set_options(args))
+        except (Exception, SystemExit) as error:
+            print "Savu job %s failed: %s" % (job_file, error)
+            traceback.print_exc(file=sys.stdout)
+            if mpi:
+                # the job failed part way through collective operations, so
+                # the state of the other processes is unknown
+                if comm.rank == 0:
+                    _finish_job(job_file, 'failed')
+                comm.Abort(1)
+            status = 'failed'
+
+        comm.barrier()
+        if comm.rank == 0:
+            _finish_job(job_file, status)
+        __reset_logging(handlers)
+
+
+if __name__ == '__main__':
+    main()
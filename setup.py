@@ -106,6 +106,7 @@ setup(name='savu',
       entry_points={'console_scripts': [
                         'savu_config=scripts.config_generator.savu_config:main',
                         'savu=savu.tomo_recon:main',
+                        'savu_server=savu.tomo_recon_server:main',
                         'savu_quick_tests=savu:run_tests',
                         'savu_full_tests=savu:run_full_tests',
                         'savu_citations=scripts.citation_extractor.citation_extractor:main',